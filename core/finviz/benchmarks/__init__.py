@@ -0,0 +1,26 @@
+"""
+FinViz 解析基准测试
+
+基于已提交的个股、筛选器和新闻页面样本，测量各解析函数的耗时、内存分配和每秒处理行数，
+并与保存的基线对比，用于发现站点结构或代码改动导致的解析成本上升。
+
+用法:
+    python -m core.finviz.benchmarks                  # 运行并与基线对比
+    python -m core.finviz.benchmarks --save-baseline  # 将本次结果保存为基线
+"""
+
+from .suite import (BENCHMARKS, Fixtures, benchmark, compare, format_report,
+                    load_baseline, refresh_fixtures, run_benchmarks,
+                    save_baseline)
+
+__all__ = [
+    'BENCHMARKS',
+    'Fixtures',
+    'benchmark',
+    'compare',
+    'format_report',
+    'load_baseline',
+    'refresh_fixtures',
+    'run_benchmarks',
+    'save_baseline',
+]
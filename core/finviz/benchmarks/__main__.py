@@ -0,0 +1,47 @@
+import argparse
+import sys
+
+from .suite import (BASELINE_PATH, BENCHMARKS, compare, format_report,
+                    load_baseline, refresh_fixtures, run_benchmarks,
+                    save_baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FinViz parser benchmarks")
+    parser.add_argument("names", nargs="*", help=f"Benchmarks to run: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed iterations per benchmark")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=2.0, help="Slowdown ratio reported as a regression"
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="Exit with status 1 when there are regressions"
+    )
+    parser.add_argument(
+        "--refresh-fixtures",
+        action="store_true",
+        help="Download the fixture pages again from BASE_URL before running",
+    )
+    args = parser.parse_args()
+
+    if args.refresh_fixtures:
+        refresh_fixtures()
+
+    results = run_benchmarks(args.names or None, args.repeat)
+    comparison = compare(results, load_baseline(args.baseline), args.threshold)
+    print(format_report(comparison))
+
+    if args.save_baseline:
+        # Benchmarks that did not run keep their stored entry
+        baseline = load_baseline(args.baseline)
+        baseline.update((result["name"], result) for result in results)
+        save_baseline(list(baseline.values()), args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.check and any(row["status"] == "regression" for row in comparison):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
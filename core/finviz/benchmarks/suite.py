@@ -0,0 +1,508 @@
+import contextlib
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sized
+
+from .. import stock_data
+from ..finviz_service import FinVizService
+from ..config import connection_settings
+from ..helper_functions.column_types import convert_snapshot, to_columns
+from ..helper_functions.news_timestamps import NewsTimestampDecoder
+from ..helper_functions.row_table import RowTable
+from ..helper_functions.page_selectors import get_layout
+from ..helper_functions.quote_cache import get_quote_cache
+from ..helper_functions.rate_limiter import reset_rate_limiter
+from ..helper_functions.request_functions import http_request_get
+from ..helper_functions.scraper_functions import (fast_table, get_page_urls,
+                                                  get_table, get_total_rows,
+                                                  parse_page, stream_table)
+from ..helper_functions.transport import (RawResponse, Transport,
+                                          canonical_url, set_transport)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Fixture file name -> request it was recorded from
+FIXTURE_PAGES = {
+    "quote.html": ("https://finviz.com/quote.ashx", {"t": "AAPL"}),
+    "screener.html": ("https://finviz.com/screener.ashx", {"v": "111", "f": "sec_technology"}),
+    "screener_custom.html": (
+        "https://finviz.com/screener.ashx",
+        {"v": "152", "c": ",".join(str(c) for c in range(71))},
+    ),
+    "news.html": ("https://finviz.com/news.ashx", None),
+    # A capture of the live site trimmed to the screener views table; the pages above are
+    # recorded from the synthetic site and lack its markup, like the data-boxover tooltips
+    "screener_live.html": ("https://finviz.com/screener.ashx", {"v": "111", "ft": "4"}),
+}
+
+
+class Fixtures:
+    """ The checked-in pages, loaded once as bytes. """
+
+    def __init__(self, directory: str = FIXTURE_DIR):
+        self.directory = directory
+        self.pages = {}
+        for name in FIXTURE_PAGES:
+            with open(os.path.join(directory, name), "rb") as fp:
+                self.pages[name] = fp.read()
+
+    def text(self, name: str) -> str:
+        return self.pages[name].decode("utf-8")
+
+    def tree(self, name: str):
+        return parse_page(self.pages[name])
+
+
+class _FixtureTransport(Transport):
+    """ Answers every request with the fixture recorded for its page, whatever the query. """
+
+    def __init__(self, fixtures: Fixtures):
+        self.responses = {}
+        for name, (url, _) in FIXTURE_PAGES.items():
+            page = url.rsplit("/", 1)[-1]
+            self.responses.setdefault(page, fixtures.pages[name])
+
+    def _respond(self, url: str, payload: Optional[Dict] = None) -> RawResponse:
+        key = canonical_url(url, payload)
+        page = key.split("?", 1)[0].rsplit("/", 1)[-1]
+        return RawResponse(key, 200, "utf-8", self.responses[page])
+
+    def get(self, url, payload, headers, session):
+        return self._respond(url, payload)
+
+    async def get_async(self, url, headers, session):
+        return self._respond(url)
+
+
+class Benchmark(NamedTuple):
+    """
+    A timed operation. prepare receives the fixtures and returns the callable to time,
+    whose result is sized by the number of items (rows, fields, URLs) it produced;
+    reset, if set, runs untimed before every iteration.
+    """
+
+    name: str
+    prepare: Callable[[Fixtures], Callable[[], Sized]]
+    reset: Optional[Callable[[], None]] = None
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, reset: Optional[Callable[[], None]] = None):
+    """ Registers a benchmark under name. """
+
+    def register(prepare):
+        BENCHMARKS[name] = Benchmark(name, prepare, reset)
+        return prepare
+
+    return register
+
+
+def _screener_headers(tree) -> List[str]:
+    screener = get_layout("screener")
+    return [screener.normalized_text(th) for th in screener.headers(tree)]
+
+
+@benchmark("parse_screener_page")
+def _parse_screener_page(fixtures):
+    page = fixtures.pages["screener.html"]
+    return lambda: [parse_page(page)]
+
+
+@benchmark("get_table")
+def _get_table(fixtures):
+    text = fixtures.text("screener.html")
+    headers = _screener_headers(fixtures.tree("screener.html"))
+    return lambda: get_table(text, headers, rows=20)
+
+
+@benchmark("get_table_all_columns")
+def _get_table_all_columns(fixtures):
+    text = fixtures.text("screener_custom.html")
+    headers = _screener_headers(fixtures.tree("screener_custom.html"))
+    return lambda: get_table(text, headers, rows=20)
+
+
+@benchmark("get_table_tree")
+def _get_table_tree(fixtures):
+    tree = fixtures.tree("screener.html")
+    headers = _screener_headers(tree)
+    return lambda: get_table(tree, headers, rows=20)
+
+
+@benchmark("stream_table")
+def _stream_table(fixtures):
+    page = fixtures.pages["screener.html"]
+    headers = _screener_headers(fixtures.tree("screener.html"))
+    return lambda: stream_table(page, headers, rows=20)
+
+
+@benchmark("stream_table_all_columns")
+def _stream_table_all_columns(fixtures):
+    page = fixtures.pages["screener_custom.html"]
+    headers = _screener_headers(fixtures.tree("screener_custom.html"))
+    return lambda: stream_table(page, headers, rows=20)
+
+
+@benchmark("stream_table_first_row")
+def _stream_table_first_row(fixtures):
+    page = fixtures.pages["screener_custom.html"]
+    headers = _screener_headers(fixtures.tree("screener_custom.html"))
+    return lambda: stream_table(page, headers, rows=1)
+
+
+@benchmark("fast_table")
+def _fast_table(fixtures):
+    page = fixtures.pages["screener.html"]
+    headers = _screener_headers(fixtures.tree("screener.html"))
+    return lambda: fast_table(page, headers, rows=20)
+
+
+@benchmark("fast_table_all_columns")
+def _fast_table_all_columns(fixtures):
+    page = fixtures.pages["screener_custom.html"]
+    headers = _screener_headers(fixtures.tree("screener_custom.html"))
+    return lambda: fast_table(page, headers, rows=20)
+
+
+@benchmark("get_table_live")
+def _get_table_live(fixtures):
+    text = fixtures.text("screener_live.html")
+    headers = _screener_headers(fixtures.tree("screener_live.html"))
+    return lambda: get_table(text, headers, rows=20)
+
+
+@benchmark("stream_table_live")
+def _stream_table_live(fixtures):
+    page = fixtures.pages["screener_live.html"]
+    headers = _screener_headers(fixtures.tree("screener_live.html"))
+    return lambda: stream_table(page, headers, rows=20)
+
+
+@benchmark("fast_table_live")
+def _fast_table_live(fixtures):
+    page = fixtures.pages["screener_live.html"]
+    headers = _screener_headers(fixtures.tree("screener_live.html"))
+    return lambda: fast_table(page, headers, rows=20)
+
+
+@benchmark("screener_rows_all_columns")
+def _screener_rows_all_columns(fixtures):
+    # A 400 row custom screen collected page by page like Screener does, peak_bytes ~ its size
+    page = fixtures.pages["screener_custom.html"]
+    headers = _screener_headers(fixtures.tree("screener_custom.html"))
+
+    def collect():
+        data = RowTable(headers)
+        for _ in range(20):
+            data.extend(stream_table(page, headers, rows=20))
+        return data
+
+    return collect
+
+
+@benchmark("to_columns")
+def _to_columns(fixtures):
+    headers = _screener_headers(fixtures.tree("screener_custom.html"))
+    rows = stream_table(fixtures.pages["screener_custom.html"], headers, rows=20)
+    return lambda: list(to_columns(headers, rows).values())
+
+
+@benchmark("get_total_rows")
+def _get_total_rows(fixtures):
+    tree = fixtures.tree("screener.html")
+    return lambda: [get_total_rows(tree)]
+
+
+@benchmark("get_total_rows_raw")
+def _get_total_rows_raw(fixtures):
+    page = fixtures.pages["screener.html"]
+    return lambda: [get_total_rows(page)]
+
+
+@benchmark("get_page_urls")
+def _get_page_urls(fixtures):
+    tree = fixtures.tree("screener.html")
+    rows = get_total_rows(tree)
+    return lambda: get_page_urls(tree, rows, "https://finviz.com/screener.ashx?v=111")
+
+
+def _clear_stock_pages():
+    get_quote_cache().clear()
+
+
+# The stock_data benchmarks go through the request path with the fixture transport,
+# so they include fetching (from memory), parsing the quote page and extracting.
+@benchmark("get_stock", reset=_clear_stock_pages)
+def _get_stock(fixtures):
+    return lambda: stock_data.get_stock("AAPL")
+
+
+@benchmark("get_stock_typed", reset=_clear_stock_pages)
+def _get_stock_typed(fixtures):
+    return lambda: stock_data.get_stock("AAPL", typed=True)
+
+
+@benchmark("quote_price", reset=_clear_stock_pages)
+def _quote_price(fixtures):
+    # A single-field lookup only extracts the snapshot table
+    return lambda: [stock_data.get_quote("AAPL")["Price"]]
+
+
+@benchmark("stock_analysis", reset=_clear_stock_pages)
+def _stock_analysis(fixtures):
+    service = FinVizService()
+    return lambda: service.get_stock_analysis("AAPL")
+
+
+@benchmark("stock_snapshot")
+def _stock_snapshot(fixtures):
+    # Extraction and conversion only, from an already parsed quote page
+    tree = fixtures.tree("quote.html")
+    return lambda: convert_snapshot(stock_data._snapshot_values(tree))
+
+
+@benchmark("stock_fields")
+def _stock_fields(fixtures):
+    # The five-field projection most callers use, compare with stock_snapshot
+    tree = fixtures.tree("quote.html")
+    keys = ["Price", "Change", "Volume", "Market Cap", "RSI (14)"]
+    return lambda: stock_data.QuoteSnapshot("AAPL", tree, "tree").select(keys)
+
+
+@benchmark("get_news", reset=_clear_stock_pages)
+def _get_news(fixtures):
+    return lambda: stock_data.get_news("AAPL")
+
+
+def _news_time_texts(fixtures) -> List[str]:
+    quote = get_layout("quote")
+    rows = quote.news_rows(quote.news_table(fixtures.tree("quote.html"))[0])
+    return [quote.texts(quote.news_cells(row)[0])[0].strip() for row in rows]
+
+
+def _strptime_news_timestamps(texts: List[str]) -> List[str]:
+    """ The per-row strptime/now() decoding get_news used before NewsTimestampDecoder. """
+
+    results = []
+    current_date = None
+    for raw_timestamp in texts:
+        try:
+            if "Today" in raw_timestamp:
+                time_part = raw_timestamp.replace("Today", "").strip()
+                parsed_timestamp = datetime.datetime.strptime(time_part, "%I:%M%p").replace(
+                    year=datetime.datetime.now().year,
+                    month=datetime.datetime.now().month,
+                    day=datetime.datetime.now().day,
+                )
+                current_date = parsed_timestamp.date()
+            elif len(raw_timestamp) > 8 and "-" in raw_timestamp:
+                parsed_timestamp = datetime.datetime.strptime(raw_timestamp, "%b-%d-%y %I:%M%p")
+                current_date = parsed_timestamp.date()
+            else:
+                if current_date is None:
+                    current_date = datetime.datetime.now().date()
+                parsed_timestamp = datetime.datetime.strptime(raw_timestamp, "%I:%M%p").replace(
+                    year=current_date.year, month=current_date.month, day=current_date.day
+                )
+        except ValueError:
+            continue
+        results.append(parsed_timestamp.strftime("%Y-%m-%d %H:%M"))
+    return results
+
+
+@benchmark("news_timestamps")
+def _news_timestamps(fixtures):
+    texts = _news_time_texts(fixtures)
+
+    def decode():
+        decoder = NewsTimestampDecoder()
+        return [decoder.text(text) for text in texts]
+
+    return decode
+
+
+@benchmark("news_timestamps_strptime")
+def _news_timestamps_strptime(fixtures):
+    texts = _news_time_texts(fixtures)
+    return lambda: _strptime_news_timestamps(texts)
+
+
+@benchmark("get_insider", reset=_clear_stock_pages)
+def _get_insider(fixtures):
+    return lambda: stock_data.get_insider("AAPL")
+
+
+@benchmark("get_analyst_price_targets", reset=_clear_stock_pages)
+def _get_analyst_price_targets(fixtures):
+    return lambda: stock_data.get_analyst_price_targets("AAPL", last_ratings=100)
+
+
+@benchmark("get_all_news")
+def _get_all_news(fixtures):
+    return stock_data.get_all_news
+
+
+@contextlib.contextmanager
+def offline(fixtures: Fixtures) -> Iterator[None]:
+    """ Serves requests from the fixtures with rate limiting and the response cache turned off. """
+
+    saved = {key: connection_settings[key] for key in ("RATE_LIMIT", "RESPONSE_CACHE")}
+    connection_settings.update(RATE_LIMIT=None, RESPONSE_CACHE=False)
+    reset_rate_limiter()
+    previous = set_transport(_FixtureTransport(fixtures))
+
+    try:
+        yield
+    finally:
+        set_transport(previous)
+        connection_settings.update(saved)
+        reset_rate_limiter()
+        _clear_stock_pages()
+
+
+def _measure(bench: Benchmark, func: Callable[[], Sized], repeat: int) -> Dict:
+    if bench.reset:
+        bench.reset()
+    items = len(func())  # Warm-up, also sizes the result
+
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            if bench.reset:
+                bench.reset()
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    # tracemalloc only sees Python allocations, libxml2's own buffers are not counted
+    if bench.reset:
+        bench.reset()
+    tracemalloc.start()
+    try:
+        func()
+        allocated, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return dict(
+        name=bench.name,
+        repeat=repeat,
+        best=min(timings),
+        median=median,
+        items=items,
+        items_per_sec=items / median if median else 0.0,
+        peak_bytes=peak,
+        retained_bytes=allocated,
+    )
+
+
+def run_benchmarks(
+    names: Optional[List[str]] = None,
+    repeat: int = 50,
+    fixtures: Optional[Fixtures] = None,
+) -> List[Dict]:
+    """ Runs the selected benchmarks (all by default) and returns one result per benchmark. """
+
+    fixtures = fixtures or Fixtures()
+    selected = [BENCHMARKS[name] for name in names] if names else list(BENCHMARKS.values())
+
+    results = []
+    with offline(fixtures):
+        for bench in selected:
+            results.append(_measure(bench, bench.prepare(fixtures), repeat))
+
+    return results
+
+
+def save_baseline(results: List[Dict], path: str = BASELINE_PATH):
+    """ Stores results as the baseline later runs are compared against. """
+
+    with open(path, "w") as fp:
+        json.dump(
+            dict(
+                python=platform.python_version(),
+                machine=platform.machine(),
+                results={result["name"]: result for result in results},
+            ),
+            fp,
+            indent=2,
+            sort_keys=True,
+        )
+        fp.write("\n")
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Dict]:
+    """ Returns the stored baseline results by benchmark name, empty when there is none. """
+
+    try:
+        with open(path, "r") as fp:
+            return json.load(fp)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def compare(results: List[Dict], baseline: Dict[str, Dict], threshold: float = 2.0) -> List[Dict]:
+    """
+    Compares median times with the baseline. A benchmark is a regression when it takes
+    threshold times its baseline or longer, and an improvement at 1 / threshold or less.
+    """
+
+    comparison = []
+    for result in results:
+        base = baseline.get(result["name"])
+        if base is None:
+            ratio, status = None, "new"
+        else:
+            ratio = result["median"] / base["median"]
+            if ratio >= threshold:
+                status = "regression"
+            elif ratio <= 1 / threshold:
+                status = "improved"
+            else:
+                status = "ok"
+        comparison.append(dict(result, baseline=base and base["median"], ratio=ratio, status=status))
+
+    return comparison
+
+
+def format_report(comparison: List[Dict]) -> str:
+    """ Renders a comparison as a plain-text table. """
+
+    lines = [
+        f"{'benchmark':<28}{'median ms':>11}{'base ms':>10}{'ratio':>8}"
+        f"{'items/s':>12}{'peak KiB':>10}  status"
+    ]
+    for row in comparison:
+        base = f"{row['baseline'] * 1000:.3f}" if row["baseline"] else "-"
+        ratio = f"{row['ratio']:.2f}" if row["ratio"] else "-"
+        lines.append(
+            f"{row['name']:<28}{row['median'] * 1000:>11.3f}{base:>10}{ratio:>8}"
+            f"{row['items_per_sec']:>12,.0f}{row['peak_bytes'] / 1024:>10.1f}  {row['status']}"
+        )
+
+    return "\n".join(lines)
+
+
+def refresh_fixtures(directory: str = FIXTURE_DIR):
+    """ Downloads the fixture pages again from BASE_URL (the live site by default). """
+
+    os.makedirs(directory, exist_ok=True)
+    for name, (url, payload) in FIXTURE_PAGES.items():
+        page, _ = http_request_get(url, payload=payload, parse=False, use_cache=False)
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as fp:
+            fp.write(page)
@@ -1,4 +1,39 @@
 connection_settings = dict(
+    BASE_URL="https://finviz.com",  # Point every request path at another host, e.g. the synthetic server
     CONCURRENT_CONNECTIONS=30,
     CONNECTION_TIMEOUT=30000,
+    # Shared keep-alive session used by the synchronous request functions
+    POOL_CONNECTIONS=10,  # Number of per-host connection pools to cache
+    POOL_MAXSIZE=30,  # Maximum number of kept-alive connections per host
+    POOL_BLOCK=False,  # Block instead of opening throwaway connections when the pool is full
+    # Long-lived aiohttp session used by Connector
+    DNS_CACHE_TTL=300,  # Seconds resolved host addresses are kept
+    KEEPALIVE_TIMEOUT=30,  # Seconds an idle connection is kept open
+    # Worker pools that parse pages off the network path
+    PARSE_WORKERS=None,  # Pool size, None lets concurrent.futures pick it from the CPU count
+    # Persistent on-disk response cache, shared across processes and restarts
+    RESPONSE_CACHE=False,  # Enable the cache for the synchronous request functions
+    RESPONSE_CACHE_DIR="~/.cache/finviz",
+    RESPONSE_CACHE_MAX_BYTES=256 * 1024 * 1024,  # Compressed size before LRU eviction
+    RESPONSE_CACHE_TTL={  # Seconds per page, "page?param=value" rules win over plain page rules
+        "quote.ashx": 60,
+        "screener.ashx": 60,
+        "screener.ashx?ft=4": 24 * 60 * 60,  # Filters page
+        "news.ashx": 300,
+        "crypto_performance.ashx": 60,
+    },
+    # In-memory cache of the quote pages read by get_stock, get_news, get_insider and get_analyst_price_targets
+    QUOTE_CACHE_MAX_ENTRIES=1000,  # Pages kept before LRU eviction, None for no limit
+    QUOTE_CACHE_MAX_BYTES=256 * 1024 * 1024,  # Estimated memory of the kept pages before LRU eviction, None for no limit
+    QUOTE_CACHE_TTL=60,  # Seconds a page is served before it is fetched again, None keeps it until evicted
+    QUOTE_CACHE_STORE="tree",  # Keep "tree" (parsed pages), "compressed" (zlib HTML, parsed per read) or "sections" (extracted data)
+    # Transport behind every request path: "live", "record" or "replay"
+    TRANSPORT_MODE="live",
+    CASSETTE_DIR="cassettes",  # Directory the record and replay modes save to and serve from
+    REPLAY_LATENCY=0.0,  # Seconds added to every replayed response
+    REPLAY_THROTTLE_RATE=0.0,  # Share of replayed requests answered with "Too many requests."
+    # Process-wide token bucket shared by every outgoing request
+    RATE_LIMIT=8,  # Requests per second, None or 0 disables limiting
+    RATE_BURST=10,  # Requests that can be sent at once after an idle period
+    MAX_RETRIES=5,  # Attempts per URL when FinViz answers "Too many requests."
 )
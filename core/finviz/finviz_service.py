@@ -4,7 +4,7 @@ FinViz服务门面类
 统一封装FinViz的所有功能，包括股票数据获取和股票筛选。
 """
 
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from . import stock_data
 from . import screener
 
@@ -18,48 +18,88 @@ class FinVizService:
     
     # ==================== 股票数据获取功能 ====================
     
-    def get_stock(self, ticker: str) -> Dict:
+    def get_stock(self,
+                  ticker: Union[str, stock_data.QuoteSnapshot],
+                  typed: bool = False,
+                  fields: Optional[Iterable[str]] = None) -> Dict:
         """
         获取股票详细信息
         
         Args:
-            ticker: 股票代码，如 'AAPL'
+            ticker: 股票代码，如 'AAPL'，或 get_quote 返回的 QuoteSnapshot
+            typed: 为True时返回转换后的数值（float/int/小数形式的百分比，"-" 为None）
+            fields: 只提取并返回这些键，如 ['Price', 'Change', 'Volume']；默认返回全部
             
         Returns:
             Dict: 包含股票详细信息的字典，包括价格、市值、财务数据等
         """
-        return stock_data.get_stock(ticker)
+        return stock_data.get_stock(ticker, typed, fields)
     
-    def get_news(self, ticker: str) -> List[Tuple[str, str, str, str]]:
+    def get_quote(self, ticker: str) -> stock_data.QuoteSnapshot:
         """
-        获取股票相关新闻
+        获取股票报价页，各部分（头部、数据表格、新闻、内部交易、分析师评级）在首次读取时提取
         
         Args:
             ticker: 股票代码，如 'AAPL'
             
+        Returns:
+            QuoteSnapshot: 可传给 get_stock、get_news、get_insider、get_analyst_price_targets
+            共用同一次获取的报价页；下载失败时抛出异常
+        """
+        return stock_data.get_quote(ticker)
+    
+    def get_stocks(self,
+                   tickers: Iterable[str],
+                   concurrency: Optional[int] = None,
+                   fields: Optional[Iterable[str]] = None,
+                   typed: bool = False,
+                   parse_executor: Optional[str] = "thread") -> Dict[str, Dict]:
+        """
+        批量获取多只股票的详细信息，并发下载报价页
+        
+        Args:
+            tickers: 股票代码列表，如 ['AAPL', 'MSFT']
+            concurrency: 同时进行的请求数，默认为 CONCURRENT_CONNECTIONS
+            fields: 只返回这些键，如 ['Price', 'Change']；默认返回全部
+            typed: 为True时返回转换后的数值
+            parse_executor: 页面解析方式，None 为内联解析，'thread' 或 'process'
+            
+        Returns:
+            Dict[str, Dict]: 股票代码到股票信息的映射，失败的股票其值为 {"error": ...}
+        """
+        return stock_data.get_stocks(tickers, concurrency, fields, typed, parse_executor)
+    
+    def get_news(self, ticker: Union[str, stock_data.QuoteSnapshot], timestamps: str = "text") -> List[Tuple[str, str, str, str]]:
+        """
+        获取股票相关新闻
+        
+        Args:
+            ticker: 股票代码，如 'AAPL'，或 get_quote 返回的 QuoteSnapshot
+            timestamps: 时间的返回形式，'text'（字符串）、'datetime' 或 'epoch'（秒级时间戳）
+            
         Returns:
             List[Tuple]: 新闻列表，每个元素包含 (时间, 标题, 链接, 来源)
         """
-        return stock_data.get_news(ticker)
+        return stock_data.get_news(ticker, timestamps)
     
-    def get_insider(self, ticker: str) -> List[Dict]:
+    def get_insider(self, ticker: Union[str, stock_data.QuoteSnapshot]) -> List[Dict]:
         """
         获取内部交易信息
         
         Args:
-            ticker: 股票代码，如 'AAPL'
+            ticker: 股票代码，如 'AAPL'，或 get_quote 返回的 QuoteSnapshot
             
         Returns:
             List[Dict]: 内部交易记录列表
         """
         return stock_data.get_insider(ticker)
     
-    def get_analyst_price_targets(self, ticker: str, last_ratings: int = 5) -> List[Dict]:
+    def get_analyst_price_targets(self, ticker: Union[str, stock_data.QuoteSnapshot], last_ratings: int = 5) -> List[Dict]:
         """
         获取分析师价格目标
         
         Args:
-            ticker: 股票代码，如 'AAPL'
+            ticker: 股票代码，如 'AAPL'，或 get_quote 返回的 QuoteSnapshot
             last_ratings: 获取最近几条评级，默认5条
             
         Returns:
@@ -84,7 +124,9 @@ class FinVizService:
                          order: str = "",
                          signal: str = "",
                          table: str = "Overview",
-                         custom: Optional[List[str]] = None) -> Dict:
+                         custom: Optional[List[str]] = None,
+                         export_path: Optional[str] = None,
+                         export_format: Optional[str] = None) -> Dict:
         """
         获取筛选器数据
         
@@ -95,11 +137,33 @@ class FinVizService:
             signal: 信号筛选，如 'n_majornews'
             table: 表格类型，可选值: Overview, Valuation, Ownership, Performance, Custom, Financial, Technical
             custom: 自定义列，如 ['1', '21', '23']
+            export_path: 导出文件路径，给出时结果逐页写入文件（内存占用恒定），返回值中不含数据行
+            export_format: 导出格式，可选 ndjson, csv, arrow, parquet，默认根据文件扩展名推断
             
         Returns:
-            Dict: 包含表头和数据行的字典
+            Dict: 包含表头和数据行的字典；导出时包含表头、导出路径、格式和写入行数
+        """
+        return screener.get_screener_data(
+            filters, rows, order, signal, table, custom,
+            export_path=export_path, export_format=export_format
+        )
+    
+    def get_screener_count(self,
+                           filters: Optional[List[str]] = None,
+                           signal: str = "",
+                           tickers: Optional[List[str]] = None) -> Dict:
+        """
+        获取筛选结果总数，不下载和解析结果表格
+        
+        Args:
+            filters: 筛选条件列表，如 ['idx_sp500', 'sec_technology']
+            signal: 信号筛选，如 'n_majornews'
+            tickers: 股票代码列表
+            
+        Returns:
+            Dict: 包含结果总数的字典
         """
-        return screener.get_screener_data(filters, rows, order, signal, table, custom)
+        return screener.get_screener_count(filters, signal, tickers)
     
     def get_screener_from_url(self, url: str, rows: Optional[int] = None) -> Dict:
         """
@@ -125,6 +189,14 @@ class FinVizService:
     
     # ==================== 组合功能方法 ====================
     
+    @staticmethod
+    def _quote_or_ticker(ticker: str) -> Union[str, stock_data.QuoteSnapshot]:
+        """获取一次报价页供各部分共用；获取失败时返回股票代码，由各方法分别返回错误信息"""
+        try:
+            return stock_data.get_quote(ticker)
+        except Exception:
+            return ticker
+    
     def get_stock_with_news(self, ticker: str) -> Dict:
         """
         获取股票信息和相关新闻
@@ -135,8 +207,9 @@ class FinVizService:
         Returns:
             Dict: 包含股票信息和新闻的字典
         """
-        stock_data = self.get_stock(ticker)
-        news_data = self.get_news(ticker)
+        quote = self._quote_or_ticker(ticker)
+        stock_data = self.get_stock(quote)
+        news_data = self.get_news(quote)
         
         return {
             "stock": stock_data,
@@ -154,10 +227,11 @@ class FinVizService:
         Returns:
             Dict: 包含股票信息、新闻、内部交易和分析师评级的字典
         """
-        stock_data = self.get_stock(ticker)
-        news_data = self.get_news(ticker)
-        insider_data = self.get_insider(ticker)
-        analyst_data = self.get_analyst_price_targets(ticker)
+        quote = self._quote_or_ticker(ticker)
+        stock_data = self.get_stock(quote)
+        news_data = self.get_news(quote)
+        insider_data = self.get_insider(quote)
+        analyst_data = self.get_analyst_price_targets(quote)
         
         return {
             "stock": stock_data,
@@ -0,0 +1,387 @@
+import array
+import datetime
+import functools
+import math
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+from .row_table import RowTable
+
+MISSING = frozenset(("-", "", "N/A"))
+
+_SCALES = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+_DATE_FORMATS = ("%m/%d/%Y", "%b-%d-%y", "%b %d, %Y")
+
+# Screener header -> column type, covering the headers of every TABLE_TYPES view and the
+# custom columns. Headers without an entry stay text.
+#   int      integers, thousands separators allowed ("1,234,567")
+#   float    plain decimals ("12.34")
+#   scaled   decimals with a K/M/B/T suffix ("1.23B" -> 1230000000.0)
+#   percent  percentages, kept in percent units ("12.5%" -> 12.5)
+#   date     dates ("12/15/2004", "Dec-15-24") as datetime.date
+HEADER_TYPES = {
+    "No.": "int",
+    "Market Cap": "scaled",
+    "P/E": "float",
+    "Fwd P/E": "float",
+    "Forward P/E": "float",
+    "PEG": "float",
+    "P/S": "float",
+    "P/B": "float",
+    "P/C": "float",
+    "P/FCF": "float",
+    "Dividend": "percent",
+    "Dividend %": "percent",
+    "Payout Ratio": "percent",
+    "EPS": "float",
+    "EPS this Y": "percent",
+    "EPS next Y": "percent",
+    "EPS past 5Y": "percent",
+    "EPS next 5Y": "percent",
+    "Sales past 5Y": "percent",
+    "EPS Q/Q": "percent",
+    "Sales Q/Q": "percent",
+    "Outstanding": "scaled",
+    "Float": "scaled",
+    "Insider Own": "percent",
+    "Insider Trans": "percent",
+    "Inst Own": "percent",
+    "Inst Trans": "percent",
+    "Float Short": "percent",
+    "Short Ratio": "float",
+    "ROA": "percent",
+    "ROE": "percent",
+    "ROI": "percent",
+    "Curr R": "float",
+    "Quick R": "float",
+    "LTDebt/Eq": "float",
+    "Debt/Eq": "float",
+    "Gross M": "percent",
+    "Oper M": "percent",
+    "Profit M": "percent",
+    "Perf Week": "percent",
+    "Perf Month": "percent",
+    "Perf Quart": "percent",
+    "Perf Half": "percent",
+    "Perf Year": "percent",
+    "Perf YTD": "percent",
+    "Beta": "float",
+    "ATR": "float",
+    "Volatility W": "percent",
+    "Volatility M": "percent",
+    "SMA20": "percent",
+    "SMA50": "percent",
+    "SMA200": "percent",
+    "50D High": "percent",
+    "50D Low": "percent",
+    "52W High": "percent",
+    "52W Low": "percent",
+    "RSI": "float",
+    "from Open": "percent",
+    "Gap": "percent",
+    "Recom": "float",
+    "Avg Volume": "scaled",
+    "Rel Volume": "float",
+    "Price": "float",
+    "Prev Close": "float",
+    "Change": "percent",
+    "Volume": "int",
+    "Target Price": "float",
+    "IPO Date": "date",
+    "Sales": "scaled",
+    "Income": "scaled",
+    "Employees": "int",
+}
+
+
+def _scaled(text: str) -> float:
+    scale = _SCALES.get(text[-1])
+    return float(text[:-1]) * scale if scale else float(text)
+
+
+_DATES = {}
+
+
+def _date(text: str) -> datetime.date:
+    day = _DATES.get(text)
+    if day is None:
+        for date_format in _DATE_FORMATS:
+            try:
+                day = datetime.datetime.strptime(text, date_format).date()
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"Unknown date format: {text}")
+        _DATES[text] = day  # Dates repeat a lot within a screen
+    return day
+
+
+_PARSERS: Dict[str, Callable[[str], object]] = {
+    "int": lambda text: int(text.replace(",", "")),
+    "float": lambda text: float(text.replace(",", "")),
+    "scaled": _scaled,
+    "percent": lambda text: float(text.rstrip("%").replace(",", "")),
+    "date": _date,
+}
+
+
+def _parse_all(parse: Callable[[str], object], values: Sequence[str], missing) -> List:
+    """ Converts a whole column, and only falls back to cell by cell when it holds malformed values. """
+
+    try:
+        return [missing if value in MISSING else parse(value) for value in values]
+    except (ValueError, IndexError):
+        pass
+
+    converted = []
+    for value in values:
+        try:
+            converted.append(missing if value in MISSING else parse(value))
+        except (ValueError, IndexError):
+            converted.append(missing)
+    return converted
+
+
+def convert_column(column_type: str, values: Sequence[Optional[str]]):
+    """
+    Converts the text cells of one column.
+
+    Numeric columns become array.array("d") with NaN for missing or malformed cells, except
+    int columns without missing cells, which become array.array("q"). Dates become a list of
+    datetime.date or None, and text columns a list of strings or None.
+    """
+
+    values = ["" if value is None else value for value in values]
+
+    if column_type == "str":
+        return [None if value in MISSING else value for value in values]
+    if column_type == "date":
+        return _parse_all(_date, values, None)
+    if column_type not in _PARSERS:
+        raise ValueError(f"Invalid column type: {column_type}")
+
+    converted = _parse_all(_PARSERS[column_type], values, math.nan)
+    if column_type == "int" and not any(isinstance(value, float) for value in converted):
+        return array.array("q", converted)
+    return array.array("d", converted)
+
+
+def column_types(headers: Sequence[str], overrides: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """ Returns the type of each header, from HEADER_TYPES unless overridden. """
+
+    overrides = overrides or {}
+    return {
+        header: overrides.get(header, HEADER_TYPES.get(header, "str")) for header in headers
+    }
+
+
+def to_columns(
+    headers: Sequence[str],
+    rows: Sequence[Mapping[str, str]],
+    types: Optional[Dict[str, str]] = None,
+) -> Dict[str, object]:
+    """ Transposes screener rows (a RowTable or dictionaries) into one typed column per header. """
+
+    if isinstance(rows, RowTable) and set(headers).issubset(rows.headers):
+        column = rows.column
+    else:
+        column = lambda header: [row.get(header) for row in rows]  # noqa: E731
+
+    return {
+        header: convert_column(column_type, column(header))
+        for header, column_type in column_types(headers, types).items()
+    }
+
+
+# Quote snapshot key -> value type, as get_stock names the keys. Unlike the screener
+# columns, percentages become fractions here. Keys without an entry are guessed from
+# the shape of their value.
+#   float     plain decimals ("12.34")
+#   count     whole numbers, thousands separators or a K/M/B/T suffix ("58.74M" -> 58740000)
+#   fraction  percentages as fractions ("12.5%" -> 0.125)
+#   range     "164.08 - 237.49" -> (164.08, 237.49)
+#   dividend  "0.99 (0.43%)" -> (0.99, 0.0043)
+#   flags     "Yes / No" -> (True, False)
+#   date      "Nov 08, 2024" as datetime.date
+#   str       kept as text
+SNAPSHOT_TYPES = {
+    "Ticker": "str",
+    "Company": "str",
+    "Website": "str",
+    "Sector": "str",
+    "Industry": "str",
+    "Country": "str",
+    "Index": "str",
+    "Earnings": "str",
+    "Market Cap": "count",
+    "Income": "count",
+    "Sales": "count",
+    "Shs Outstand": "count",
+    "Shs Float": "count",
+    "Short Interest": "count",
+    "Employees": "count",
+    "Avg Volume": "count",
+    "Volume": "count",
+    "Trades": "count",
+    "P/E": "float",
+    "Forward P/E": "float",
+    "PEG": "float",
+    "P/S": "float",
+    "P/B": "float",
+    "P/C": "float",
+    "P/FCF": "float",
+    "EPS (ttm)": "float",
+    "EPS next Y": "float",
+    "EPS next Q": "float",
+    "Book/sh": "float",
+    "Cash/sh": "float",
+    "Quick Ratio": "float",
+    "Current Ratio": "float",
+    "Debt/Eq": "float",
+    "LT Debt/Eq": "float",
+    "Short Ratio": "float",
+    "Beta": "float",
+    "ATR (14)": "float",
+    "RSI (14)": "float",
+    "Recom": "float",
+    "Target Price": "float",
+    "Rel Volume": "float",
+    "Prev Close": "float",
+    "Price": "float",
+    "Insider Own": "fraction",
+    "Insider Trans": "fraction",
+    "Inst Own": "fraction",
+    "Inst Trans": "fraction",
+    "Short Float": "fraction",
+    "EPS this Y": "fraction",
+    "EPS growth next Y": "fraction",
+    "EPS next 5Y": "fraction",
+    "EPS past 5Y": "fraction",
+    "Sales past 5Y": "fraction",
+    "EPS Y/Y TTM": "fraction",
+    "Sales Y/Y TTM": "fraction",
+    "EPS Q/Q": "fraction",
+    "Sales Q/Q": "fraction",
+    "EPS Surprise": "fraction",
+    "Sales Surprise": "fraction",
+    "ROA": "fraction",
+    "ROE": "fraction",
+    "ROI": "fraction",
+    "Gross Margin": "fraction",
+    "Oper. Margin": "fraction",
+    "Profit Margin": "fraction",
+    "Payout": "fraction",
+    "Perf Week": "fraction",
+    "Perf Month": "fraction",
+    "Perf Quarter": "fraction",
+    "Perf Half Y": "fraction",
+    "Perf Year": "fraction",
+    "Perf YTD": "fraction",
+    "52W High": "fraction",
+    "52W Low": "fraction",
+    "SMA20": "fraction",
+    "SMA50": "fraction",
+    "SMA200": "fraction",
+    "Volatility (Week)": "fraction",
+    "Volatility (Month)": "fraction",
+    "Change": "fraction",
+    "52W Range": "range",
+    "Dividend Est.": "dividend",
+    "Dividend TTM": "dividend",
+    "Option/Short": "flags",
+    "Dividend Ex-Date": "date",
+    "IPO": "date",
+}
+
+
+def _count(text: str) -> int:
+    scale = _SCALES.get(text[-1])
+    return round(float(text[:-1]) * scale) if scale else int(text.replace(",", ""))
+
+
+def _fraction(text: str) -> float:
+    if text[-1] != "%":
+        raise ValueError(f"Not a percentage: {text}")
+    return float(text[:-1].replace(",", "")) / 100
+
+
+def _flag(text: str) -> bool:
+    if text not in ("Yes", "No"):
+        raise ValueError(f"Not a flag: {text}")
+    return text == "Yes"
+
+
+def _range(text: str) -> tuple:
+    low, high = text.split(" - ")
+    return float(low), float(high)
+
+
+def _dividend(text: str) -> tuple:
+    amount, percent = text.rstrip(")").split(" (")
+    return _snapshot_value(amount), _snapshot_value(percent)
+
+
+def _guess(text: str):
+    """ Converts a value by its shape, for snapshot keys without a known type. """
+
+    if text in MISSING:
+        return None
+    if " / " in text:
+        return tuple(_guess(part) for part in text.split(" / "))
+    if " - " in text:
+        return tuple(_guess(part) for part in text.split(" - "))
+    if text[-1] == ")" and " (" in text:
+        return tuple(_guess(part) for part in text[:-1].split(" ("))
+    for parse in (_fraction, _count, _PARSERS["float"], _flag):
+        try:
+            return parse(text)
+        except ValueError:
+            continue
+    return text
+
+
+_SNAPSHOT_PARSERS: Dict[str, Callable[[str], object]] = {
+    "float": _PARSERS["float"],
+    "count": _count,
+    "fraction": _fraction,
+    "range": _range,
+    "dividend": _dividend,
+    "flags": lambda text: tuple(_flag(part) for part in text.split(" / ")),
+    "date": _date,
+    "str": str,
+}
+
+
+def _snapshot_value(text: Optional[str]):
+    return None if text is None or text in MISSING else _guess(text)
+
+
+@functools.lru_cache(maxsize=None)
+def snapshot_converter(key: str) -> Callable[[str], object]:
+    """
+    Returns the converter of a quote snapshot value, resolved once per key name.
+
+    Missing values ("-") become None, and values not matching the key's type (e.g. after
+    a layout change) are converted by their shape instead of failing.
+    """
+
+    if key not in SNAPSHOT_TYPES:
+        return _snapshot_value
+
+    parse = _SNAPSHOT_PARSERS[SNAPSHOT_TYPES[key]]
+
+    def convert(text):
+        if text is None or text in MISSING:
+            return None
+        try:
+            return parse(text)
+        except (ValueError, IndexError):
+            return _guess(text)
+
+    return convert
+
+
+def convert_snapshot(values: Dict[str, Optional[str]]) -> Dict[str, object]:
+    """ Returns the typed view of a get_stock result, see SNAPSHOT_TYPES. """
+
+    return {key: snapshot_converter(key)(value) for key, value in values.items()}
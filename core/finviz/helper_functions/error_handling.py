@@ -1,6 +1,36 @@
+from typing import Dict, NamedTuple
+
 from ..config import connection_settings
 
 
+class ErrorInfo(NamedTuple):
+    """ The type, arguments and attributes of an exception, kept in place of the exception and its traceback. """
+
+    type: type
+    args: tuple
+    attributes: Dict[str, object] = {}
+
+    @classmethod
+    def of(cls, error: BaseException) -> "ErrorInfo":
+        return cls(type(error), error.args, dict(getattr(error, "__dict__", {})))
+
+    def exception(self) -> BaseException:
+        """ Returns a new exception of the stored type, arguments and attributes, without a traceback. """
+
+        # __init__ is skipped: the exceptions below format their message from their arguments,
+        # and attributes set in __init__, like HTTPError.response, are carried over instead
+        error = self.type.__new__(self.type, *self.args)
+        error.args = self.args
+        error.__dict__.update(self.attributes)
+        return error
+
+
+def copy_exception(error: BaseException) -> BaseException:
+    """ Returns a copy of an exception, for a caller to raise with a traceback of its own. """
+
+    return ErrorInfo.of(error).exception()
+
+
 class NoResults(Exception):
     """ Raise when there are no results found. """
 
@@ -66,3 +96,17 @@ class ConnectionTimeout(Exception):
         super(ConnectionTimeout, self).__init__(
             f'Connection timed out after {connection_settings["CONNECTION_TIMEOUT"]} while trying to reach {webpage_link}'
         )
+
+
+class MissingRecording(Exception):
+    """ Raise when the replay transport has no recorded response for a request. """
+
+    def __init__(self, request):
+        super(MissingRecording, self).__init__(f"No recorded response for request: {request}")
+
+
+class InvalidExportFormat(Exception):
+    """ Raise when the given export format is not supported. """
+
+    def __init__(self, arg):
+        super(InvalidExportFormat, self).__init__(f"Invalid export format called: {arg}")
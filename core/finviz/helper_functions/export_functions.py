@@ -0,0 +1,190 @@
+import abc
+import array
+import contextlib
+import csv
+import datetime
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+from . import column_types
+from .error_handling import InvalidExportFormat
+from .row_table import RowTable
+
+# Rows buffered per Arrow record batch / Parquet row group, which bounds the export's memory
+ROW_GROUP_SIZE = 10000
+
+EXPORT_FORMATS = ("ndjson", "csv", "arrow", "parquet")
+
+_EXTENSIONS = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+    ".parquet": "parquet",
+}
+
+
+def export_format(target, fmt: Optional[str] = None) -> str:
+    """ Returns the export format, given or inferred from the extension of the target path. """
+
+    if fmt is None and isinstance(target, (str, os.PathLike)):
+        fmt = _EXTENSIONS.get(os.path.splitext(os.fspath(target))[1].lower())
+    if fmt not in EXPORT_FORMATS:
+        raise InvalidExportFormat(fmt if fmt is not None else target)
+    return fmt
+
+
+def _typed_columns(page: RowTable, headers: List[str], types: Optional[Dict[str, str]]) -> Dict[str, List]:
+    """ Returns the columns of a page as Python values, None where a cell is missing. """
+
+    kinds = column_types.column_types(headers, types)
+    columns = column_types.to_columns(headers, page, types)
+    for header, column in columns.items():
+        if isinstance(column, array.array):
+            cast = int if kinds[header] == "int" else float
+            columns[header] = [None if value != value else cast(value) for value in column]
+    return columns
+
+
+def _text_columns(page: RowTable, headers: List[str]) -> Dict[str, List]:
+    return {header: page.column(header) for header in headers}
+
+
+class _TextWriter(abc.ABC):
+    """ Writes rows to a text file as each page arrives. """
+
+    def __init__(self, target, headers: List[str], stack: contextlib.ExitStack):
+        if isinstance(target, (str, os.PathLike)):
+            target = stack.enter_context(open(target, "w", encoding="utf-8", newline=""))
+        self.file = target
+        self.headers = headers
+
+    @abc.abstractmethod
+    def write(self, columns: Dict[str, List]):
+        """ Writes the rows of one page, given as columns. """
+
+    def close(self):
+        self.file.flush()
+
+
+def _json_default(value):
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _NdjsonWriter(_TextWriter):
+    def write(self, columns: Dict[str, List]):
+        headers = self.headers
+        for values in zip(*(columns[header] for header in headers)):
+            self.file.write(json.dumps(dict(zip(headers, values)), ensure_ascii=False, default=_json_default))
+            self.file.write("\n")
+
+
+class _CsvWriter(_TextWriter):
+    def __init__(self, target, headers: List[str], stack: contextlib.ExitStack):
+        super().__init__(target, headers, stack)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(headers)
+
+    def write(self, columns: Dict[str, List]):
+        self.writer.writerows(zip(*(columns[header] for header in self.headers)))
+
+
+class _ArrowWriter:
+    """ Writes rows as Arrow record batches or Parquet row groups of row_group_size rows. """
+
+    def __init__(self, target, headers: List[str], stack: contextlib.ExitStack, kinds: Dict[str, str],
+                 parquet: bool, row_group_size: int):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Arrow and Parquet exports require pyarrow: pip install pyarrow")
+
+        arrow_types = {
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "scaled": pa.float64(),
+            "percent": pa.float64(),
+            "date": pa.date32(),
+            "str": pa.string(),
+        }
+        self.pa = pa
+        self.headers = headers
+        self.schema = pa.schema([(header, arrow_types[kinds[header]]) for header in headers])
+        self.row_group_size = row_group_size
+        self.pending = {header: [] for header in headers}
+        self.pending_rows = 0
+
+        if parquet:
+            import pyarrow.parquet as pq
+
+            self.writer = pq.ParquetWriter(target, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(target, self.schema)
+        stack.callback(self.writer.close)
+
+    def write(self, columns: Dict[str, List]):
+        for header in self.headers:
+            self.pending[header].extend(columns[header])
+        self.pending_rows += len(columns[self.headers[0]]) if self.headers else 0
+        if self.pending_rows >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.pending_rows:
+            return
+        arrays = [
+            self.pa.array(self.pending[field.name], type=field.type) for field in self.schema
+        ]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+        self.pending = {header: [] for header in self.headers}
+        self.pending_rows = 0
+
+    def close(self):
+        self._flush()
+
+
+def export_rows(
+    pages: Iterable[RowTable],
+    headers: List[str],
+    target,
+    fmt: Optional[str] = None,
+    types: Optional[Dict[str, str]] = None,
+    typed: bool = True,
+    row_group_size: int = ROW_GROUP_SIZE,
+) -> int:
+    """
+    Writes pages of screener rows to a file as they arrive and returns the number of rows written.
+
+    target is a path or an open file (text for NDJSON and CSV, binary for Arrow and Parquet).
+    With typed, cells are converted by column type (see column_types); otherwise they are
+    written as the text FinViz shows. Only one page, or one row group, is held at a time.
+    """
+
+    fmt = export_format(target, fmt)
+    headers = list(dict.fromkeys(headers))  # Duplicated headers hold a single column, as in the rows
+    kinds = column_types.column_types(headers, types) if typed else dict.fromkeys(headers, "str")
+
+    written = 0
+    with contextlib.ExitStack() as stack:
+        if fmt == "ndjson":
+            writer = _NdjsonWriter(target, headers, stack)
+        elif fmt == "csv":
+            writer = _CsvWriter(target, headers, stack)
+        else:
+            writer = _ArrowWriter(target, headers, stack, kinds, fmt == "parquet", row_group_size)
+
+        for page in pages:
+            if not isinstance(page, RowTable) or not set(headers).issubset(page.headers):
+                page = RowTable(headers, ([row.get(header) for header in headers] for row in page))
+            columns = _typed_columns(page, headers, types) if typed else _text_columns(page, headers)
+            writer.write(columns)
+            written += len(page)
+
+        writer.close()
+
+    return written
@@ -0,0 +1,135 @@
+import datetime
+import functools
+from typing import Optional, Tuple
+
+_MONTHS = {
+    month: number
+    for number, month in enumerate(
+        ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"], 1
+    )
+}
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+# FinViz shows news times in US/Eastern
+try:
+    from zoneinfo import ZoneInfo
+
+    _EASTERN = ZoneInfo("America/New_York")
+except (ImportError, KeyError):  # Python 3.8, or no time zone database (KeyError covers ZoneInfoNotFoundError)
+    _EASTERN = None
+
+
+def _nth_sunday(year: int, month: int, n: int) -> int:
+    """ Returns the day of the month of the nth Sunday. """
+
+    first = datetime.date(year, month, 1).weekday()  # Monday is 0
+    return 1 + (6 - first) % 7 + 7 * (n - 1)
+
+
+def eastern_utc_offset(day: datetime.date, hour: int) -> int:
+    """
+    Returns the UTC offset of a US/Eastern wall clock time, in seconds.
+
+    Follows the DST rules in force since 2007 (second Sunday of March to first Sunday of
+    November, at 2AM), and resolves the skipped and repeated hours like zoneinfo does.
+    """
+
+    start = datetime.date(day.year, 3, _nth_sunday(day.year, 3, 2))
+    end = datetime.date(day.year, 11, _nth_sunday(day.year, 11, 1))
+    if start < day < end or (day == start and hour >= 3) or (day == end and hour < 2):
+        return -4 * 3600
+    return -5 * 3600
+
+
+@functools.lru_cache(maxsize=2048)
+def parse_clock(text: str) -> Optional[Tuple[int, int]]:
+    """ Returns (hour, minute) of a 12-hour time like "06:00AM", or None when malformed. """
+
+    hour, _, rest = text.partition(":")
+    minute, meridiem = rest[:2], rest[2:].upper()
+    if not (hour.isdigit() and minute.isdigit() and meridiem in ("AM", "PM")):
+        return None
+
+    hour, minute = int(hour), int(minute)
+    if not (1 <= hour <= 12 and minute <= 59):
+        return None
+    return hour % 12 + (12 if meridiem == "PM" else 0), minute
+
+
+@functools.lru_cache(maxsize=2048)
+def parse_day(text: str) -> Optional[datetime.date]:
+    """ Returns the date of a news day like "Dec-15-24", or None when malformed. """
+
+    month, _, rest = text.partition("-")
+    day, _, year = rest.partition("-")
+    month = _MONTHS.get(month.upper())
+    if month is None or not (day.isdigit() and year.isdigit() and len(year) == 2):
+        return None
+
+    year = int(year)
+    try:
+        return datetime.date(year + (2000 if year < 69 else 1900), month, int(day))  # As %y does
+    except ValueError:
+        return None
+
+
+class NewsTimestampDecoder:
+    """
+    Decodes the timestamps of one news table, where only the first row of a day has its date.
+
+    Handles "Dec-15-24 06:00AM", "Today 06:00AM" and "06:00AM" (the day of the previous row,
+    or today). Today is read once, when the decoder is created, and malformed timestamps
+    decode to None instead of raising.
+    """
+
+    def __init__(self, today: Optional[datetime.date] = None):
+        self.today = today or datetime.date.today()
+        self.day = None
+
+    def _decode(self, text: str) -> Optional[Tuple[datetime.date, Tuple[int, int]]]:
+        if "Today" in text:
+            day, clock = self.today, text.replace("Today", "").strip()
+        elif len(text) > 8 and "-" in text:
+            date_text, _, clock = text.partition(" ")
+            day, clock = parse_day(date_text), clock.strip()
+            if day is None:
+                return None
+        else:
+            day, clock = self.day or self.today, text
+
+        clock = parse_clock(clock)
+        if clock is None:
+            return None
+
+        self.day = day
+        return day, clock
+
+    def datetime(self, text: str) -> Optional[datetime.datetime]:
+        """ Returns the naive datetime of a timestamp, in US/Eastern as FinViz shows it. """
+
+        decoded = self._decode(text)
+        if decoded is None:
+            return None
+        day, (hour, minute) = decoded
+        return datetime.datetime(day.year, day.month, day.day, hour, minute)
+
+    def epoch(self, text: str) -> Optional[int]:
+        """ Returns a timestamp as seconds since the epoch, reading the FinViz time as US/Eastern. """
+
+        decoded = self._decode(text)
+        if decoded is None:
+            return None
+        day, (hour, minute) = decoded
+        if _EASTERN is not None:
+            return int(datetime.datetime(day.year, day.month, day.day, hour, minute, tzinfo=_EASTERN).timestamp())
+        wall = (day.toordinal() - _EPOCH_ORDINAL) * 86400 + hour * 3600 + minute * 60
+        return wall - eastern_utc_offset(day, hour)
+
+    def text(self, text: str) -> Optional[str]:
+        """ Returns a timestamp formatted as "%Y-%m-%d %H:%M". """
+
+        decoded = self._decode(text)
+        if decoded is None:
+            return None
+        day, (hour, minute) = decoded
+        return f"{day.isoformat()} {hour:02d}:{minute:02d}"
@@ -0,0 +1,133 @@
+import threading
+from typing import Callable, Dict, Optional
+
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+# Expressions prefixed with "xpath:" are XPath, the others CSS selectors. XPath expressions
+# without a leading "/" are relative to the element they are applied to (e.g. a table row).
+_COMMON = {
+    "cell_texts": "xpath:td//text()",
+    "normalized_text": "xpath:normalize-space()",
+    "texts": "xpath:text()",
+}
+
+QUOTE_SELECTORS = dict(
+    _COMMON,
+    # Class selectors are scoped to their tag: a bare ".class" tests every element of the page
+    ticker="h1.quote-header_ticker-wrapper_ticker",
+    company="h2.quote-header_ticker-wrapper_company a",
+    tab_links="a.tab-link",
+    snapshot_rows='tr[class="table-dark-row"]',
+    news_table='table[id="news-table"]',
+    news_rows="xpath:./tr[not(@id)]",
+    news_cells="xpath:./td",
+    news_link='a[class="tab-link-news"]',
+    news_source='div[class="news-link-right"] span',
+    insider_table='table[class="body-table insider-trading-table"]',
+    ratings_table='table[class="js-table-ratings fullview-ratings-outer"]',
+    export_ratings_table='table[class="fullview-ratings-outer"]',
+)
+
+SCREENER_SELECTORS = dict(
+    _COMMON,
+    rows='tr[valign="top"]',
+    headers="thead tr th",
+    legacy_headers='tr[valign="middle"] td',
+    first_page_option='option[value="1"]',
+    # The counter reads "#1 / 8,123 Total", in a div on the current layout and a td on the old one
+    total_rows='xpath://div[@class="count-text whitespace-nowrap"] | //td[@class="count-text"]',
+)
+
+NEWS_SELECTORS = dict(
+    _COMMON,
+    dates='td[class="nn-date"]',
+    links='a[class="nn-tab-link"]',
+)
+
+CRYPTO_SELECTORS = dict(
+    _COMMON,
+    header_row='tr[valign="middle"]',
+    rows='tr[valign="top"]',
+)
+
+
+def _compile(expression: str) -> Callable:
+    if expression.startswith("xpath:"):
+        # Plain strings: lxml's "smart" ones keep their element, and with it the whole tree, alive
+        return etree.XPath(expression[len("xpath:"):], smart_strings=False)
+    return CSSSelector(expression, translator="html")
+
+
+class Layout:
+    """
+    The selectors of one version of a page's markup.
+
+    Selectors are read as attributes and return a callable taking the element to search
+    from. Each one is translated and compiled once, on first use, and then reused.
+    """
+
+    def __init__(self, page: str, version: str, selectors: Dict[str, str]):
+        self.page = page
+        self.version = version
+        self.selectors = dict(selectors)
+
+    def __getattr__(self, name: str) -> Callable:
+        try:
+            expression = self.selectors[name]
+        except KeyError:
+            raise AttributeError(f"{self.page} layout {self.version} has no selector {name}")
+
+        compiled = _compile(expression)
+        setattr(self, name, compiled)  # Later lookups find the attribute, __getattr__ is skipped
+        return compiled
+
+    def compile_all(self) -> "Layout":
+        """ Compiles every selector now, e.g. to fail fast on a malformed expression. """
+
+        for name in self.selectors:
+            getattr(self, name)
+        return self
+
+
+_LAYOUTS: Dict[str, Dict[str, Layout]] = {}
+_CURRENT: Dict[str, str] = {}
+_LAYOUTS_LOCK = threading.Lock()
+
+
+def register_layout(
+    page: str, version: str, selectors: Dict[str, str], current: bool = True
+) -> Layout:
+    """ Adds a version of a page's selectors, by default making it the one extractors use. """
+
+    layout = Layout(page, version, selectors)
+    with _LAYOUTS_LOCK:
+        _LAYOUTS.setdefault(page, {})[version] = layout
+        if current or page not in _CURRENT:
+            _CURRENT[page] = version
+
+    return layout
+
+
+def get_layout(page: str, version: Optional[str] = None) -> Layout:
+    """ Returns the selectors of a page, in its current layout unless a version is given. """
+
+    return _LAYOUTS[page][version or _CURRENT[page]]
+
+
+def set_layout(page: str, version: str) -> str:
+    """ Switches the layout extractors use for a page and returns the previous version. """
+
+    if version not in _LAYOUTS[page]:
+        raise ValueError(f"Unknown {page} layout: {version}")
+
+    with _LAYOUTS_LOCK:
+        previous, _CURRENT[page] = _CURRENT[page], version
+
+    return previous
+
+
+register_layout("quote", "2024", QUOTE_SELECTORS)
+register_layout("screener", "2024", SCREENER_SELECTORS)
+register_layout("news", "2024", NEWS_SELECTORS)
+register_layout("crypto", "2024", CRYPTO_SELECTORS)
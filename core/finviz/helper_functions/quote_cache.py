@@ -0,0 +1,221 @@
+import collections
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ..config import connection_settings
+from .single_flight import SingleFlight
+
+QUOTE_CACHE_STORES = ("tree", "compressed", "sections")
+
+# lxml trees of quote pages were measured at about 12 bytes of memory per byte of HTML
+TREE_BYTES_PER_PAGE_BYTE = 12
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires")
+
+    def __init__(self, value, size: int, expires: Optional[float]):
+        self.value = value
+        self.size = size
+        self.expires = expires
+
+
+class QuoteCache:
+    """
+    In-memory LRU cache of quote pages, bounded by entry count and by (estimated) bytes.
+
+    Entries expire ttl seconds after they are stored. Limits set to None are not enforced.
+    What a page is stored as (a parsed tree, compressed HTML or the extracted sections) is
+    up to the caller and is named by store; the cache only needs each entry's size.
+
+    get_or_load loads a missing page once however many threads ask for it at the same
+    time; the others wait for that load and share its entry.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        store: str = "tree",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if store not in QUOTE_CACHE_STORES:
+            raise ValueError(f"Invalid quote cache store: {store}")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.store = store
+        self._clock = clock
+        self._entries: "collections.OrderedDict[Hashable, _Entry]" = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loading = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.loads = 0
+        self._late_hits = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """ Returns the value stored for key, or None when it is missing or expired. """
+
+        with self._lock:
+            entry = self.__lookup(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.value
+
+    def __lookup(self, key: Hashable) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires is not None and entry.expires <= self._clock():
+            self.__remove(key)
+            self.expirations += 1
+            return None
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def __stored(self, key: Hashable) -> Optional[Any]:
+        """ Looks a key up again once its load is ours, in case another load stored it meanwhile. """
+
+        with self._lock:
+            entry = self.__lookup(key)
+            if entry is None:
+                return None
+            self._late_hits += 1
+            return entry.value
+
+    def __store(self, key: Hashable, loaded: Tuple[Any, int]) -> Any:
+        value, size = loaded
+        self.set(key, value, size)
+        with self._lock:
+            self.loads += 1
+        return value
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Tuple[Any, int]]) -> Any:
+        """ Returns the value of key, calling load() for (value, size) on a miss unless another thread already is. """
+
+        value = self.get(key)
+        if value is None:
+            value = self._loading.do(key, self.__load, key, load)
+        return value
+
+    def __load(self, key: Hashable, load: Callable[[], Tuple[Any, int]]) -> Any:
+        value = self.__stored(key)
+        return self.__store(key, load()) if value is None else value
+
+    def set(self, key: Hashable, value: Any, size: int = 0):
+        """ Stores a value of the given size, evicting the least recently used entries over the limits. """
+
+        expires = None if self.ttl is None else self._clock() + self.ttl
+
+        with self._lock:
+            if key in self._entries:
+                self.__remove(key)
+            self._entries[key] = _Entry(value, size, expires)
+            self._bytes += size
+            self.__evict()
+
+    def __remove(self, key: Hashable):
+        self._bytes -= self._entries.pop(key).size
+
+    def __evict(self):
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self.__remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """ Removes the entry of a key and returns whether there was one. """
+
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self.__remove(key)
+            return True
+
+    def clear(self):
+        """ Removes every entry. """
+
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry.expires is None or entry.expires > self._clock())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """
+        Returns the number of entries, their size and the cache counters.
+
+        loads counts pages loaded by get_or_load, and coalesced the misses served by
+        another caller's load instead, whether they waited for it or found it stored by then.
+        """
+
+        with self._lock:
+            return dict(
+                entries=len(self._entries),
+                bytes=self._bytes,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                loads=self.loads,
+                coalesced=self._loading.shared + self._late_hits,
+            )
+
+
+def approximate_size(value: Any) -> int:
+    """ Returns the memory taken by nested dicts, lists, tuples and strings, in bytes. """
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(key) + approximate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approximate_size(item) for item in value)
+    return size
+
+
+_QUOTE_CACHE = None
+_QUOTE_CACHE_LOCK = threading.Lock()
+
+
+def get_quote_cache() -> QuoteCache:
+    """ Returns the shared quote page cache, configured from connection_settings. """
+
+    global _QUOTE_CACHE
+
+    if _QUOTE_CACHE is None:
+        with _QUOTE_CACHE_LOCK:
+            if _QUOTE_CACHE is None:
+                _QUOTE_CACHE = QuoteCache(
+                    connection_settings["QUOTE_CACHE_MAX_ENTRIES"],
+                    connection_settings["QUOTE_CACHE_MAX_BYTES"],
+                    connection_settings["QUOTE_CACHE_TTL"],
+                    connection_settings["QUOTE_CACHE_STORE"],
+                )
+
+    return _QUOTE_CACHE
+
+
+def reset_quote_cache():
+    """ Drops the shared cache and its pages, so the next request picks up changed settings. """
+
+    global _QUOTE_CACHE
+
+    with _QUOTE_CACHE_LOCK:
+        _QUOTE_CACHE = None
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from ..config import connection_settings
+
+
+class TokenBucket:
+    """ Thread-safe token bucket shared by every outgoing request to FinViz. """
+
+    def __init__(self, rate: Optional[float], burst: int = 1):
+        self.rate = rate
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rate) and self.rate > 0
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def reserve(self, tokens: int = 1) -> float:
+        """ Takes tokens from the bucket and returns how long the caller has to wait before sending. """
+
+        if not self.enabled:
+            return 0.0
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: int = 1):
+        """ Blocks the current thread until the tokens are available. """
+
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 1):
+        """ Suspends the current coroutine until the tokens are available. """
+
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def drain(self):
+        """ Empties the bucket, used after FinViz has answered with a throttle response. """
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+    @property
+    def fill_level(self) -> float:
+        """ Number of tokens currently available (negative when requests are queued). """
+
+        if not self.enabled:
+            return float(self.burst)
+
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    @property
+    def wait_time(self) -> float:
+        """ Seconds a new request would have to wait right now. """
+
+        if not self.enabled:
+            return 0.0
+
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(1 - self._tokens, 0.0) / self.rate
+
+
+_RATE_LIMITER = None
+_RATE_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """ Returns the process-wide rate limiter configured from connection_settings. """
+
+    global _RATE_LIMITER
+
+    if _RATE_LIMITER is None:
+        with _RATE_LIMITER_LOCK:
+            if _RATE_LIMITER is None:
+                _RATE_LIMITER = TokenBucket(
+                    connection_settings["RATE_LIMIT"], connection_settings["RATE_BURST"]
+                )
+
+    return _RATE_LIMITER
+
+
+def reset_rate_limiter():
+    """ Drops the current limiter so the next request picks up changed settings. """
+
+    global _RATE_LIMITER
+
+    with _RATE_LIMITER_LOCK:
+        _RATE_LIMITER = None
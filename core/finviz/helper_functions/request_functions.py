@@ -1,81 +1,442 @@
 import asyncio
+import atexit
+import collections
+import functools
 import os
-from typing import Callable, Dict, List
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Union
 
 import aiohttp
 import requests
 import tenacity
 import urllib3
-from lxml import html
 from requests import Response
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 from user_agent import generate_user_agent
 
 from ..config import connection_settings
-from .error_handling import ConnectionTimeout
+from .error_handling import ConnectionTimeout, TooManyRequests
+from .rate_limiter import get_rate_limiter
+from .response_cache import get_response_cache
+from .scraper_functions import parse_page
+from .single_flight import SingleFlight
+from .transport import THROTTLE_BODY, RawResponse, canonical_url, get_transport
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """ Returns the shared keep-alive session used for synchronous requests, creating it on first use. """
+
+    global _SESSION
+
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                adapter = HTTPAdapter(
+                    pool_connections=connection_settings["POOL_CONNECTIONS"],
+                    pool_maxsize=connection_settings["POOL_MAXSIZE"],
+                    pool_block=connection_settings["POOL_BLOCK"],
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+
+    return _SESSION
+
+
+def close_session():
+    """ Closes the shared session and its pooled connections. The next request opens a new one. """
+
+    global _SESSION
+
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+
+
+def session_stats() -> Dict:
+    """ Returns connection reuse statistics of the shared session. """
+
+    stats = dict(hosts=0, connections=0, requests=0, reused=0)
+    if _SESSION is None:
+        return stats
+
+    for adapter in set(_SESSION.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats["hosts"] += 1
+            stats["connections"] += pool.num_connections
+            stats["requests"] += pool.num_requests
+
+    stats["reused"] = max(stats["requests"] - stats["connections"], 0)
+    return stats
+
+
+_ASYNC_SESSIONS = {}
+_BACKGROUND_LOOP = None
+_BACKGROUND_LOOP_LOCK = threading.Lock()
+
+
+async def _session_lifetime(loop: asyncio.AbstractEventLoop, session: aiohttp.ClientSession):
+    """ Holds a loop's session until the loop shuts down its async generators, then closes it. """
+
+    try:
+        yield
+    finally:
+        if _ASYNC_SESSIONS.get(loop, (None,))[0] is session:
+            del _ASYNC_SESSIONS[loop]
+        if not session.closed:
+            await session.close()
+
+
+async def get_async_session() -> aiohttp.ClientSession:
+    """
+    Returns the long-lived aiohttp session bound to the running event loop, creating it on first use.
+
+    The session is closed and forgotten when the loop shuts down its async generators,
+    which asyncio.run does before closing the loop, or earlier by close_async_session.
+    """
+
+    loop = asyncio.get_running_loop()
+    session, lifetime = _ASYNC_SESSIONS.get(loop, (None, None))
+
+    if session is None or session.closed:
+        if lifetime is not None:
+            await lifetime.aclose()
+        conn = aiohttp.TCPConnector(
+            limit_per_host=connection_settings["CONCURRENT_CONNECTIONS"],
+            ttl_dns_cache=connection_settings["DNS_CACHE_TTL"],
+            keepalive_timeout=connection_settings["KEEPALIVE_TIMEOUT"],
+        )
+        timeout = aiohttp.ClientTimeout(total=connection_settings["CONNECTION_TIMEOUT"])
+        session = aiohttp.ClientSession(connector=conn, timeout=timeout)
+        lifetime = _session_lifetime(loop, session)
+        await lifetime.__anext__()
+        _ASYNC_SESSIONS[loop] = (session, lifetime)
+
+    return session
+
+
+async def close_async_session():
+    """ Closes the aiohttp session bound to the running event loop. """
+
+    _, lifetime = _ASYNC_SESSIONS.get(asyncio.get_running_loop(), (None, None))
+    if lifetime is not None:
+        await lifetime.aclose()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """ Returns the event loop the synchronous Connector API runs on, so its session outlives each call. """
+
+    global _BACKGROUND_LOOP
+
+    if _BACKGROUND_LOOP is None:
+        with _BACKGROUND_LOOP_LOCK:
+            if _BACKGROUND_LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="finviz-connector", daemon=True
+                ).start()
+                _BACKGROUND_LOOP = loop
+
+    return _BACKGROUND_LOOP
+
+
+def _run_in_background(coroutine):
+    return asyncio.run_coroutine_threadsafe(coroutine, _get_background_loop()).result()
+
+
+@atexit.register
+def close_background_session():
+    """ Closes the session used by the synchronous Connector API. """
+
+    if _BACKGROUND_LOOP is not None and _BACKGROUND_LOOP.is_running():
+        _run_in_background(close_async_session())
+
+
+_PARSE_EXECUTORS = {}
+_PARSE_EXECUTORS_LOCK = threading.Lock()
+
+
+def get_parse_executor(parse_executor: Union[str, Executor, None]) -> Optional[Executor]:
+    """
+    Resolves the parse stage of a scrape.
+
+    None parses inline, "thread" and "process" select the shared thread or process pool
+    (lxml releases the GIL while parsing), and an Executor instance is used as given.
+    """
+
+    if parse_executor is None or isinstance(parse_executor, Executor):
+        return parse_executor
+
+    if parse_executor not in ("thread", "process"):
+        raise ValueError(f"Invalid parse executor: {parse_executor}")
+
+    with _PARSE_EXECUTORS_LOCK:
+        if parse_executor not in _PARSE_EXECUTORS:
+            pool_class = (
+                ThreadPoolExecutor if parse_executor == "thread" else ProcessPoolExecutor
+            )
+            _PARSE_EXECUTORS[parse_executor] = pool_class(
+                max_workers=connection_settings["PARSE_WORKERS"]
+            )
+
+        return _PARSE_EXECUTORS[parse_executor]
+
+
+@atexit.register
+def shutdown_parse_executors():
+    """ Shuts down the shared parse pools. They are recreated on next use. """
+
+    with _PARSE_EXECUTORS_LOCK:
+        for executor in _PARSE_EXECUTORS.values():
+            executor.shutdown(wait=True)
+        _PARSE_EXECUTORS.clear()
+
+
+def _scrape_page(scrape_func: Callable, page, css_select: bool, args, kwargs):
+    """ Parses a page and runs the scrape function on it. Module-level so process pools can pickle it. """
+
+    if css_select:
+        page = parse_page(page)
+    return scrape_func(page, *args, **kwargs)
+
+
+def is_throttled(content: bytes) -> bool:
+    """ Tells whether a raw response body is FinViz's throttling notice, without decoding it. """
+
+    return len(content) <= len(THROTTLE_BODY) + 8 and content.strip() == THROTTLE_BODY
+
+
+# Concurrent identical requests share one network call and its result or exception
+_IN_FLIGHT = SingleFlight()
+
+
+def coalescing_stats() -> Dict:
+    """ Returns how many requests were issued and how many of them joined an identical request in flight. """
+
+    return _IN_FLIGHT.stats()
+
+
+def _retry_attempts_exhausted(retry_state) -> bool:
+    return retry_state.attempt_number >= connection_settings["MAX_RETRIES"]
+
+
+def _drain_rate_limiter(retry_state):
+    get_rate_limiter().drain()
+
+
+# Retries a request that FinViz throttled, backing off and draining the shared limiter in between
+retry_throttled = tenacity.retry(
+    retry=tenacity.retry_if_exception_type(TooManyRequests),
+    wait=tenacity.wait_exponential(max=30),
+    stop=_retry_attempts_exhausted,
+    before_sleep=_drain_rate_limiter,
+    reraise=True,
+)
+
+
+def _to_response(raw: RawResponse) -> Response:
+    """ Wraps a transport response into a requests Response for the callers of finviz_request. """
+
+    response = Response()
+    response.url = raw.url
+    response.status_code = raw.status
+    response.encoding = raw.encoding
+    response._content = raw.content
+    return response
+
 
 def http_request_get(
-    url, session=None, payload=None, parse=True, user_agent=generate_user_agent()
+    url,
+    session=None,
+    payload=None,
+    parse=True,
+    user_agent=generate_user_agent(),
+    use_cache=True,
+    raw=False,
 ):
-    """ Sends a GET HTTP request to a website and returns its HTML content and full url address. """
+    """
+    Sends a GET HTTP request to a website and returns its HTML content and full url address.
+
+    The content is a parsed tree, or with parse=False the page text, or with raw=True the
+    RawResponse holding the undecoded body and its encoding.
+    When the response cache is enabled fresh entries are served from disk; use_cache=False bypasses it.
+    Callers requesting the same page at the same time share one request and the same result.
+    """
 
     if payload is None:
         payload = {}
 
+    return _IN_FLIGHT.do(
+        ("get", canonical_url(url, payload), parse, use_cache, raw),
+        _http_request_get,
+        url,
+        session,
+        payload,
+        parse,
+        user_agent,
+        use_cache,
+        raw,
+    )
+
+
+def _page_content(raw, parse, raw_response):
+    if raw_response:
+        return raw
+    return parse_page(raw) if parse else raw.text
+
+
+@retry_throttled
+def _http_request_get(url, session, payload, parse, user_agent, use_cache, raw_response=False):
+    cache = get_response_cache() if use_cache else None
+    cached = cache.get(url, payload) if cache is not None else None
+    if cached is not None:
+        return _page_content(cached, parse, raw_response), cached.url
+
+    if session is None:
+        session = get_session()
+
+    get_rate_limiter().acquire()
+
     try:
-        if session:
-            content = session.get(
-                url,
-                params=payload,
-                verify=False,
-                headers={"User-Agent": user_agent},
-            )
-        else:
-            content = requests.get(
-                url,
-                params=payload,
-                verify=False,
-                headers={"User-Agent": user_agent},
-            )
+        raw = get_transport().get(url, payload, {"User-Agent": user_agent}, session)
+
+        if is_throttled(raw.content):
+            raise TooManyRequests(url)
+
+        _to_response(raw).raise_for_status()  # Raise HTTPError for bad requests (4xx or 5xx)
+        if cache is not None:
+            cache.set(url, payload, raw.url, raw.status, raw.content, raw.encoding)
 
-        content.raise_for_status()  # Raise HTTPError for bad requests (4xx or 5xx)
-        if parse:
-            return html.fromstring(content.text), content.url
-        else:
-            return content.text, content.url
+        return _page_content(raw, parse, raw_response), raw.url
     except (asyncio.TimeoutError, requests.exceptions.Timeout):
         raise ConnectionTimeout(url)
 
 
-@tenacity.retry(wait=tenacity.wait_exponential())
-def finviz_request(url: str, user_agent: str) -> Response:
-    response = requests.get(url, headers={"User-Agent": user_agent})
-    if response.text == "Too many requests.":
-        raise Exception("Too many requests.")
+def finviz_request(url: str, user_agent: str, use_cache: bool = True) -> Response:
+    return _IN_FLIGHT.do(
+        ("page", url, use_cache), _finviz_request, url, user_agent, use_cache
+    )
+
+
+@retry_throttled
+def _finviz_request(url: str, user_agent: str, use_cache: bool) -> Response:
+    cache = get_response_cache() if use_cache else None
+    cached = cache.get(url) if cache is not None else None
+    if cached is not None:
+        return _to_response(cached)
+
+    get_rate_limiter().acquire()
+    raw = get_transport().get(url, None, {"User-Agent": user_agent}, get_session())
+    if is_throttled(raw.content):
+        raise TooManyRequests(url)
+
+    response = _to_response(raw)
+
+    if cache is not None and response.ok:
+        cache.set(url, None, raw.url, raw.status, raw.content, raw.encoding)
     return response
 
 
+def sequential_data_stream(
+    scrape_func: Callable,
+    urls: List[str],
+    user_agent: str,
+    *args,
+    css_select: bool = False,
+    parse_executor: Union[str, Executor, None] = None,
+    **kwargs
+) -> Iterator:
+    """
+    Requests the URL addresses one by one and yields each scraped page in URL order.
+
+    The scrape function receives the response, or with css_select the page parsed once
+    from its raw bytes. With a parse executor the next page is downloaded while the
+    previous ones are parsed.
+    """
+
+    executor = get_parse_executor(parse_executor)
+    pending = collections.deque()
+    max_pending = connection_settings["PARSE_WORKERS"] or os.cpu_count() or 1
+
+    for url in tqdm(urls, disable="DISABLE_TQDM" in os.environ):
+        response = finviz_request(url, user_agent)
+        page_kwargs = dict(kwargs, URL=url)
+
+        if executor is None:
+            yield _scrape_page(scrape_func, response, css_select, args, page_kwargs)
+            continue
+
+        pending.append(
+            executor.submit(_scrape_page, scrape_func, response, css_select, args, page_kwargs)
+        )
+        while len(pending) > max_pending or (pending and pending[0].done()):
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
 def sequential_data_scrape(
-    scrape_func: Callable, urls: List[str], user_agent: str, *args, **kwargs
+    scrape_func: Callable,
+    urls: List[str],
+    user_agent: str,
+    *args,
+    css_select: bool = False,
+    parse_executor: Union[str, Executor, None] = None,
+    **kwargs
 ) -> List[Dict]:
-    data = []
+    return list(
+        sequential_data_stream(
+            scrape_func,
+            urls,
+            user_agent,
+            *args,
+            css_select=css_select,
+            parse_executor=parse_executor,
+            **kwargs
+        )
+    )
 
-    for url in tqdm(urls, disable="DISABLE_TQDM" in os.environ):
-        try:
-            response = finviz_request(url, user_agent)
-            kwargs["URL"] = url
-            data.append(scrape_func(response, *args, **kwargs))
-        except Exception as exc:
-            raise exc
 
-    return data
+@retry_throttled
+async def _fetch_page_async(url: str, session: aiohttp.ClientSession, user_agent: str) -> bytes:
+    """ Sends an asynchronous HTTP request and returns the raw page body, raising HTTPError for 4xx and 5xx like http_request_get. """
+
+    await get_rate_limiter().acquire_async()
+
+    try:
+        raw = await get_transport().get_async(url, {"User-Agent": user_agent}, session)
+    except (asyncio.TimeoutError, requests.exceptions.Timeout):
+        raise ConnectionTimeout(url)
+
+    if is_throttled(raw.content):
+        raise TooManyRequests(url)
+
+    _to_response(raw).raise_for_status()
+    return raw.content
 
 
 class Connector:
-    """ Used to make asynchronous HTTP requests. """
+    """
+    Used to make asynchronous HTTP requests.
+
+    With pass_url the scrape function also receives the page URL as URL=, like it does
+    from sequential_data_stream. With return_exceptions a page that fails to download or
+    scrape (after the throttling retries) yields its exception instead of ending the run.
+    """
 
     def __init__(
         self,
@@ -83,13 +444,21 @@ class Connector:
         urls: List[str],
         user_agent: str,
         *args,
-        css_select: bool = False
+        css_select: bool = False,
+        session: Optional[aiohttp.ClientSession] = None,
+        parse_executor: Union[str, Executor, None] = None,
+        pass_url: bool = False,
+        return_exceptions: bool = False
     ):
         self.scrape_function = scrape_function
         self.urls = urls
         self.user_agent = user_agent
         self.arguments = args
         self.css_select = css_select
+        self.session = session
+        self.parse_executor = get_parse_executor(parse_executor)
+        self.pass_url = pass_url
+        self.return_exceptions = return_exceptions
         self.data = []
 
     async def __http_request__async(
@@ -99,45 +468,105 @@ class Connector:
     ):
         """ Sends asynchronous http request to URL address and scrapes the webpage. """
 
+        if not self.return_exceptions:
+            return await self.__scrape_url_async(url, session)
+
         try:
-            async with session.get(
-                url, headers={"User-Agent": self.user_agent}
-            ) as response:
-                page_html = await response.read()
+            return await self.__scrape_url_async(url, session)
+        except Exception as exc:
+            return exc
 
-                if page_html.decode("utf-8") == "Too many requests.":
-                    raise Exception("Too many requests.")
+    async def __scrape_url_async(self, url: str, session: aiohttp.ClientSession):
+        page_html = await _IN_FLIGHT.do_async(
+            ("async", url), _fetch_page_async, url, session, self.user_agent
+        )
 
-                if self.css_select:
-                    return self.scrape_function(
-                        html.fromstring(page_html), *self.arguments
-                    )
-                return self.scrape_function(page_html, *self.arguments)
-        except (asyncio.TimeoutError, requests.exceptions.Timeout):
-            raise ConnectionTimeout(url)
+        scrape = functools.partial(
+            _scrape_page,
+            self.scrape_function,
+            page_html,
+            self.css_select,
+            self.arguments,
+            {"URL": url} if self.pass_url else {},
+        )
+        if self.parse_executor is None:
+            return scrape()
 
-    async def __async_scraper(self):
-        """ Adds a URL's into a list of tasks and requests their response asynchronously. """
+        # Parse off the event loop so other sockets keep being serviced meanwhile
+        return await asyncio.get_running_loop().run_in_executor(self.parse_executor, scrape)
 
-        async_tasks = []
-        conn = aiohttp.TCPConnector(
-            limit_per_host=connection_settings["CONCURRENT_CONNECTIONS"]
-        )
-        timeout = aiohttp.ClientTimeout(total=connection_settings["CONNECTION_TIMEOUT"])
+    async def stream_async(
+        self, ordered: bool = True, concurrency: Optional[int] = None
+    ) -> AsyncIterator:
+        """
+        Yields the scraped pages while at most `concurrency` requests are in flight.
+
+        With ordered=True pages come out in URL order, otherwise in completion order.
+        Pages that finished early wait inside the bounded window, so memory stays flat.
+        """
+
+        if concurrency is None:
+            concurrency = connection_settings["CONCURRENT_CONNECTIONS"]
 
-        async with aiohttp.ClientSession(
-            connector=conn, timeout=timeout, headers={"User-Agent": self.user_agent}
-        ) as session:
-            for url in self.urls:
-                async_tasks.append(self.__http_request__async(url, session))
+        session = self.session or await get_async_session()
+        urls = iter(self.urls)
+        in_flight = collections.deque()
 
-            self.data = await asyncio.gather(*async_tasks)
+        def fill_window():
+            while len(in_flight) < max(concurrency, 1):
+                url = next(urls, None)
+                if url is None:
+                    return
+                in_flight.append(
+                    asyncio.ensure_future(self.__http_request__async(url, session))
+                )
 
-    def run_connector(self):
-        """ Starts the asynchronous loop and returns the scraped data. """
+        try:
+            fill_window()
+            while in_flight:
+                if ordered:
+                    page = await in_flight[0]
+                    in_flight.popleft()
+                    fill_window()
+                    yield page
+                else:
+                    done, _ = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        in_flight.remove(task)
+                    fill_window()
+                    for task in done:
+                        yield task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    def iter_connector(
+        self, ordered: bool = True, concurrency: Optional[int] = None
+    ) -> Iterator:
+        """ Synchronous counterpart of stream_async, yields the scraped pages as they arrive. """
+
+        pages = self.stream_async(ordered, concurrency)
 
-        asyncio.set_event_loop(asyncio.SelectorEventLoop())
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(self.__async_scraper())
+        try:
+            while True:
+                try:
+                    yield _run_in_background(pages.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            _run_in_background(pages.aclose())
+
+    async def run_async(self, concurrency: Optional[int] = None) -> List:
+        """ Scrapes every URL address on the caller's event loop and returns the pages in URL order. """
 
+        self.data = [page async for page in self.stream_async(concurrency=concurrency)]
         return self.data
+
+    def run_connector(self, concurrency: Optional[int] = None):
+        """ Runs the scraper on the shared background loop and returns the scraped data. """
+
+        return _run_in_background(self.run_async(concurrency))
@@ -0,0 +1,190 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from ..config import connection_settings
+from .transport import RawResponse, canonical_url
+
+
+class ResponseCache:
+    """
+    Persistent, size-bounded LRU cache of compressed response bodies.
+
+    Entries expire after the TTL of their endpoint. TTL rules are keyed by the page name,
+    optionally with query parameters that have to match (e.g. "screener.ashx?ft=4");
+    the most specific matching rule wins and URLs without a rule are not cached.
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttls: Dict[str, int]):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT, status INTEGER, encoding TEXT, body BLOB, "
+            "size INTEGER, expires REAL, accessed REAL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+
+    def ttl_for(self, key: str) -> Optional[int]:
+        """ Returns the TTL in seconds for a canonical URL, or None when it should not be cached. """
+
+        parts = urlsplit(key)
+        page = parts.path.rsplit("/", 1)[-1]
+        params = set(parse_qsl(parts.query, keep_blank_values=True))
+
+        best_ttl, best_specificity = None, -1
+        for rule, ttl in self.ttls.items():
+            rule_page, _, rule_query = rule.partition("?")
+            rule_params = set(parse_qsl(rule_query, keep_blank_values=True))
+            if rule_page != page or not rule_params <= params:
+                continue
+            if len(rule_params) > best_specificity:
+                best_ttl, best_specificity = ttl, len(rule_params)
+
+        return best_ttl
+
+    def get(self, url: str, payload: Optional[Dict] = None) -> Optional[RawResponse]:
+        """ Returns the cached response of a request, or None if it is missing or expired. """
+
+        key = canonical_url(url, payload)
+        now = time.time()
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, status, encoding, body, expires FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None or row[4] < now:
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+
+        return RawResponse(row[0], row[1], row[2], zlib.decompress(row[3]))
+
+    def set(
+        self,
+        url: str,
+        payload: Optional[Dict],
+        final_url: str,
+        status: int,
+        content: bytes,
+        encoding: Optional[str] = None,
+    ):
+        """ Stores a response if its endpoint has a TTL and evicts the least recently used entries. """
+
+        key = canonical_url(url, payload)
+        ttl = self.ttl_for(key)
+        if not ttl:
+            return
+
+        body = zlib.compress(content)
+        now = time.time()
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, final_url, status, encoding, body, len(body), now + ttl, now),
+            )
+            self.__evict()
+
+    def __evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        self._db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+        rows = self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed DESC"
+        ).fetchall()
+
+        kept = 0
+        for key, size in rows:
+            kept += size
+            if kept > self.max_bytes:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def invalidate(self, url: str, payload: Optional[Dict] = None):
+        """ Removes the cached response of a single request. """
+
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM responses WHERE key = ?", (canonical_url(url, payload),)
+            )
+
+    def clear(self):
+        """ Removes every cached response. """
+
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict:
+        """ Returns the number of entries, their compressed size and the hit/miss counters. """
+
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+
+        return dict(entries=entries, bytes=size, hits=self.hits, misses=self.misses)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_RESPONSE_CACHE = None
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """ Returns the shared response cache, or None when RESPONSE_CACHE is disabled. """
+
+    global _RESPONSE_CACHE
+
+    if not connection_settings["RESPONSE_CACHE"]:
+        return None
+
+    if _RESPONSE_CACHE is None:
+        with _RESPONSE_CACHE_LOCK:
+            if _RESPONSE_CACHE is None:
+                _RESPONSE_CACHE = ResponseCache(
+                    os.path.join(
+                        os.path.expanduser(connection_settings["RESPONSE_CACHE_DIR"]),
+                        "responses.sqlite3",
+                    ),
+                    connection_settings["RESPONSE_CACHE_MAX_BYTES"],
+                    connection_settings["RESPONSE_CACHE_TTL"],
+                )
+
+    return _RESPONSE_CACHE
+
+
+def reset_response_cache():
+    """ Closes the shared cache so the next request picks up changed settings. """
+
+    global _RESPONSE_CACHE
+
+    with _RESPONSE_CACHE_LOCK:
+        if _RESPONSE_CACHE is not None:
+            _RESPONSE_CACHE.close()
+            _RESPONSE_CACHE = None
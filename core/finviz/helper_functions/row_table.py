@@ -0,0 +1,122 @@
+import collections.abc
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+
+class Row(collections.abc.Mapping):
+    """
+    A read-only dictionary view of one table row.
+
+    The header -> position index is shared by every row of a table and the values are
+    the table's own tuple, so a row costs one small object instead of a dict per row.
+    """
+
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, index: Dict[str, int], values: Tuple[str, ...]):
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._index[key]]
+        except IndexError:  # Rows shorter than the headers lack the last keys, like zip()
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        count = len(self._values)
+        for key, position in self._index.items():
+            if position < count:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class RowTable(collections.abc.Sequence):
+    """
+    Table rows stored as tuples under one shared header tuple.
+
+    Indexing and iteration give Row views, which read like the dictionaries tables
+    used to hold, and slices give tables. Cell strings repeating across rows (sectors,
+    countries, "-") are stored once.
+    """
+
+    def __init__(self, headers: Iterable[str], rows: Iterable[Sequence[str]] = ()):
+        self.headers = tuple(headers)
+        # The last of duplicated headers wins, as when zipping the headers into a dict
+        self._index = {header: position for position, header in enumerate(self.headers)}
+        self._rows: List[Tuple[str, ...]] = []
+        self._strings: Dict[str, str] = {}
+        self.extend(rows)
+
+    def append(self, values: Union[Sequence[str], Mapping[str, str]]):
+        """
+        Adds a row of cell values, ignoring values past the last header.
+
+        A mapping (e.g. a row dictionary) is matched by header, None where it lacks one.
+        """
+
+        if isinstance(values, collections.abc.Mapping):
+            values = [values.get(header) for header in self.headers]
+        elif isinstance(values, (str, bytes)) or not isinstance(values, collections.abc.Sequence):
+            raise TypeError(f"Rows are sequences of cell values or mappings, not {type(values).__name__}")
+        elif len(values) > len(self.headers):
+            values = values[:len(self.headers)]
+        setdefault = self._strings.setdefault
+        self._rows.append(tuple(map(setdefault, values, values)))
+
+    def extend(self, rows: Iterable[Union[Sequence[str], Mapping[str, str]]]):
+        """ Adds the rows of another table (matched by header), mappings or sequences of cell values. """
+
+        if isinstance(rows, RowTable) and rows.headers != self.headers:
+            rows = ([row.get(header) for header in self.headers] for row in rows)
+        elif isinstance(rows, RowTable):
+            rows = rows._rows
+        for values in rows:
+            self.append(values)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            table = RowTable(self.headers)
+            table._rows = self._rows[position]
+            table._strings = self._strings
+            return table
+        return Row(self._index, self._rows[position])
+
+    def __iter__(self) -> Iterator[Row]:
+        index = self._index
+        return (Row(index, values) for values in self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __eq__(self, other):
+        if isinstance(other, RowTable):
+            return self.headers == other.headers and self._rows == other._rows
+        if isinstance(other, collections.abc.Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and all(row == item for row, item in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.to_dicts())
+
+    def column(self, header: str) -> List[Optional[str]]:
+        """ Returns the values of one column, None where a row is too short to have it. """
+
+        position = self._index[header]
+        return [values[position] if position < len(values) else None for values in self._rows]
+
+    def tuples(self) -> List[Tuple[str, ...]]:
+        """ Returns the rows as tuples of values, in header order. """
+
+        return list(self._rows)
+
+    def to_dicts(self) -> List[Dict[str, str]]:
+        """ Returns the rows as plain dictionaries, e.g. for JSON serialization. """
+
+        return [dict(zip(self.headers, values)) for values in self._rows]
@@ -1,61 +1,256 @@
+import collections
 import datetime
+import functools
+import re
+from typing import Iterator, List
+from urllib.parse import parse_qs, urlparse
 
 import requests
 from lxml import etree, html
 
+from .page_selectors import get_layout
+from .row_table import RowTable
+from .table_scanner import scan_table
+from .transport import RawResponse
 
-def get_table(page_html: requests.Response, headers, rows=None, **kwargs):
-    """ Private function used to return table data inside a list of dictionaries. """
-    if isinstance(page_html, str):
-        page_parsed = html.fromstring(page_html)
-    else:
-        page_parsed = html.fromstring(page_html.text)
+
+@functools.lru_cache(maxsize=None)
+def _html_parser(encoding: str) -> html.HTMLParser:
+    return html.HTMLParser(encoding=encoding)
+
+
+def parse_page(page, encoding=None):
+    """
+    Returns the parsed HTML tree of a page.
+
+    The page can be a tree (returned as it is), a requests or transport response, raw bytes
+    or text. Bytes are parsed directly in their encoding (UTF-8 unless given) without decoding first.
+    """
+
+    if isinstance(page, etree._Element):
+        return page
+    if isinstance(page, (requests.Response, RawResponse)):
+        page, encoding = page.content, page.encoding
+    if isinstance(page, bytes):
+        return html.fromstring(page, parser=_html_parser(encoding or "utf-8"))
+    return html.fromstring(page)
+
+
+def get_table(page_html, headers, rows=None, URL=None, **kwargs):
+    """ Private function used to return table data as a RowTable of dictionary-like rows. Accepts any page parse_page does. """
+    page_parsed = parse_page(page_html)
+    # With the page URL rows counts from the first result of the screen, like stream_table
+    if rows is not None:
+        rows = _page_row_limit(rows, URL)
+    screener = get_layout("screener")
     # When we call this method from Portfolio we don't fill the rows argument.
     # Conversely, we always fill the rows argument when we call this method from Screener.
     # Also, in the portfolio page, we don't need the last row - it's redundant.
     if rows is None:
         rows = -2  # We'll increment it later (-1) and use it to cut the last row
 
-    data_sets = []
+    data_sets = RowTable(headers)
     # Select the HTML of the rows and append each column text to a list
     all_rows = [
-        column.xpath("td//text()")
-        for column in page_parsed.cssselect('tr[valign="top"]')
+        screener.cell_texts(column) for column in screener.rows(page_parsed)
     ]
 
     # If rows is different from -2, this function is called from Screener
     if rows != -2:
         for row_number, row_data in enumerate(all_rows, 1):
-            data_sets.append(dict(zip(headers, row_data)))
+            data_sets.append(row_data)
             if row_number == rows:  # If we have reached the required end
                 break
     else:
-        # Zip each row values to the headers and append them to data_sets
-        [data_sets.append(dict(zip(headers, row))) for row in all_rows]
+        # Store each row's values under the shared headers
+        data_sets.extend(all_rows)
 
     return data_sets
 
 
+class _TableRowTarget:
+    """
+    lxml parser target that keeps only the cell texts of screener result rows.
+
+    No tree is built: text is collected while inside a td of a tr[valign="top"] row
+    (the screener rows selector) and each row is handed over once its tr closes.
+    Adjacent text chunks are joined so cells come out like td//text() on a tree.
+    """
+
+    def __init__(self):
+        self.rows = collections.deque()
+        self._row = None
+        self._cells = 0
+        self._nested_rows = 0
+        self._text = []
+
+    def _flush(self):
+        if self._text:
+            self._row.append("".join(self._text))
+            self._text = []
+
+    def start(self, tag, attrib):
+        if self._row is None:
+            if tag == "tr" and attrib.get("valign") == "top":
+                self._row = []
+        else:
+            self._flush()
+            if tag == "td":
+                self._cells += 1
+            elif tag == "tr":
+                self._nested_rows += 1
+
+    def end(self, tag):
+        if self._row is None:
+            return
+        self._flush()
+        if tag == "td":
+            self._cells -= 1
+        elif tag == "tr" and self._nested_rows:
+            self._nested_rows -= 1
+        elif tag == "tr":
+            self.rows.append(self._row)
+            self._row, self._cells = None, 0
+
+    def data(self, text):
+        if self._cells:
+            self._text.append(text)
+
+    def comment(self, text):
+        if self._row is not None:
+            self._flush()
+
+    def close(self):
+        return None
+
+
+_STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def iter_table_rows(page_html, rows=None) -> Iterator[List[str]]:
+    """
+    Yields the cell texts of the screener result rows of a page while it is being parsed.
+
+    Raw pages (bytes, text or a response) are fed to an event-driven parser in chunks,
+    so memory stays at one row rather than a document tree, and parsing stops as soon as
+    `rows` rows have been produced. Already parsed pages are read from the tree.
+    """
+
+    if rows is not None and rows <= 0:
+        return
+
+    if isinstance(page_html, etree._Element):
+        screener = get_layout("screener")
+        for row_number, row in enumerate(screener.rows(page_html), 1):
+            yield screener.cell_texts(row)
+            if row_number == rows:
+                return
+        return
+
+    encoding = None
+    if isinstance(page_html, (requests.Response, RawResponse)):
+        page_html, encoding = page_html.content, page_html.encoding
+    if isinstance(page_html, bytes):
+        encoding = encoding or "utf-8"
+
+    target = _TableRowTarget()
+    parser = etree.HTMLParser(target=target, encoding=encoding)
+    row_number = 0
+
+    for start in range(0, len(page_html), _STREAM_CHUNK_SIZE):
+        parser.feed(page_html[start:start + _STREAM_CHUNK_SIZE])
+        while target.rows:
+            row_number += 1
+            yield target.rows.popleft()
+            if row_number == rows:
+                return
+
+    parser.close()
+    while target.rows:
+        row_number += 1
+        yield target.rows.popleft()
+        if row_number == rows:
+            return
+
+
+def _page_row_limit(rows, url):
+    """ Turns a row limit counted from the first result of a screen into one for the page at url. """
+
+    if rows is not None and url is not None:
+        first_row = int(parse_qs(urlparse(url).query).get("r", ["1"])[0])
+        rows -= first_row - 1
+    return rows
+
+
+def stream_table(page_html, headers, rows=None, URL=None, **kwargs):
+    """
+    Streaming counterpart of get_table returning the rows of a page as a RowTable.
+
+    With the page URL (as passed by the request functions) rows counts from the first
+    result of the screen rather than of the page, so the last page stops at the limit.
+    """
+
+    rows = _page_row_limit(rows, URL)
+    return RowTable(headers, iter_table_rows(page_html, rows))
+
+
+def fast_table(page_html, headers, rows=None, URL=None, **kwargs):
+    """
+    stream_table through the pattern-based scanner of table_scanner.
+
+    Pages failing the scanner's layout checks (or already parsed) go through lxml instead,
+    so the result is always the one stream_table gives.
+    """
+
+    rows = _page_row_limit(rows, URL)
+    table = scan_table(page_html, headers, rows)
+    if table is None:
+        table = iter_table_rows(page_html, rows)
+
+    return RowTable(headers, table)
+
+
+# Raw page fast path for the counter layouts matched by the screener total_rows selector
+_TOTAL_ROWS_TEXT = re.compile(r"#\d+ / ([\d,]+) Total")
+_TOTAL_ROWS_RAW = re.compile(
+    r'class="count-text(?: whitespace-nowrap)?">#\d+ / ([\d,]+) Total<'
+)
+_TOTAL_ROWS_RAW_BYTES = re.compile(_TOTAL_ROWS_RAW.pattern.encode())
+
+
 def get_total_rows(page_content):
-    """ Returns the total number of rows(results). """
-
-    options=[('class="count-text whitespace-nowrap">#1 / ',' Total</div>'),('class="count-text">#1 / ',' Total</td>')]
-    page_text = str(html.tostring(page_content))
-    for option_beg,option_end in options:
-        if option_beg in page_text:
-            total_number = page_text.split(option_beg)[1].split(option_end)[0]
-            try:
-                return int(total_number)
-            except ValueError:
-                return 0
+    """
+    Returns the total number of rows(results).
+
+    Accepts the parsed page, or the raw page as bytes or text; raw pages are searched
+    for the counter directly and only parsed when it is not found in a known layout.
+    """
+
+    if isinstance(page_content, bytes):
+        match = _TOTAL_ROWS_RAW_BYTES.search(page_content)
+        if match:
+            return int(match.group(1).replace(b",", b""))
+    elif isinstance(page_content, str):
+        match = _TOTAL_ROWS_RAW.search(page_content)
+        if match:
+            return int(match.group(1).replace(",", ""))
+
+    for node in get_layout("screener").total_rows(parse_page(page_content)):
+        match = _TOTAL_ROWS_TEXT.search(node.text_content())
+        if match:
+            return int(match.group(1).replace(",", ""))
     return 0
 
 
 def get_page_urls(page_content, rows, url):
     """ Returns a list containing all of the page URL addresses. """
 
+    page_content = parse_page(page_content)
     total_pages = int(
-        [i.text.split("/")[1] for i in page_content.cssselect('option[value="1"]')][0]
+        [
+            i.text.split("/")[1]
+            for i in get_layout("screener").first_page_option(page_content)
+        ][0]
     )
     urls = []
 
@@ -69,16 +264,15 @@ def get_page_urls(page_content, rows, url):
     return urls
 
 
-
-
 def get_analyst_price_targets_for_export(
     ticker=None, page_content=None, last_ratings=5
 ):
     analyst_price_targets = []
 
     try:
-        table = page_content.cssselect('table[class="fullview-ratings-outer"]')[0]
-        ratings_list = [row.xpath("td//text()") for row in table]
+        quote = get_layout("quote")
+        table = quote.export_ratings_table(page_content)[0]
+        ratings_list = [quote.cell_texts(row) for row in table]
         ratings_list = [
             [val for val in row if val != "\n"] for row in ratings_list
         ]  # remove new line entries
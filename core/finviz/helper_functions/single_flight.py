@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from .error_handling import copy_exception
+
+
+class _Call:
+    """ A call in flight that other callers with the same key wait for. """
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into a single execution.
+
+    Every caller that arrives while the call is in flight receives the same result, or a
+    copy of the same exception (chained to the original) so that each caller's traceback
+    stays its own. Completed calls are forgotten, nothing is cached.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """ Runs func unless a call with the same key is already in flight in another thread. """
+
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise copy_exception(call.error) from call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def do_async(
+        self, key: Hashable, coroutine_func: Callable[..., Awaitable], *args, **kwargs
+    ) -> Any:
+        """ Awaits coroutine_func unless a call with the same key is already in flight on this loop. """
+
+        task_key = (asyncio.get_running_loop(), key)
+
+        with self._lock:
+            self.calls += 1
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = asyncio.ensure_future(coroutine_func(*args, **kwargs))
+                self._tasks[task_key] = task
+                task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+            else:
+                self.shared += 1
+
+        # Shielded so a cancelled caller does not cancel the request for everyone else
+        try:
+            return await asyncio.shield(task)
+        except Exception as exc:
+            raise copy_exception(exc) from exc
+
+    def stats(self) -> Dict:
+        """ Returns the number of calls and how many of them shared another call's result. """
+
+        return dict(calls=self.calls, shared=self.shared)
@@ -0,0 +1,128 @@
+import html
+import re
+from typing import List, Optional
+
+import requests
+from lxml import etree
+
+from .transport import RawResponse
+
+# The inside of a tag up to its closing ">". Quoted attribute values are skipped whole, since
+# live pages put markup in them (data-boxover tooltips), while a quote not following "=" is a
+# stray character, like the one FinViz leaves in its row links: <a href="..." ">
+_TAG_BODY = r"""[^>"'=]*(?:(?:=\s*"[^"]*"|=\s*'[^']*'|=(?!\s*["'])|["'])[^>"'=]*)*"""
+
+# Patterns for the fixed screener table markup: header cells inside <thead> and result rows
+# as tr[valign="top"] holding one td per column. Layouts they do not fit fail the checks below.
+_HEAD_CELL = re.compile(rf"<th\b{_TAG_BODY}>(.*?)</th>", re.S | re.I)
+_ROW_START = re.compile(rf'<tr\b{_TAG_BODY}\bvalign="top"{_TAG_BODY}>', re.I)
+# A cell holding a single text node, possibly wrapped in tags other than td, th and tr
+_INNER_TAG = rf"<(?!/?t[dhr][\s/>]){_TAG_BODY}>"
+_CELL_TEXT = re.compile(
+    rf"<td\b{_TAG_BODY}>(?:{_INNER_TAG})*([^<]+)(?:{_INNER_TAG})*</td>", re.I
+)
+# Opening tags whose name starts with t: td, th, tr, table, tbody, ...
+_T_TAG = re.compile(rf"<t{_TAG_BODY}>", re.I)
+_TAG = re.compile(rf"<{_TAG_BODY}>")
+_SPACE = re.compile(r"[ \t\r\n]+")
+
+
+def _decode(page) -> Optional[str]:
+    """ Returns the text of a raw page, or None for a parsed tree or undecodable bytes. """
+
+    if isinstance(page, etree._Element):
+        return None
+    if isinstance(page, (requests.Response, RawResponse)):
+        page, encoding = page.content, page.encoding or "utf-8"
+    elif isinstance(page, bytes):
+        encoding = "utf-8"
+    else:
+        return page
+
+    try:
+        return page.decode(encoding)
+    except (UnicodeDecodeError, LookupError):
+        return None
+
+
+def _unescape(text: str) -> str:
+    return html.unescape(text) if "&" in text else text
+
+
+def _section(content: str, start: int, end_tag: str) -> Optional[str]:
+    """ Returns the content from start up to the closing tag, searched for as a plain string. """
+
+    end = content.find(end_tag, start)
+    return None if end < 0 else content[start:end]
+
+
+def _scan_headers(content: str) -> Optional[List[str]]:
+    start = content.find("<thead")
+    head = _section(content, start, "</thead>") if start >= 0 else None
+    if head is None:
+        return None
+
+    headers = []
+    for cell in _HEAD_CELL.finditer(head):
+        text = _SPACE.sub(" ", _unescape(_TAG.sub("", cell.group(1)))).strip(" ")
+        if text:
+            headers.append(text)
+
+    return headers or None
+
+
+def scan_headers(page) -> Optional[List[str]]:
+    """ Returns the non-empty, whitespace-normalized header cells of a raw screener page, or None. """
+
+    content = _decode(page)
+    return None if content is None else _scan_headers(content)
+
+
+def scan_table(page, headers: List[str], rows: Optional[int] = None) -> Optional[List[List[str]]]:
+    """
+    Extracts the cell texts of the screener result rows of a raw page with compiled patterns.
+
+    Returns None whenever the page does not pass the layout checks, and the caller has to
+    parse it instead: the header cells must equal headers, every row must hold exactly
+    one td per header with a single text node each (so the cells line up with td//text()
+    on a tree), and rows must not contain nested rows, tables, scripts or comments.
+    """
+
+    content = _decode(page)
+    if content is None or (rows is not None and rows <= 0):
+        return None
+    if _scan_headers(content) != list(headers):
+        return None
+
+    columns = len(headers)
+    table = []
+
+    row = _ROW_START.search(content)
+    while row is not None:
+        body = _section(content, row.end(), "</tr>")
+        if body is None:
+            return None
+
+        # A match spanning two tds or a td without a single text node leaves the count short.
+        # Counting the t tags also catches nested tr, th, table and tbody openings. The plain
+        # "<t" count can only be higher, by openings inside attribute values, so the tags are
+        # only matched when it is off.
+        cells = _CELL_TEXT.findall(body)
+        if (
+            len(cells) != columns
+            or (
+                body.count("<t") + body.count("<T") != columns
+                and len(_T_TAG.findall(body)) != columns
+            )
+            or "<!--" in body
+            or "<script" in body
+            or "<style" in body
+        ):
+            return None
+
+        table.append([_unescape(cell) for cell in cells])
+        if len(table) == rows:
+            break
+        row = _ROW_START.search(content, row.end() + len(body))
+
+    return table or None
@@ -0,0 +1,230 @@
+import abc
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import aiohttp
+import requests
+
+from ..config import connection_settings
+from .error_handling import MissingRecording
+
+
+class RawResponse(NamedTuple):
+    """ Transport-independent response: final URL, status code, encoding and undecoded body. """
+
+    url: str
+    status: int
+    encoding: Optional[str]
+    content: bytes
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+def canonical_url(url: str, payload: Optional[Dict] = None) -> str:
+    """ Returns the URL with its query string and payload merged and sorted, used as a request key. """
+
+    parts = urlsplit(url)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    params.extend((str(k), str(v)) for k, v in (payload or {}).items() if v is not None)
+    query = urlencode(sorted(params))
+
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path}?{query}"
+
+
+FINVIZ_URL = "https://finviz.com"
+
+# The body FinViz answers with when it throttles a client
+THROTTLE_BODY = b"Too many requests."
+
+
+def resolve_url(url: str) -> str:
+    """ Rewrites FinViz URLs onto the configured BASE_URL. Request keys keep the original URL. """
+
+    base_url = connection_settings["BASE_URL"].rstrip("/")
+    if base_url != FINVIZ_URL and url.startswith(FINVIZ_URL):
+        return base_url + url[len(FINVIZ_URL):]
+    return url
+
+
+class Transport(abc.ABC):
+    """ Sends the HTTP requests of the request functions. Subclasses decide where responses come from. """
+
+    @abc.abstractmethod
+    def get(
+        self, url: str, payload: Optional[Dict], headers: Dict, session: requests.Session
+    ) -> RawResponse:
+        """ Sends a GET request with the payload as query parameters. """
+
+    @abc.abstractmethod
+    async def get_async(
+        self, url: str, headers: Dict, session: aiohttp.ClientSession
+    ) -> RawResponse:
+        """ Sends a GET request for a URL that already holds its query string. """
+
+
+class LiveTransport(Transport):
+    """ Sends the requests to the live site. """
+
+    def get(self, url, payload, headers, session):
+        response = session.get(
+            resolve_url(url), params=payload, verify=False, headers=headers
+        )
+        return RawResponse(
+            response.url, response.status_code, response.encoding, response.content
+        )
+
+    async def get_async(self, url, headers, session):
+        async with session.get(resolve_url(url), headers=headers) as response:
+            content = await response.read()
+            return RawResponse(str(response.url), response.status, response.charset, content)
+
+
+class _Cassette:
+    """ Directory of recorded responses, one metadata file and one body file per request. """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.expanduser(directory)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def save(self, key: str, response: RawResponse):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+
+        with open(path + ".body", "wb") as fp:
+            fp.write(response.content)
+        with open(path + ".json", "w") as fp:
+            json.dump(
+                dict(
+                    request=key,
+                    url=response.url,
+                    status=response.status,
+                    encoding=response.encoding,
+                ),
+                fp,
+                indent=2,
+            )
+
+    def load(self, key: str) -> RawResponse:
+        path = self._path(key)
+
+        try:
+            with open(path + ".json", "r") as fp:
+                meta = json.load(fp)
+            with open(path + ".body", "rb") as fp:
+                content = fp.read()
+        except FileNotFoundError:
+            raise MissingRecording(key)
+
+        return RawResponse(meta["url"], meta["status"], meta["encoding"], content)
+
+
+class RecordingTransport(Transport):
+    """ Sends the requests through another transport and saves every response to a cassette directory. """
+
+    def __init__(self, directory: str, transport: Optional[Transport] = None):
+        self.cassette = _Cassette(directory)
+        self.transport = transport or LiveTransport()
+
+    def get(self, url, payload, headers, session):
+        response = self.transport.get(url, payload, headers, session)
+        self.cassette.save(canonical_url(url, payload), response)
+        return response
+
+    async def get_async(self, url, headers, session):
+        response = await self.transport.get_async(url, headers, session)
+        self.cassette.save(canonical_url(url), response)
+        return response
+
+
+class ReplayTransport(Transport):
+    """
+    Serves recorded responses without touching the network.
+
+    latency adds a fixed delay per request and throttle_rate is the share of requests
+    answered with FinViz's "Too many requests." body, drawn from a seeded generator
+    so benchmark runs are reproducible.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.cassette = _Cassette(directory)
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _respond(self, key: str) -> RawResponse:
+        with self._lock:
+            throttled = self._random.random() < self.throttle_rate
+
+        if throttled:
+            return RawResponse(key, 200, "utf-8", THROTTLE_BODY)
+        return self.cassette.load(key)
+
+    def get(self, url, payload, headers, session):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(canonical_url(url, payload))
+
+    async def get_async(self, url, headers, session):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(canonical_url(url))
+
+
+_TRANSPORT = None
+_TRANSPORT_LOCK = threading.Lock()
+
+
+def get_transport() -> Transport:
+    """ Returns the transport selected by set_transport or, by default, by TRANSPORT_MODE. """
+
+    global _TRANSPORT
+
+    if _TRANSPORT is None:
+        with _TRANSPORT_LOCK:
+            if _TRANSPORT is None:
+                mode = connection_settings["TRANSPORT_MODE"]
+                directory = connection_settings["CASSETTE_DIR"]
+
+                if mode == "live":
+                    _TRANSPORT = LiveTransport()
+                elif mode == "record":
+                    _TRANSPORT = RecordingTransport(directory)
+                elif mode == "replay":
+                    _TRANSPORT = ReplayTransport(
+                        directory,
+                        connection_settings["REPLAY_LATENCY"],
+                        connection_settings["REPLAY_THROTTLE_RATE"],
+                    )
+                else:
+                    raise ValueError(f"Invalid transport mode: {mode}")
+
+    return _TRANSPORT
+
+
+def set_transport(transport: Optional[Transport]) -> Optional[Transport]:
+    """ Replaces the transport used by every request path and returns the previous one. None restores the default. """
+
+    global _TRANSPORT
+
+    with _TRANSPORT_LOCK:
+        previous, _TRANSPORT = _TRANSPORT, transport
+
+    return previous
@@ -4,22 +4,26 @@ FinViz股票筛选功能
 提供基于FinViz的股票筛选功能，支持多种筛选条件和表格类型。
 """
 
+import array
+import datetime
 import json
 import pathlib
-import urllib.request
 from urllib.parse import parse_qs as urlparse_qs
 from urllib.parse import urlencode, urlparse
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Mapping, Optional, Union
 
 from bs4 import BeautifulSoup
 from user_agent import generate_user_agent
 
+from .helper_functions import column_types, export_functions
 from .helper_functions import scraper_functions as scrape
 from .helper_functions.display_functions import create_table_string
 from .helper_functions.error_handling import InvalidTableType, NoResults
+from .helper_functions.page_selectors import get_layout
 from .helper_functions.request_functions import (Connector,
                                                        http_request_get,
-                                                       sequential_data_scrape)
+                                                       sequential_data_stream)
+from .helper_functions.row_table import RowTable
 
 TABLE_TYPES = {
     # 主要表格类型（基于实际筛选器分布）
@@ -84,6 +88,9 @@ class Screener(object):
         custom: Optional[List[str]] = None,
         user_agent: str = generate_user_agent(),
         request_method: str = "sequential",
+        lazy: bool = False,
+        parse_executor: Optional[str] = None,
+        fast_scan: bool = False,
     ):
         """
         初始化筛选器
@@ -98,6 +105,9 @@ class Screener(object):
             custom: 自定义列，如 ['1', '21', '23', '45']
             user_agent: 用户代理字符串
             request_method: 请求方法，'sequential' 或 'async'
+            lazy: 为True时只获取首页（表头与总行数），数据通过 iter_pages()/iter_rows() 流式获取
+            parse_executor: 页面解析方式，None 为内联解析，'thread' 或 'process' 使用解析线程池/进程池
+            fast_scan: 为True时用正则扫描器直接从原始页面提取行，页面结构校验不通过时自动回退到lxml解析
         """
         if tickers is None:
             self._tickers = []
@@ -130,6 +140,9 @@ class Screener(object):
         self._signal = signal
         self._user_agent = user_agent
         self._request_method = request_method
+        self._lazy = lazy
+        self._parse_executor = parse_executor
+        self._fast_scan = fast_scan
 
         self.analysis = []
         self.data = self.__search_screener()
@@ -210,6 +223,78 @@ class Screener(object):
 
     get = __getitem__
 
+    def to_columns(self, types: Optional[Dict[str, str]] = None) -> Dict[str, object]:
+        """
+        按列返回带类型的筛选结果
+
+        列类型根据表头名称推断（见 column_types.HEADER_TYPES）：数值列为 array.array，
+        缺失值（"-"）为 NaN；日期列为 datetime.date 列表；其余为字符串列表。
+
+        Args:
+            types: 覆盖指定列的类型，如 {'Earnings': 'str'}，可选 int, float, scaled, percent, date, str
+
+        Returns:
+            Dict[str, object]: 表头到列数据的映射
+        """
+        return column_types.to_columns(self.headers, self.data, types)
+
+    def to_dataframe(self, types: Optional[Dict[str, str]] = None):
+        """
+        返回带类型的 pandas DataFrame（需要安装 pandas）
+
+        Args:
+            types: 覆盖指定列的类型，同 to_columns()
+
+        Returns:
+            pandas.DataFrame: 筛选结果
+        """
+        try:
+            import numpy as np
+            import pandas as pd
+        except ImportError:
+            raise ImportError("to_dataframe() requires pandas: pip install pandas")
+
+        columns = {}
+        for header, column in self.to_columns(types).items():
+            if isinstance(column, array.array):
+                columns[header] = np.frombuffer(column, dtype=column.typecode)
+            elif column and any(isinstance(value, datetime.date) for value in column):
+                columns[header] = pd.to_datetime(column)
+            else:
+                columns[header] = column
+
+        return pd.DataFrame(columns, columns=list(self.headers))
+
+    def export(
+        self,
+        target,
+        fmt: Optional[str] = None,
+        types: Optional[Dict[str, str]] = None,
+        typed: bool = True,
+        row_group_size: int = export_functions.ROW_GROUP_SIZE,
+    ) -> int:
+        """
+        将筛选结果写入文件，每下载并解析完一页即写入该页
+
+        以 lazy=True 创建的筛选器边下载边写入，内存占用与结果总行数无关；
+        已获取数据的筛选器直接写出 self.data。
+
+        Args:
+            target: 文件路径或已打开的文件（NDJSON/CSV 为文本文件，Arrow/Parquet 为二进制文件）
+            fmt: 导出格式，可选 ndjson, csv, arrow, parquet，默认根据文件扩展名推断
+            types: 覆盖指定列的类型，同 to_columns()
+            typed: 为True时按列类型转换数值与日期，否则按FinViz页面原文写出
+            row_group_size: Arrow/Parquet 每个批次（行组）的行数
+
+        Returns:
+            int: 写入的行数
+        """
+        # A lazy export keeps one page in memory, so pages are not parsed into trees either
+        pages = self.iter_pages(stream=True) if self._lazy else [self.data]
+        return export_functions.export_rows(
+            pages, self.headers, target, fmt, types, typed, row_group_size
+        )
+
     @staticmethod
     def __check_table(input_table: str) -> str:
         """检查表格类型输入是否正确"""
@@ -286,10 +371,12 @@ class Screener(object):
             "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.11 (KHTML, like Gecko) "
             "Chrome/23.0.1271.64 Safari/537.11"
         }
-        url = "https://finviz.com/screener.ashx?ft=4"
-        req = urllib.request.Request(url, headers=hdr)
-        with urllib.request.urlopen(req) as response:
-            html = response.read().decode("utf-8")
+        html, _ = http_request_get(
+            "https://finviz.com/screener.ashx",
+            payload={"ft": "4"},
+            parse=False,
+            user_agent=hdr["User-Agent"],
+        )
 
         # Parse html and locate table we are interested in.
         bs = BeautifulSoup(html, "html.parser")
@@ -370,21 +457,81 @@ class Screener(object):
         headers = []
 
         # 尝试新的表头结构 (thead tr th)
-        header_elements = self._page_content.cssselect('thead tr th')
+        screener = get_layout("screener")
+        header_elements = screener.headers(self._page_content)
         
         if not header_elements:
             # 尝试旧的结构 (tr[valign="middle"] td)
-            header_elements = self._page_content.cssselect('tr[valign="middle"] td')
+            header_elements = screener.legacy_headers(self._page_content)
         
         for header_element in header_elements:
             # Use normalize-space to extract text content while ignoring internal elements
-            header_text = header_element.xpath("normalize-space()")
+            header_text = screener.normalized_text(header_element)
             
             if header_text:
                 headers.append(header_text)
         
         return headers
 
+    def iter_pages(self, ordered: bool = True, stream: bool = False) -> Iterator[RowTable]:
+        """
+        按页流式返回筛选结果，每下载并解析完一页即返回该页数据
+
+        默认每页构建lxml树后提取（get_table）；stream=True 时边解析边提取行、
+        不构建整页的树（stream_table），每页内存占用更小但CPU开销约高20%，适合内存受限的导出。
+        fast_scan=True 的筛选器始终使用正则扫描器。
+
+        Args:
+            ordered: 为True时按页码顺序返回，否则按完成顺序返回（仅async请求方式有效）
+            stream: 为True时不构建页面树，以CPU换内存
+
+        Returns:
+            Iterator[RowTable]: 每页的数据行
+        """
+        page_urls = scrape.get_page_urls(self._page_content, self._rows, self._url)
+
+        if self._fast_scan:
+            scrape_table = scrape.fast_table
+        elif stream:
+            scrape_table = scrape.stream_table
+        else:
+            scrape_table = scrape.get_table
+
+        if self._request_method == "async":
+            async_connector = Connector(
+                scrape_table,
+                page_urls,
+                self._user_agent,
+                self.headers,
+                self._rows,
+                parse_executor=self._parse_executor,
+                pass_url=True,
+            )
+            return async_connector.iter_connector(ordered)
+
+        return sequential_data_stream(
+            scrape_table,
+            page_urls,
+            self._user_agent,
+            self.headers,
+            self._rows,
+            parse_executor=self._parse_executor,
+        )
+
+    def iter_rows(self, ordered: bool = True, stream: bool = False) -> Iterator[Mapping]:
+        """
+        逐行流式返回筛选结果
+
+        Args:
+            ordered: 为True时按页码顺序返回，否则按页面完成顺序返回
+            stream: 为True时不构建页面树，见 iter_pages()
+
+        Returns:
+            Iterator[Mapping]: 数据行（只读的类字典视图）
+        """
+        for page in self.iter_pages(ordered, stream):
+            yield from page
+
     def __search_screener(self):
         """从FinViz筛选器获取数据"""
         self._page_content, self._url = http_request_get(
@@ -403,29 +550,11 @@ class Screener(object):
         self._rows = self.__check_rows()
         self.headers = self.__get_table_headers()
 
-        if self._request_method == "async":
-            async_connector = Connector(
-                scrape.get_table,
-                scrape.get_page_urls(self._page_content, self._rows, self._url),
-                self._user_agent,
-                self.headers,
-                self._rows,
-                css_select=True,
-            )
-            pages_data = async_connector.run_connector()
-        else:
-            pages_data = sequential_data_scrape(
-                scrape.get_table,
-                scrape.get_page_urls(self._page_content, self._rows, self._url),
-                self._user_agent,
-                self.headers,
-                self._rows,
-            )
-
-        data = []
-        for page in pages_data:
-            for row in page:
-                data.append(row)
+        # Rows share one header tuple and are stored as tuples, read through dict-like views
+        data = RowTable(self.headers)
+        if not self._lazy:
+            for page in self.iter_pages():
+                data.extend(page)
 
         return data
 
@@ -438,7 +567,9 @@ def get_screener_data(filters: Optional[List[str]] = None,
                      signal: str = "",
                      table: Optional[str] = None,
                      custom: Optional[List[str]] = None,
-                     auto_table: bool = True) -> Dict:
+                     auto_table: bool = True,
+                     export_path: Optional[str] = None,
+                     export_format: Optional[str] = None) -> Dict:
     """
     获取筛选器数据
     
@@ -450,9 +581,11 @@ def get_screener_data(filters: Optional[List[str]] = None,
         table: 表格类型，可选值: Descriptive, Fundamental, Technical, News, ETF
         custom: 自定义列，如 ['1', '21', '23']
         auto_table: 是否自动选择表格类型，默认True
+        export_path: 导出文件路径，给出时结果边下载边写入该文件，返回值中不含数据行
+        export_format: 导出格式，可选 ndjson, csv, arrow, parquet，默认根据文件扩展名推断
         
     Returns:
-        Dict: 包含表头和数据行的字典
+        Dict: 包含表头和数据行的字典；导出时包含表头、导出路径、格式和写入行数
     """
     try:
         # 自动选择表格类型
@@ -467,11 +600,20 @@ def get_screener_data(filters: Optional[List[str]] = None,
             order=order,
             signal=signal,
             table=table,
-            custom=custom
+            custom=custom,
+            lazy=export_path is not None
         )
+        if export_path is not None:
+            written = screener.export(export_path, export_format)
+            return {
+                "headers": screener.headers,
+                "export_path": str(export_path),
+                "export_format": export_functions.export_format(export_path, export_format),
+                "total_rows": written
+            }
         return {
             "headers": screener.headers,
-            "data": screener.data,
+            "data": screener.data.to_dicts(),
             "total_rows": len(screener.data)
         }
     except Exception as e:
@@ -483,6 +625,39 @@ def get_screener_data(filters: Optional[List[str]] = None,
         }
 
 
+def get_screener_count(filters: Optional[List[str]] = None,
+                       signal: str = "",
+                       tickers: Optional[List[str]] = None) -> Dict:
+    """
+    获取筛选结果总数（只请求第一页，不解析表格）
+
+    Args:
+        filters: 筛选条件列表，如 ['idx_sp500', 'sec_technology']
+        signal: 信号筛选，如 'n_majornews'
+        tickers: 股票代码列表
+
+    Returns:
+        Dict: 包含结果总数的字典
+    """
+    try:
+        page_text, _ = http_request_get(
+            "https://finviz.com/screener.ashx",
+            payload={
+                "v": TABLE_TYPES["Overview"],
+                "t": ",".join(tickers or []),
+                "f": ",".join(filters or []),
+                "s": signal,
+            },
+            parse=False,
+        )
+        return {"total_rows": scrape.get_total_rows(page_text)}
+    except Exception as e:
+        return {
+            "error": f"获取筛选结果总数失败: {str(e)}",
+            "total_rows": 0
+        }
+
+
 def get_screener_from_url(url: str, rows: Optional[int] = None) -> Dict:
     """
     从URL初始化筛选器
@@ -498,7 +673,7 @@ def get_screener_from_url(url: str, rows: Optional[int] = None) -> Dict:
         screener = Screener.init_from_url(url, rows)
         return {
             "headers": screener.headers,
-            "data": screener.data,
+            "data": screener.data.to_dicts(),
             "total_rows": len(screener.data)
         }
     except Exception as e:
@@ -4,35 +4,488 @@ FinViz股票数据功能
 提供基于FinViz的股票数据获取功能，包括股票基本信息、新闻、内部交易等。
 """
 
+import threading
+import zlib
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlencode
+
 from lxml import etree
+from user_agent import generate_user_agent
 
-from .helper_functions.request_functions import http_request_get
-from .helper_functions.scraper_functions import get_table
+from .helper_functions.column_types import convert_snapshot
+from .helper_functions.error_handling import ErrorInfo, InvalidTicker
+from .helper_functions.news_timestamps import NewsTimestampDecoder
+from .helper_functions.page_selectors import get_layout
+from .helper_functions.quote_cache import (TREE_BYTES_PER_PAGE_BYTE,
+                                           approximate_size, get_quote_cache)
+from .helper_functions.request_functions import Connector, http_request_get
+from .helper_functions.scraper_functions import get_table, parse_page
 
 STOCK_URL = "https://finviz.com/quote.ashx"
 NEWS_URL = "https://finviz.com/news.ashx"
 CRYPTO_URL = "https://finviz.com/crypto_performance.ashx"
-STOCK_PAGE = {}
 
 
-def get_page(ticker):
-    """获取股票页面数据"""
-    global STOCK_PAGE
+def _news_items(page_parsed) -> List[Tuple]:
+    """新闻表格的原始行：(时间文本, 标题, 链接, 来源)，没有新闻链接的行标题为None"""
+    quote = get_layout("quote")
+    news_table = quote.news_table(page_parsed)
+    if len(news_table) == 0:
+        return []
+
+    items = []
+    for row in quote.news_rows(news_table[0]):
+        tds = quote.news_cells(row)
+        if len(tds) < 2:
+            continue
 
-    if ticker not in STOCK_PAGE:
-        STOCK_PAGE[ticker], _ = http_request_get(
-            url=STOCK_URL, payload={"t": ticker}, parse=True
-        )
+        time_texts = quote.texts(tds[0])
+        time_text = time_texts[0].strip() if time_texts else ""
+
+        news_link = quote.news_link(tds[1])
+        if not news_link:
+            # 没有链接的行仍可能带有日期，后续只显示时间的行需要它
+            items.append((time_text, None, None, None))
+            continue
+
+        title_texts = quote.texts(news_link[0])
+        title = title_texts[0] if title_texts else ""
+        url = news_link[0].get("href", "")
+
+        source_span = quote.news_source(tds[1])
+        source_texts = quote.texts(source_span[0]) if source_span else []
+        source = source_texts[0][1:] if source_texts else ""
+
+        items.append((time_text, title, url, source))
+
+    return items
+
+
+def _insider_rows(page_parsed) -> List[Dict]:
+    """内部交易表格的行"""
+    quote = get_layout("quote")
+    outer_table = quote.insider_table(page_parsed)
+    if len(outer_table) == 0:
+        return []
+
+    table = outer_table[0]
+    headers = quote.cell_texts(table[0])
+
+    return [dict(zip(
+        headers,
+        [etree.tostring(elem, method="text", encoding="unicode") for elem in row]
+    )) for row in table[1:]]
+
+
+def _analyst_ratings(page_parsed) -> List[Dict]:
+    """分析师评级表格的全部行"""
+    quote = get_layout("quote")
+    table = quote.ratings_table(page_parsed)[0]
+
+    analyst_price_targets = []
+    for row in table:
+        rating = quote.cell_texts(row)
+        rating = [val.replace("→", "->").replace("$", "") for val in rating if val != "\n"]
+        rating[0] = datetime.strptime(rating[0], "%b-%d-%y").strftime("%Y-%m-%d")
+
+        data = {
+            "date": rating[0],
+            "category": rating[1],
+            "analyst": rating[2],
+            "rating": rating[3],
+        }
+        if len(rating) == 5:
+            if "->" in rating[4]:
+                rating.extend(rating[4].replace(" ", "").split("->"))
+                del rating[4]
+                data["target_from"] = float(rating[4])
+                data["target_to"] = float(rating[5])
+            else:
+                data["target"] = float(rating[4])
+
+        analyst_price_targets.append(data)
+
+    return analyst_price_targets
+
+
+def _load_quote(ticker: str, store: str) -> Tuple[object, int]:
+    """下载报价页，返回按缓存存储方式保存的内容及其估计大小"""
+    raw, _ = http_request_get(url=STOCK_URL, payload={"t": ticker}, raw=True)
+
+    if store == "compressed":
+        compressed = zlib.compress(raw.content)
+        return (compressed, raw.encoding), len(compressed)
+
+    page_parsed = parse_page(raw)
+    if store == "tree":
+        return page_parsed, len(raw.content) * TREE_BYTES_PER_PAGE_BYTE
+
+    # 只保留提取出的数据。提取失败的部分只保存异常的类型与参数（不保存异常对象及其调用栈），
+    # 读取该部分时抛出新的异常
+    sections = {}
+    for name, extract in QUOTE_SECTIONS.items():
+        try:
+            sections[name] = extract(page_parsed)
+        except Exception as e:
+            sections[name] = ErrorInfo.of(e)
+    return sections, approximate_size(sections)
+
+
+def _stored_page(stored, store: str):
+    """返回缓存中 tree 或 compressed 方式保存的页面的解析树"""
+    if store == "tree":
+        return stored
+    compressed, encoding = stored
+    return parse_page(zlib.decompress(compressed), encoding)
+
+
+def invalidate_quote(ticker: str) -> bool:
+    """
+    从报价页缓存中移除股票的页面，下次读取时重新下载
+
+    Args:
+        ticker: 股票代码
+
+    Returns:
+        bool: 缓存中是否有该页面
+    """
+    return get_quote_cache().invalidate(ticker)
+
+
+def _header_values(page_parsed) -> Dict[str, str]:
+    """报价页头部的股票代码、公司名称、网站与行业信息"""
+    quote = get_layout("quote")
+    data = {}
+
+    # 获取股票代码
+    ticker_element = quote.ticker(page_parsed)
+    if ticker_element:
+        data["Ticker"] = ticker_element[0].text.strip()
+
+    # 获取公司名称
+    company_element = quote.company(page_parsed)
+    if company_element:
+        data["Company"] = company_element[0].text.strip()
+        company_link = company_element[0].get("href")
+        data["Website"] = company_link if company_link and company_link.startswith("http") else None
+
+    # 获取行业信息 - 从标签链接中提取
+    for link in quote.tab_links(page_parsed):
+        href = link.get("href", "")
+        if "sec_" in href:
+            data["Sector"] = link.text.strip()
+        elif "ind_" in href:
+            data["Industry"] = link.text.strip()
+        elif "geo_" in href:
+            data["Country"] = link.text.strip()
+
+    return data
+
+
+def _table_values(page_parsed) -> Dict[str, str]:
+    """报价页数据表格中的键值对"""
+    quote = get_layout("quote")
+    data = {}
+
+    # 键值成对排列
+    eps_next_y_seen = False
+    for row in quote.snapshot_rows(page_parsed):
+        cells = quote.cell_texts(row)
+        for column in range(0, len(cells) - 1, 2):
+            key = cells[column].strip()
+            value = cells[column + 1].strip()
+
+            # 处理特殊情况：第二个 "EPS next Y" 是增长率，"Volatility" 包含周与月两个值
+            if key == "EPS next Y":
+                if eps_next_y_seen:
+                    key = "EPS growth next Y"
+                eps_next_y_seen = True
+            elif key == "Volatility":
+                vols = value.split()
+                if len(vols) >= 2:
+                    data["Volatility (Week)"] = vols[0]
+                    data["Volatility (Month)"] = vols[1]
+                continue
+
+            data[key] = value
+
+    return data
+
+
+# (报价页布局版本, 数据表格每行的单元格数) -> 数据表格中各键的位置：
+# (行, 键单元格, 值单元格, 键文本, 值拆分后的序号)。按位置读取与完整遍历不一致的表格形状为空表
+_TABLE_POSITIONS: Dict[Tuple, Dict[str, Tuple[int, int, int, str, Optional[int]]]] = {}
+# 最多记住的表格形状数（股票、ETF等不同页面的数据表格形状不同）
+_TABLE_SHAPES = 32
+_TABLE_POSITIONS_LOCK = threading.Lock()
+
+
+def _cell_text(cell) -> str:
+    return "".join(cell.itertext()).strip()
+
+
+def _table_positions(rows) -> Dict[str, Tuple[int, int, int, str, Optional[int]]]:
+    """按单元格遍历数据表格的行，返回 _table_values 中各键所在的位置"""
+    positions = {}
+    eps_next_y_seen = False
+    for row_index, row in enumerate(rows):
+        cells = list(row)
+        for column in range(0, len(cells) - 1, 2):
+            label = key = _cell_text(cells[column])
+            if key == "EPS next Y":
+                if eps_next_y_seen:
+                    key = "EPS growth next Y"
+                eps_next_y_seen = True
+            elif key == "Volatility":
+                positions["Volatility (Week)"] = (row_index, column, column + 1, label, 0)
+                positions["Volatility (Month)"] = (row_index, column, column + 1, label, 1)
+                continue
+
+            positions[key] = (row_index, column, column + 1, label, None)
+
+    return positions
+
+
+def _read_cells(rows, keys: Iterable[str], positions) -> Optional[Dict[str, Optional[str]]]:
+    """
+    按位置读取数据表格中的键，位置表中没有的键为None
+
+    单元格的键文本与位置表不符时返回None，此时位置表不适用于该页面
+    """
+    data = {}
+    for key in keys:
+        position = positions.get(key)
+        if position is None:
+            data[key] = None
+            continue
+
+        row, label_cell, value_cell, label, part = position
+        try:
+            cells = rows[row]
+            if _cell_text(cells[label_cell]) != label:
+                return None
+            value = _cell_text(cells[value_cell])
+        except IndexError:
+            return None
+
+        if part is not None:
+            parts = value.split()
+            value = parts[part] if len(parts) >= 2 else None  # 同完整遍历，缺少周或月的值时没有该键
+        data[key] = value
+
+    return data
+
+
+def _table_fields(page_parsed, keys: List[str]) -> Dict[str, Optional[str]]:
+    """
+    只提取数据表格中的部分键
+
+    位置表按报价页布局版本与数据表格的形状（每行的单元格数）分别建立：某种形状第一次出现时
+    完整遍历并建立位置表，之后直接按位置读取所需单元格。单元格的键文本与位置表不符时
+    退回完整遍历并重新建立该形状的位置表。
+
+    Args:
+        page_parsed: 已解析的报价页
+        keys: 数据表格中的键
+
+    Returns:
+        Dict[str, Optional[str]]: 键到原始字符串的映射，页面上没有的键为None
+    """
+    quote = get_layout("quote")
+    rows = quote.snapshot_rows(page_parsed)
+    shape = (quote.version, tuple(len(row) for row in rows))
+    positions = _TABLE_POSITIONS.get(shape)
+    if positions:
+        data = _read_cells(rows, keys, positions)
+        if data is not None:
+            return data
+
+    table = _table_values(page_parsed)
+    if table and positions != {}:
+        positions = _table_positions(rows)
+        # 按位置读取与完整遍历结果不一致时，这种形状的表格都完整遍历
+        if _read_cells(rows, table, positions) != table:
+            positions = {}
+        with _TABLE_POSITIONS_LOCK:
+            _TABLE_POSITIONS.pop(shape, None)
+            while len(_TABLE_POSITIONS) >= _TABLE_SHAPES:
+                del _TABLE_POSITIONS[next(iter(_TABLE_POSITIONS))]
+            _TABLE_POSITIONS[shape] = positions
+
+    return {key: table.get(key) for key in keys}
+
+
+def _snapshot_values(page_parsed) -> Dict[str, str]:
+    """
+    提取报价页的基本信息与数据表格
+
+    Args:
+        page_parsed: 已解析的报价页
+
+    Returns:
+        Dict[str, str]: 键到原始字符串的映射
+    """
+    data = _header_values(page_parsed)
+    data.update(_table_values(page_parsed))
+    return data
+
+
+# 报价页可单独缓存的各部分及其提取函数（QUOTE_CACHE_STORE="sections" 时只保存提取结果）
+QUOTE_SECTIONS = {
+    "header": _header_values,
+    "table": _table_values,
+    "news": _news_items,
+    "insider": _insider_rows,
+    "ratings": _analyst_ratings,
+}
+
+
+class QuoteSnapshot:
+    """
+    一次获取的报价页，各部分在首次读取时才提取，提取结果保存在对象中
+
+    同一个 QuoteSnapshot 传给 get_stock、get_news、get_insider 和 get_analyst_price_targets
+    时只读取一次报价页缓存，每个部分也只提取一次；只读取部分键时不会提取新闻等其他部分。
+    各部分返回的对象可能与缓存共享，调用方不可修改。
+
+    Example:
+        >>> quote = get_quote('AAPL')
+        >>> quote['Price']  # 只提取数据表格
+        >>> quote.news  # 首次读取时提取新闻
+    """
+
+    HEADER_KEYS = frozenset(("Ticker", "Company", "Website", "Sector", "Industry", "Country"))
+
+    def __init__(self, ticker: str, stored, store: str):
+        self.ticker = ticker
+        self._stored = stored
+        self._store = store
+        self._page = None
+        self._sections = {}
+
+    def _page_parsed(self):
+        if self._page is None:
+            self._page = _stored_page(self._stored, self._store)  # compressed 方式只解压、解析一次
+        return self._page
+
+    def section(self, name: str):
+        """
+        返回报价页的一部分，首次读取时提取
+
+        Args:
+            name: QUOTE_SECTIONS 中的名称
+
+        Returns:
+            该部分提取出的数据，提取失败时抛出异常
+        """
+        value = self._sections.get(name)
+        if value is None:
+            if self._store == "sections":
+                value = self._stored[name]
+            else:
+                try:
+                    value = QUOTE_SECTIONS[name](self._page_parsed())
+                except Exception as e:
+                    value = ErrorInfo.of(e)  # 每次读取抛出新的异常，不保留调用栈
+            self._sections[name] = value
+
+        if isinstance(value, ErrorInfo):
+            raise value.exception()
+        return value
+
+    @property
+    def header(self) -> Dict[str, str]:
+        return self.section("header")
+
+    @property
+    def table(self) -> Dict[str, str]:
+        return self.section("table")
+
+    @property
+    def news(self) -> List[Tuple]:
+        return self.section("news")
+
+    @property
+    def insider(self) -> List[Dict]:
+        return self.section("insider")
+
+    @property
+    def ratings(self) -> List[Dict]:
+        return self.section("ratings")
+
+    def values(self) -> Dict[str, str]:
+        """返回 get_stock 的全部键值（头部信息与数据表格）"""
+        data = dict(self.header)
+        data.update(self.table)
+        return data
+
+    def select(self, fields: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        只提取部分键，数据表格中的键按位置直接读取（见 _table_fields）
+
+        Args:
+            fields: 要读取的键，如 ['Price', 'Change']
+
+        Returns:
+            Dict[str, Optional[str]]: 按 fields 顺序的键值，页面上没有的键为None
+        """
+        fields = list(fields)
+        table_keys = [key for key in fields if key not in self.HEADER_KEYS]
+        header = self.header if len(table_keys) < len(fields) else {}
 
+        if not table_keys:
+            table = {}
+        elif "table" in self._sections or self._store == "sections":
+            table = self.table
+        else:
+            table = _table_fields(self._page_parsed(), table_keys)
 
-def get_stock(ticker: str) -> Dict:
+        return {key: (header if key in self.HEADER_KEYS else table).get(key) for key in fields}
+
+    def __getitem__(self, key: str) -> str:
+        return (self.header if key in self.HEADER_KEYS else self.table)[key]
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self):
+        return f"QuoteSnapshot({self.ticker!r}, store={self._store!r})"
+
+
+def get_quote(ticker: str) -> QuoteSnapshot:
+    """
+    获取股票的报价页（通过报价页缓存，并发请求同一股票时只下载、解析一次）
+
+    Args:
+        ticker: 股票代码，如 'AAPL'
+
+    Returns:
+        QuoteSnapshot: 各部分在读取时才提取的报价页
+    """
+    cache = get_quote_cache()
+    stored = cache.get_or_load(ticker, lambda: _load_quote(ticker, cache.store))
+    return QuoteSnapshot(ticker, stored, cache.store)
+
+
+def _as_quote(ticker) -> QuoteSnapshot:
+    return ticker if isinstance(ticker, QuoteSnapshot) else get_quote(ticker)
+
+
+def get_stock(
+    ticker: Union[str, QuoteSnapshot], typed: bool = False, fields: Optional[Iterable[str]] = None
+) -> Dict:
     """
     获取股票详细信息
     
     Args:
-        ticker: 股票代码，如 'AAPL'
+        ticker: 股票代码，如 'AAPL'，或 get_quote 返回的 QuoteSnapshot
+        typed: 为True时返回转换后的数值：价格与比率为float，市值与成交量为int，
+            百分比为小数（12.5% -> 0.125），区间与股息为元组，"-" 为None
+        fields: 只提取并返回这些键（页面上没有的键为None），只需少数键时比提取全部快数倍
         
     Returns:
         Dict: 包含股票详细信息的字典，包括价格、市值、财务数据等
@@ -40,73 +493,114 @@ def get_stock(ticker: str) -> Dict:
     Example:
         >>> data = get_stock('AAPL')
         >>> print(data['Price'])  # 当前价格
+        >>> get_stock('AAPL', typed=True)['Market Cap']  # 3450000000000
+        >>> get_stock('AAPL', fields=['Price', 'Change'])
     """
     try:
-        get_page(ticker)
-        page_parsed = STOCK_PAGE[ticker]
-
-        # 获取基本信息 - 使用新的页面结构
-        data = {}
-        
-        # 获取股票代码
-        ticker_element = page_parsed.cssselect('.quote-header_ticker-wrapper_ticker')
-        if ticker_element:
-            data["Ticker"] = ticker_element[0].text.strip()
-        
-        # 获取公司名称
-        company_element = page_parsed.cssselect('.quote-header_ticker-wrapper_company a')
-        if company_element:
-            data["Company"] = company_element[0].text.strip()
-            company_link = company_element[0].get("href")
-            data["Website"] = company_link if company_link and company_link.startswith("http") else None
-        
-        # 获取行业信息 - 从标签链接中提取
-        tab_links = page_parsed.cssselect('.tab-link')
-        for link in tab_links:
-            href = link.get("href", "")
-            if "sec_" in href:
-                data["Sector"] = link.text.strip()
-            elif "ind_" in href:
-                data["Industry"] = link.text.strip()
-            elif "geo_" in href:
-                data["Country"] = link.text.strip()
-
-        # 获取股票数据表格
-        all_rows = [
-            row.xpath("td//text()")
-            for row in page_parsed.cssselect('tr[class="table-dark-row"]')
-        ]
-
-        for row in all_rows:
-            for column in range(0, len(row) - 1, 2):
-                if column + 1 < len(row):
-                    key = row[column].strip()
-                    value = row[column + 1].strip()
-                    
-                    # 处理特殊情况
-                    if key == "EPS next Y" and "EPS next Y" in data.keys():
-                        data["EPS growth next Y"] = value
-                        continue
-                    elif key == "Volatility":
-                        vols = value.split()
-                        if len(vols) >= 2:
-                            data["Volatility (Week)"] = vols[0]
-                            data["Volatility (Month)"] = vols[1]
-                        continue
-                    
-                    data[key] = value
-
-        return data
+        quote = _as_quote(ticker)
+        values = quote.values() if fields is None else quote.select(fields)
+        return convert_snapshot(values) if typed else values
     except Exception as e:
         return {"error": f"获取股票数据失败: {str(e)}"}
 
 
-def get_news(ticker: str) -> List[Tuple[str, str, str, str]]:
+def _stock_values(values: Dict[str, str], typed: bool, fields: Optional[Iterable[str]]) -> Dict:
+    """按 fields 选取快照中的键（页面上没有的键为None），并按需转换类型"""
+    if fields is not None:
+        values = {key: values.get(key) for key in fields}
+    return convert_snapshot(values) if typed else dict(values)
+
+
+def _scrape_snapshot(page_parsed, fields: Optional[List[str]]) -> Dict[str, Optional[str]]:
+    """get_stocks 在解析线程/进程中提取快照；fields 都不在页面上时返回全部键值，不存在的股票为空"""
+    if fields is not None:
+        values = QuoteSnapshot(None, page_parsed, "tree").select(fields)
+        if any(value is not None for value in values.values()):
+            return values
+    return _snapshot_values(page_parsed)
+
+
+def get_stocks(
+    tickers: Iterable[str],
+    concurrency: Optional[int] = None,
+    fields: Optional[Iterable[str]] = None,
+    typed: bool = False,
+    parse_executor: Optional[str] = "thread",
+) -> Dict[str, Dict]:
+    """
+    批量获取多只股票的详细信息
+
+    报价页缓存中已有的股票直接读取缓存，其余股票的报价页通过异步 Connector 并发下载
+    （共用全局限速器，被限流时自动重试），并在解析线程池/进程池中解析。并发下载的
+    页面不写入报价页缓存，批量刷新不会挤掉单只股票查询缓存的页面。
+
+    Args:
+        tickers: 股票代码列表，重复的代码只获取一次
+        concurrency: 同时进行的请求数，默认为 CONCURRENT_CONNECTIONS
+        fields: 只提取并返回这些键，页面上没有的键为None；默认返回全部
+        typed: 为True时返回转换后的数值，同 get_stock
+        parse_executor: 页面解析方式，None 为内联解析，'thread' 或 'process' 使用解析线程池/进程池
+
+    Returns:
+        Dict[str, Dict]: 股票代码到股票信息的映射，顺序同 tickers。单只股票失败时其值为
+        {"error": ...}（同 get_stock），不影响其他股票
+
+    Example:
+        >>> stocks = get_stocks(['AAPL', 'MSFT'], fields=['Price', 'Change'])
+        >>> stocks['AAPL']['Price']
+    """
+    tickers = list(dict.fromkeys(tickers))
+    fields = None if fields is None else list(fields)
+    cache = get_quote_cache()
+    stocks = {}
+
+    def add(ticker, values):
+        if isinstance(values, Exception):
+            stocks[ticker] = {"error": f"获取股票数据失败: {str(values)}"}
+            return
+        try:
+            if not values:  # 不存在的股票返回的不是报价页
+                raise InvalidTicker(ticker)
+            stocks[ticker] = _stock_values(values, typed, fields)
+        except Exception as e:
+            stocks[ticker] = {"error": f"获取股票数据失败: {str(e)}"}
+
+    missing = []
+    for ticker in tickers:
+        if ticker not in cache:
+            missing.append(ticker)
+            continue
+        try:
+            quote = get_quote(ticker)
+            values = quote.values() if fields is None else quote.select(fields)
+        except Exception as e:
+            values = e
+        add(ticker, values)
+
+    if missing:
+        connector = Connector(
+            _scrape_snapshot,
+            [f"{STOCK_URL}?{urlencode({'t': ticker})}" for ticker in missing],
+            generate_user_agent(),
+            fields,
+            css_select=True,
+            parse_executor=parse_executor,
+            return_exceptions=True,
+        )
+        for ticker, values in zip(missing, connector.run_connector(concurrency)):
+            add(ticker, values)
+
+    return {ticker: stocks[ticker] for ticker in tickers}
+
+
+def get_news(ticker: Union[str, QuoteSnapshot], timestamps: str = "text") -> List[Tuple[str, str, str, str]]:
     """
     获取股票相关新闻
     
     Args:
-        ticker: 股票代码，如 'AAPL'
+        ticker: 股票代码，如 'AAPL'，或 get_quote 返回的 QuoteSnapshot
+        timestamps: 时间的返回形式，'text' 为 "%Y-%m-%d %H:%M" 字符串，
+            'datetime' 为 datetime，'epoch' 为秒级时间戳（FinViz显示的是美东时间）
         
     Returns:
         List[Tuple]: 新闻列表，每个元素包含 (时间, 标题, 链接, 来源)
@@ -117,85 +611,34 @@ def get_news(ticker: str) -> List[Tuple[str, str, str, str]]:
         ...     print(f"{time}: {title}")
     """
     try:
-        get_page(ticker)
-        page_parsed = STOCK_PAGE[ticker]
-        news_table = page_parsed.cssselect('table[id="news-table"]')
+        if timestamps not in ("text", "datetime", "epoch"):
+            raise ValueError(f"Invalid timestamps: {timestamps}")
 
-        if len(news_table) == 0:
-            return []
-
-        rows = news_table[0].xpath("./tr[not(@id)]")
+        items = _as_quote(ticker).news
 
         results = []
-        current_date = None
-        
-        for row in rows:
-            tds = row.xpath("./td")
-            if len(tds) < 2:
-                continue
-                
-            # 获取时间文本并清理
-            time_text = tds[0].xpath("text()")[0] if tds[0].xpath("text()") else ""
-            raw_timestamp = time_text.strip()
-            
-            # 解析时间格式
-            try:
-                if "Today" in raw_timestamp:
-                    # 处理 "Today 06:00AM" 格式
-                    time_part = raw_timestamp.replace("Today", "").strip()
-                    parsed_timestamp = datetime.strptime(time_part, "%I:%M%p").replace(
-                        year=datetime.now().year,
-                        month=datetime.now().month,
-                        day=datetime.now().day
-                    )
-                    current_date = parsed_timestamp.date()
-                elif len(raw_timestamp) > 8 and "-" in raw_timestamp:
-                    # 处理 "Dec-15-24 06:00AM" 格式
-                    parsed_timestamp = datetime.strptime(raw_timestamp, "%b-%d-%y %I:%M%p")
-                    current_date = parsed_timestamp.date()
-                else:
-                    # 处理 "06:00AM" 格式（使用当前日期）
-                    if current_date is None:
-                        current_date = datetime.now().date()
-                    parsed_timestamp = datetime.strptime(raw_timestamp, "%I:%M%p").replace(
-                        year=current_date.year,
-                        month=current_date.month,
-                        day=current_date.day
-                    )
-            except ValueError:
-                # 如果时间解析失败，跳过这条新闻
-                continue
-            
-            # 获取新闻信息
-            news_link = tds[1].cssselect('a[class="tab-link-news"]')
-            if not news_link:
+        # 今天的日期只读取一次，同一天的后续行只显示时间
+        decode = getattr(NewsTimestampDecoder(), timestamps)
+
+        for time_text, title, url, source in items:
+            # 无法解析时间的新闻跳过
+            timestamp = decode(time_text)
+            if timestamp is None or title is None:
                 continue
-                
-            title = news_link[0].xpath("text()")[0] if news_link[0].xpath("text()") else ""
-            url = news_link[0].get("href", "")
-            
-            # 获取来源信息
-            source_span = tds[1].cssselect('div[class="news-link-right"] span')
-            source = source_span[0].xpath("text()")[0][1:] if source_span and source_span[0].xpath("text()") else ""
-
-            results.append((
-                parsed_timestamp.strftime("%Y-%m-%d %H:%M"),
-                title,
-                url,
-                source
-            ))
+
+            results.append((timestamp, title, url, source))
 
         return results
     except Exception as e:
         return [("error", f"获取新闻失败: {str(e)}", "", "")]
 
 
-def get_insider(ticker: str) -> List[Dict]:
+def get_insider(ticker: Union[str, QuoteSnapshot]) -> List[Dict]:
     """
     获取内部交易信息
     
     Args:
-        ticker: 股票代码，如 'AAPL'
+        ticker: 股票代码，如 'AAPL'，或 get_quote 返回的 QuoteSnapshot
         
     Returns:
         List[Dict]: 内部交易记录列表
@@ -205,32 +648,17 @@ def get_insider(ticker: str) -> List[Dict]:
         >>> print(f"内部交易记录数: {len(insider)}")
     """
     try:
-        get_page(ticker)
-        page_parsed = STOCK_PAGE[ticker]
-        outer_table = page_parsed.cssselect('table[class="body-table insider-trading-table"]')
-
-        if len(outer_table) == 0:
-            return []
-
-        table = outer_table[0]
-        headers = table[0].xpath("td//text()")
-
-        data = [dict(zip(
-            headers,
-            [etree.tostring(elem, method="text", encoding="unicode") for elem in row]
-        )) for row in table[1:]]
-
-        return data
+        return [dict(row) for row in _as_quote(ticker).insider]
     except Exception as e:
         return [{"error": f"获取内部交易信息失败: {str(e)}"}]
 
 
-def get_analyst_price_targets(ticker: str, last_ratings: int = 5) -> List[Dict]:
+def get_analyst_price_targets(ticker: Union[str, QuoteSnapshot], last_ratings: int = 5) -> List[Dict]:
     """
     获取分析师价格目标
     
     Args:
-        ticker: 股票代码，如 'AAPL'
+        ticker: 股票代码，如 'AAPL'，或 get_quote 返回的 QuoteSnapshot
         last_ratings: 获取最近几条评级，默认5条
         
     Returns:
@@ -242,37 +670,8 @@ def get_analyst_price_targets(ticker: str, last_ratings: int = 5) -> List[Dict]:
         ...     print(f"{target['date']}: {target['rating']}")
     """
     try:
-        analyst_price_targets = []
-
-        get_page(ticker)
-        page_parsed = STOCK_PAGE[ticker]
-        table = page_parsed.cssselect(
-            'table[class="js-table-ratings fullview-ratings-outer"]'
-        )[0]
-
-        for row in table:
-            rating = row.xpath("td//text()")
-            rating = [val.replace("→", "->").replace("$", "") for val in rating if val != "\n"]
-            rating[0] = datetime.strptime(rating[0], "%b-%d-%y").strftime("%Y-%m-%d")
-
-            data = {
-                "date": rating[0],
-                "category": rating[1],
-                "analyst": rating[2],
-                "rating": rating[3],
-            }
-            if len(rating) == 5:
-                if "->" in rating[4]:
-                    rating.extend(rating[4].replace(" ", "").split("->"))
-                    del rating[4]
-                    data["target_from"] = float(rating[4])
-                    data["target_to"] = float(rating[5])
-                else:
-                    data["target"] = float(rating[4])
-
-            analyst_price_targets.append(data)
-
-        return analyst_price_targets[:last_ratings]
+        ratings = _as_quote(ticker).ratings
+        return [dict(rating) for rating in ratings[:last_ratings]]
     except Exception as e:
         return [{"error": f"获取分析师评级失败: {str(e)}"}]
 
@@ -290,15 +689,11 @@ def get_all_news() -> List[Tuple[str, str, str]]:
     """
     try:
         page_parsed, _ = http_request_get(url=NEWS_URL, parse=True)
-        all_dates = [
-            row.text_content() for row in page_parsed.cssselect('td[class="nn-date"]')
-        ]
-        all_headlines = [
-            row.text_content() for row in page_parsed.cssselect('a[class="nn-tab-link"]')
-        ]
-        all_links = [
-            row.get("href") for row in page_parsed.cssselect('a[class="nn-tab-link"]')
-        ]
+        news = get_layout("news")
+        all_dates = [row.text_content() for row in news.dates(page_parsed)]
+        links = news.links(page_parsed)
+        all_headlines = [row.text_content() for row in links]
+        all_links = [row.get("href") for row in links]
 
         return list(zip(all_dates, all_headlines, all_links))
     except Exception as e:
@@ -317,9 +712,9 @@ def get_crypto(pair: str) -> Dict:
     """
     try:
         page_parsed, _ = http_request_get(url=CRYPTO_URL, parse=True)
-        page_html, _ = http_request_get(url=CRYPTO_URL, parse=False)
-        crypto_headers = page_parsed.cssselect('tr[valign="middle"]')[0].xpath("td//text()")
-        crypto_table_data = get_table(page_html, crypto_headers)
+        crypto = get_layout("crypto")
+        crypto_headers = crypto.cell_texts(crypto.header_row(page_parsed)[0])
+        crypto_table_data = get_table(page_parsed, crypto_headers)
 
         return crypto_table_data[pair]
     except Exception as e:
@@ -0,0 +1,15 @@
+"""
+FinViz 本地模拟站点
+
+按种子生成结构与 FinViz 一致的筛选器、个股、新闻和加密货币页面，用于离线的分页规模测试和基准测试。
+将 connection_settings["BASE_URL"] 指向 SyntheticServer.base_url 即可让所有请求路径访问本地站点。
+"""
+
+from .pages import SyntheticSite
+from .server import SyntheticServer, running_server
+
+__all__ = [
+    'SyntheticSite',
+    'SyntheticServer',
+    'running_server',
+]
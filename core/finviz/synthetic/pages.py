@@ -0,0 +1,584 @@
+import json
+import pathlib
+import random
+import re
+import zlib
+from datetime import date, timedelta
+from functools import lru_cache
+from html import escape
+from typing import Dict, List, Optional, Tuple
+
+# Custom screener columns as numbered by FinViz (c=...) and the kind of value they hold
+COLUMNS = [
+    (0, "No.", "no"), (1, "Ticker", "ticker"), (2, "Company", "company"),
+    (3, "Sector", "sector"), (4, "Industry", "industry"), (5, "Country", "country"),
+    (6, "Market Cap", "cap"), (7, "P/E", "ratio"), (8, "Fwd P/E", "ratio"),
+    (9, "PEG", "ratio"), (10, "P/S", "ratio"), (11, "P/B", "ratio"), (12, "P/C", "ratio"),
+    (13, "P/FCF", "ratio"), (14, "Dividend", "pct"), (15, "Payout Ratio", "pct"),
+    (16, "EPS", "ratio"), (17, "EPS this Y", "pct"), (18, "EPS next Y", "pct"),
+    (19, "EPS past 5Y", "pct"), (20, "EPS next 5Y", "pct"), (21, "Sales past 5Y", "pct"),
+    (22, "EPS Q/Q", "pct"), (23, "Sales Q/Q", "pct"), (24, "Outstanding", "shares"),
+    (25, "Float", "shares"), (26, "Insider Own", "pct"), (27, "Insider Trans", "pct"),
+    (28, "Inst Own", "pct"), (29, "Inst Trans", "pct"), (30, "Float Short", "pct"),
+    (31, "Short Ratio", "ratio"), (32, "ROA", "pct"), (33, "ROE", "pct"), (34, "ROI", "pct"),
+    (35, "Curr R", "ratio"), (36, "Quick R", "ratio"), (37, "LTDebt/Eq", "ratio"),
+    (38, "Debt/Eq", "ratio"), (39, "Gross M", "pct"), (40, "Oper M", "pct"),
+    (41, "Profit M", "pct"), (42, "Perf Week", "pct"), (43, "Perf Month", "pct"),
+    (44, "Perf Quart", "pct"), (45, "Perf Half", "pct"), (46, "Perf Year", "pct"),
+    (47, "Perf YTD", "pct"), (48, "Beta", "ratio"), (49, "ATR", "ratio"),
+    (50, "Volatility W", "pct"), (51, "Volatility M", "pct"), (52, "SMA20", "pct"),
+    (53, "SMA50", "pct"), (54, "SMA200", "pct"), (55, "50D High", "pct"),
+    (56, "50D Low", "pct"), (57, "52W High", "pct"), (58, "52W Low", "pct"),
+    (59, "RSI", "ratio"), (60, "from Open", "pct"), (61, "Gap", "pct"),
+    (62, "Recom", "recom"), (63, "Avg Volume", "shares"), (64, "Rel Volume", "ratio"),
+    (65, "Price", "price"), (66, "Change", "pct"), (67, "Volume", "volume"),
+    (68, "Earnings", "earnings"), (69, "Target Price", "price"), (70, "IPO Date", "date"),
+]
+COLUMN_NAMES = {column_id: name for column_id, name, _ in COLUMNS}
+COLUMN_KINDS = {column_id: kind for column_id, _, kind in COLUMNS}
+
+# Columns of the predefined screener views (v=...)
+VIEW_COLUMNS = {
+    "111": [0, 1, 2, 3, 4, 5, 6, 7, 65, 66, 67],
+    "121": [0, 1, 6, 7, 8, 9, 10, 11, 12, 13, 17, 18, 19, 20, 21, 65, 66, 67],
+    "131": [0, 1, 6, 24, 25, 26, 27, 28, 29, 30, 31, 63, 65, 66, 67],
+    "141": [0, 1, 42, 43, 44, 45, 46, 47, 50, 51, 62, 63, 64, 65, 66, 67],
+    "161": [0, 1, 6, 14, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 68, 65, 66, 67],
+    "171": [0, 1, 48, 49, 52, 53, 54, 57, 58, 59, 60, 61, 65, 66, 67],
+    "181": [0, 1, 2, 3, 4, 5, 6, 65, 66, 67],
+}
+
+# Rows of the quote page snapshot table, label/value pairs as laid out by FinViz
+SNAPSHOT_ROWS = [
+    ["Index", "P/E", "EPS (ttm)", "Insider Own", "Shs Outstand", "Perf Week"],
+    ["Market Cap", "Forward P/E", "EPS next Y", "Insider Trans", "Shs Float", "Perf Month"],
+    ["Income", "PEG", "EPS next Q", "Inst Own", "Short Float", "Perf Quarter"],
+    ["Sales", "P/S", "EPS this Y", "Inst Trans", "Short Ratio", "Perf Half Y"],
+    ["Book/sh", "P/B", "EPS next Y", "ROA", "Short Interest", "Perf Year"],
+    ["Cash/sh", "P/C", "EPS next 5Y", "ROE", "52W Range", "Perf YTD"],
+    ["Dividend Est.", "P/FCF", "EPS past 5Y", "ROI", "52W High", "Beta"],
+    ["Dividend TTM", "Quick Ratio", "Sales past 5Y", "Gross Margin", "52W Low", "ATR (14)"],
+    ["Dividend Ex-Date", "Current Ratio", "EPS Y/Y TTM", "Oper. Margin", "RSI (14)", "Volatility"],
+    ["Employees", "Debt/Eq", "Sales Y/Y TTM", "Profit Margin", "Recom", "Target Price"],
+    ["Option/Short", "LT Debt/Eq", "EPS Q/Q", "Payout", "Rel Volume", "Prev Close"],
+    ["Sales Surprise", "EPS Surprise", "Sales Q/Q", "Earnings", "Avg Volume", "Price"],
+    ["SMA20", "SMA50", "SMA200", "Trades", "Volume", "Change"],
+]
+SNAPSHOT_COLUMNS = {
+    "P/E": 7, "Forward P/E": 8, "PEG": 9, "P/S": 10, "P/B": 11, "P/C": 12, "P/FCF": 13,
+    "Market Cap": 6, "Shs Outstand": 24, "Shs Float": 25, "Insider Own": 26,
+    "Insider Trans": 27, "Inst Own": 28, "Inst Trans": 29, "Short Float": 30,
+    "Short Ratio": 31, "ROA": 32, "ROE": 33, "ROI": 34, "Current Ratio": 35,
+    "Quick Ratio": 36, "LT Debt/Eq": 37, "Debt/Eq": 38, "Gross Margin": 39,
+    "Oper. Margin": 40, "Profit Margin": 41, "Perf Week": 42, "Perf Month": 43,
+    "Perf Quarter": 44, "Perf Half Y": 45, "Perf Year": 46, "Perf YTD": 47, "Beta": 48,
+    "ATR (14)": 49, "SMA20": 52, "SMA50": 53, "SMA200": 54, "52W High": 57,
+    "52W Low": 58, "RSI (14)": 59, "Recom": 62, "Avg Volume": 63, "Rel Volume": 64,
+    "Price": 65, "Change": 66, "Volume": 67, "Earnings": 68, "Target Price": 69,
+    "EPS this Y": 17, "EPS next 5Y": 20, "EPS past 5Y": 19, "Sales past 5Y": 21,
+    "EPS Q/Q": 22, "Sales Q/Q": 23, "Payout": 15,
+}
+
+NEWS_SOURCES = ["Reuters", "Bloomberg", "Motley Fool", "Zacks", "Barrons.com", "Benzinga"]
+ANALYSTS = ["Morgan Stanley", "Goldman", "JP Morgan", "Citigroup", "UBS", "Wedbush"]
+RATINGS = ["Buy", "Overweight", "Neutral", "Outperform", "Hold", "Underweight"]
+INSIDER_TITLES = ["CEO", "CFO", "Director", "SVP", "General Counsel"]
+CRYPTO_PAIRS = ["BTCUSD", "ETHUSD", "SOLUSD", "XRPUSD", "ADAUSD", "DOGEUSD", "LTCUSD"]
+
+# News and rating dates are counted back from a fixed day so pages are reproducible
+REFERENCE_DATE = date(2024, 12, 16)
+
+
+@lru_cache(maxsize=None)
+def _filter_options() -> Dict[str, Dict[str, str]]:
+    json_file = pathlib.Path(__file__).parent.parent / "filters.json"
+    with open(json_file, "r") as fp:
+        return json.load(fp)
+
+
+def _choices(category: str) -> List[Tuple[str, str]]:
+    """ Returns the (label, filter id) options of a filter category, without "Any". """
+
+    return [(k, v) for k, v in _filter_options()[category].items() if v]
+
+
+def _ticker_symbol(index: int) -> str:
+    """ Maps 0, 1, ... to A, B, ..., Z, AA, AB, ... so every row gets a unique ticker. """
+
+    symbol = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        symbol = chr(65 + remainder) + symbol
+    return symbol
+
+
+def _scaled(value: float) -> str:
+    for divisor, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(value) >= divisor:
+            return f"{value / divisor:.2f}{suffix}"
+    return f"{value:.2f}"
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+class SyntheticSite:
+    """
+    Deterministic model of the FinViz pages used by this package.
+
+    The same seed always produces the same universe, values and markup, so pages can be
+    served by the stand-in server or saved as fixtures. Markup follows the live layouts
+    that the scrapers target (screener table, count text and page select, quote header,
+    snapshot table, news, insider and ratings tables).
+    """
+
+    def __init__(self, seed: int = 0, rows: int = 10000, news_rows: int = 100):
+        self.seed = seed
+        self.rows = rows
+        self.news_rows = news_rows
+        self._tickers = {_ticker_symbol(i): i for i in range(rows)}
+        self._symbols = {}
+        self._profiles = {}
+
+    # ---------------------------------------------------------------- values
+
+    def _random(self, index: int, salt: int) -> random.Random:
+        return random.Random((self.seed << 40) ^ (index << 12) ^ (salt & 0xFFF))
+
+    def profile(self, index: int) -> Dict[str, str]:
+        """ Returns the descriptive fields of a ticker, including the filter ids they match. """
+
+        if index not in self._profiles:
+            self._profiles[index] = self._make_profile(index)
+        return self._profiles[index]
+
+    def _make_profile(self, index: int) -> Dict[str, str]:
+        rng = self._random(index, 0xFFF)
+        ticker = self._symbols.get(index) or _ticker_symbol(index)
+        sector, sector_id = rng.choice(_choices("Sector"))
+        industry, industry_id = rng.choice(_choices("Industry"))
+        country, country_id = rng.choice(_choices("Country")[:12])
+        word = rng.choice(["Holdings", "Corp", "Inc", "Group", "Technologies", "Partners"])
+
+        return dict(
+            ticker=ticker,
+            company=f"{ticker.title()} {sector.split()[0]} {word}",
+            sector=sector,
+            industry=industry,
+            country=country,
+            filters=f"{sector_id},{industry_id},{country_id}",
+        )
+
+    def cell(self, index: int, column_id: int) -> Tuple[object, str]:
+        """ Returns the sort value and display text of one screener cell. """
+
+        kind = COLUMN_KINDS[column_id]
+        if kind in ("ticker", "company", "sector", "industry", "country"):
+            text = self.profile(index)[kind]
+            return text, text
+
+        rng = self._random(index, column_id)
+        if kind != "price" and rng.random() < 0.04:
+            return float("-inf"), "-"
+
+        if kind == "cap":
+            value = 10 ** rng.uniform(1.5, 6.5)  # Millions
+            return value, _scaled(value * 1e6)
+        if kind == "shares":
+            value = 10 ** rng.uniform(5, 10)
+            return value, _scaled(value)
+        if kind == "ratio":
+            value = round(rng.uniform(0.1, 80), 2)
+            return value, f"{value:.2f}"
+        if kind == "pct":
+            value = round(rng.gauss(0, 20), 2)
+            return value, f"{value:.2f}%"
+        if kind == "price":
+            value = round(10 ** rng.uniform(0, 3), 2)
+            return value, f"{value:.2f}"
+        if kind == "volume":
+            value = int(10 ** rng.uniform(2, 8))
+            return value, f"{value:,}"
+        if kind == "recom":
+            value = round(rng.uniform(1, 5), 2)
+            return value, f"{value:.2f}"
+        if kind == "earnings":
+            day = REFERENCE_DATE + timedelta(days=rng.randint(-60, 60))
+            return day.toordinal(), f"{day:%b %d} {rng.choice(['AMC', 'BMO'])}"
+        if kind == "date":
+            day = date(1980, 1, 1) + timedelta(days=rng.randint(0, 16000))
+            return day.toordinal(), f"{day:%m/%d/%Y}"
+
+        raise ValueError(f"Unknown column kind: {kind}")
+
+    # -------------------------------------------------------------- screener
+
+    def _matches(self, index: int, filters: List[str]) -> bool:
+        profile_filters = self.profile(index)["filters"].split(",")
+
+        for filter_id in filters:
+            prefix = filter_id.split("_", 1)[0]
+            if prefix in ("sec", "ind", "geo"):
+                if filter_id not in profile_filters:
+                    return False
+            elif zlib.crc32(f"{filter_id}:{index}".encode()) % 100 >= 70:
+                return False
+
+        return True
+
+    def _order_column(self, order: str) -> Tuple[int, bool]:
+        descending = order.startswith("-")
+        key = _slug(order.lstrip("-"))
+
+        for column_id, name, _ in COLUMNS:
+            if _slug(name) == key:
+                return column_id, descending
+
+        return 1, descending  # Unknown orders fall back to the ticker
+
+    def screen(self, tickers: List[str], filters: List[str], order: str) -> List[int]:
+        """ Returns the row indexes matching a screen, in display order. """
+
+        if tickers:
+            indexes = [self._tickers[t] for t in tickers if t in self._tickers]
+        else:
+            indexes = range(self.rows)
+
+        indexes = [i for i in indexes if self._matches(i, filters)]
+
+        column_id, descending = self._order_column(order or "ticker")
+        if column_id == 1:
+            indexes.sort(reverse=descending)  # Ticker symbols sort like their indexes
+        else:
+            indexes.sort(key=lambda i: self.cell(i, column_id)[0], reverse=descending)
+
+        return indexes
+
+    def screener_columns(self, view: str, custom: Optional[List[str]]) -> List[int]:
+        if view.startswith("15") and custom:
+            return [int(c) for c in custom if c.isdigit() and int(c) in COLUMN_NAMES]
+        return VIEW_COLUMNS.get(view[:3], VIEW_COLUMNS["111"])
+
+    def screener_page(self, params: Dict[str, str]) -> str:
+        """ Renders screener.ashx for the v, t, f, o, c and r parameters. Signals (s) are not simulated. """
+
+        if params.get("ft") == "4" and "r" not in params and not params.get("f"):
+            return self.filters_page()
+
+        view = params.get("v", "111") or "111"
+        tickers = [t for t in params.get("t", "").upper().split(",") if t]
+        filters = [f for f in params.get("f", "").split(",") if f]
+        custom = [c for c in params.get("c", "").split(",") if c]
+        column_ids = self.screener_columns(view, custom)
+
+        matches = self.screen(tickers, filters, params.get("o", ""))
+        total = len(matches)
+        start = max(int(params.get("r", "1") or 1), 1)
+        page_rows = matches[start - 1: start - 1 + 20]
+
+        query = "&".join(f"{k}={params[k]}" for k in ("v", "f", "o", "t", "c") if params.get(k))
+        total_pages = (total + 19) // 20
+
+        options = []
+        for page in range(1, total_pages + 1):
+            first = 1 + (page - 1) * 20
+            selected = 'selected="selected" ' if first == start else ""
+            options.append(
+                f"<option {selected}value={first}>Page {page} / {total_pages}</option>"
+            )
+        options = "".join(options)
+        header = "".join(
+            f'<th class="table-header cursor-pointer" align="right" '
+            f"onclick=\"window.location='screener.ashx?{query}&o={_slug(COLUMN_NAMES[c])}'\">"
+            f"{escape(COLUMN_NAMES[c])}</th>"
+            for c in column_ids
+        )
+
+        body = []
+        for number, index in enumerate(page_rows, start):
+            ticker = self.profile(index)["ticker"]
+            link = f"quote.ashx?t={ticker}&ty=c&p=d&b=1"
+            cells = []
+            for column_id in column_ids:
+                if column_id == 0:
+                    text = str(number)
+                else:
+                    value, text = self.cell(index, column_id)
+                    if COLUMN_KINDS[column_id] == "pct" and text != "-":
+                        sign = "is-negative" if value < 0 else "is-positive"
+                        text = f'<span class="color-text {sign}">{text}</span>'
+                        cells.append(
+                            f'<td height="10" align="right"><a href="{link}" ">{text}</a></td>'
+                        )
+                        continue
+                    text = escape(text)
+                if column_id == 1:
+                    cells.append(
+                        f'<td height="10" align="left"><a href="{link}" class="tab-link">{text}</a></td>'
+                    )
+                else:
+                    cells.append(f'<td height="10" align="right"><a href="{link}" ">{text}</a></td>')
+            body.append(
+                '<tr class="styled-row is-bordered is-rounded is-hoverable is-striped has-color-text" '
+                'valign="top">\n' + "".join(cells) + "</tr>"
+            )
+
+        counter = f"#{start} / {total} Total" if total else "#0 / 0 Total"
+        return (
+            "<!DOCTYPE html>\n<html><head><title>Stock Screener</title></head><body>\n"
+            '<div id="screener-content"><table width="100%"><tr><td width="100%">\n'
+            '<div class="relative w-full min-h-6"><div class="absolute flex">\n'
+            f'<div id="screener-total" class="count-text whitespace-nowrap">{counter}</div>\n'
+            '<div id="screener-page-select" class="flex">'
+            f'<select id="pageSelect" class="pages-combo fv-select">\n{options}</select></div>\n'
+            "</div></div></td></tr>\n"
+            '<tr id="screener-table"><td><table width="100%"><tr><td>\n'
+            '<table class="styled-table-new is-rounded is-tabular-nums w-full screener_table">\n'
+            f'<thead>\n<tr align="center" valign="middle">\n{header}\n</thead>\n'
+            + "\n".join(body)
+            + "\n</table></td></tr></table></td></tr></table></div>\n</body></html>\n"
+        )
+
+    def filters_page(self) -> str:
+        """ Renders the screener filters page (ft=4) from the bundled filters.json. """
+
+        cells = []
+        for label, options in _filter_options().items():
+            values = [v for v in options.values() if v]
+            if not values:
+                continue
+            name = values[0].rsplit("_", 1)[0] if "_" in values[0] else values[0]
+            option_tags = "".join(
+                f'<option value="{escape(v[len(name) + 1:] if v else "")}">{escape(text)}</option>'
+                for text, v in options.items()
+            )
+            cells.append(
+                f'<td class="filters-cells" align="right"><span>{escape(label)}</span></td>'
+                f'<td class="filters-cells"><select class="screener-combo-text" '
+                f'data-filter="{escape(name)}">{option_tags}</select></td>'
+            )
+
+        rows = "".join(f"<tr>{''.join(cells[i:i + 5])}</tr>" for i in range(0, len(cells), 5))
+        return (
+            "<!DOCTYPE html>\n<html><body>\n"
+            f'<table id="filter-table-filters" class="filters-table">{rows}'
+            "<tr><td></td><td></td></tr></table>\n</body></html>\n"
+        )
+
+    # ----------------------------------------------------------------- quote
+
+    def has_ticker(self, ticker: str) -> bool:
+        """ Any symbol of up to five letters has a quote page, screens only cover the generated universe. """
+
+        return re.fullmatch(r"[A-Z]{1,5}", ticker.upper()) is not None
+
+    def ticker_index(self, ticker: str) -> int:
+        ticker = ticker.upper()
+        if ticker not in self._tickers:
+            index = self.rows + zlib.crc32(ticker.encode())
+            self._symbols[index] = ticker
+            return index
+        return self._tickers[ticker]
+
+    def _snapshot_value(self, index: int, label: str, rng: random.Random) -> str:
+        if label in SNAPSHOT_COLUMNS:
+            return self.cell(index, SNAPSHOT_COLUMNS[label])[1]
+        if label == "Index":
+            return rng.choice(["S&P 500", "-", "NDX, S&P 500", "RUT"])
+        if label in ("Income", "Sales", "Short Interest"):
+            return _scaled(10 ** rng.uniform(6, 11))
+        if label == "Volatility":
+            return f"{rng.uniform(0.5, 6):.2f}% {rng.uniform(0.5, 6):.2f}%"
+        if label == "52W Range":
+            low = rng.uniform(5, 100)
+            return f"{low:.2f} - {low * rng.uniform(1.1, 3):.2f}"
+        if label == "Employees":
+            return f"{rng.randint(10, 200000):,}"
+        if label == "Option/Short":
+            return rng.choice(["Yes / Yes", "No / Yes", "Yes / No"])
+        if label == "Dividend Ex-Date":
+            return f"{REFERENCE_DATE - timedelta(days=rng.randint(1, 90)):%b %d, %Y}"
+        if label in ("Dividend Est.", "Dividend TTM"):
+            return f"{rng.uniform(0, 5):.2f} ({rng.uniform(0, 4):.2f}%)"
+        if label == "Trades":
+            return f"{rng.randint(1000, 900000):,}"
+        if label.startswith("EPS") and "Y/Y" not in label or label == "Prev Close":
+            return f"{rng.uniform(-5, 20):.2f}"
+        return f"{rng.gauss(0, 15):.2f}%"
+
+    def quote_page(self, ticker: str) -> str:
+        """ Renders quote.ashx for a ticker: header, snapshot, ratings, news and insider tables. """
+
+        index = self.ticker_index(ticker)
+        profile = self.profile(index)
+        rng = self._random(index, 0xFFE)
+
+        header = (
+            '<div class="quote-header"><div class="quote-header_left">'
+            '<div class="quote-header_ticker-wrapper">'
+            f'<h1 class="quote-header_ticker-wrapper_ticker">{profile["ticker"]}</h1>'
+            '<h2 class="quote-header_ticker-wrapper_company text-base">'
+            f'<a class="tab-link block truncate" href="https://www.{_slug(profile["company"])}.com" '
+            f'target="_blank">{escape(profile["company"])}</a></h2></div></div>'
+            '<div class="quote-links"><div class="flex space-x-0.5 overflow-hidden">'
+            f'<a href="screener.ashx?v=111&f={profile["filters"].split(",")[0]}" class="tab-link">'
+            f'{escape(profile["sector"])}</a><span> • </span>'
+            f'<a href="screener.ashx?v=111&f={profile["filters"].split(",")[1]}" class="tab-link">'
+            f'{escape(profile["industry"])}</a><span> • </span>'
+            f'<a href="screener.ashx?v=111&f={profile["filters"].split(",")[2]}" class="tab-link">'
+            f'{escape(profile["country"])}</a></div></div></div>\n'
+        )
+
+        snapshot_rows = []
+        for labels in SNAPSHOT_ROWS:
+            cells = "".join(
+                f'<td class="snapshot-td2 cursor-pointer w-[7%]" align="left">{escape(label)}</td>'
+                f'<td class="snapshot-td2 w-[8%] " align="left"><b>'
+                f"{escape(self._snapshot_value(index, label, rng))}</b></td>"
+                for label in labels
+            )
+            snapshot_rows.append(f'<tr class="table-dark-row">{cells}</tr>')
+        snapshot = (
+            '<table width="100%" cellpadding="3" cellspacing="0" '
+            'class="js-snapshot-table snapshot-table2 screener_snapshot-table-body">\n'
+            + "\n".join(snapshot_rows)
+            + "\n</table>\n"
+        )
+
+        ratings = []
+        day = REFERENCE_DATE
+        for _ in range(rng.randint(3, 15)):
+            day -= timedelta(days=rng.randint(1, 40))
+            price = rng.uniform(10, 500)
+            if rng.random() < 0.5:
+                target = f"${price:.0f} → ${price * rng.uniform(0.8, 1.3):.0f}"
+            else:
+                target = f"${price:.0f}"
+            ratings.append(
+                '<tr class="styled-row is-hoverable is-bordered is-rounded is-striped has-color-text">'
+                f'<td class="text-left">{day:%b-%d-%y}</td>'
+                f'<td class="text-left">{rng.choice(["Upgrade", "Downgrade", "Reiterated", "Initiated"])}</td>'
+                f'<td class="text-left">{rng.choice(ANALYSTS)}</td>'
+                f'<td class="text-left">{rng.choice(RATINGS)} → {rng.choice(RATINGS)}</td>'
+                f'<td class="text-right">{escape(target)}</td></tr>'
+            )
+        ratings_table = (
+            '<table width="100%" cellpadding="0" cellspacing="0" '
+            'class="js-table-ratings fullview-ratings-outer">'
+            + "".join(ratings)
+            + "</table>\n"
+        )
+
+        news = []
+        moment = REFERENCE_DATE
+        current_day = None
+        minutes = 21 * 60
+        for row in range(self.news_rows):
+            minutes -= rng.randint(5, 240)
+            if minutes < 0:
+                moment -= timedelta(days=1 + (minutes // -1440))
+                minutes %= 1440
+            hour, minute = divmod(minutes, 60)
+            clock = f"{(hour - 1) % 12 + 1:02d}:{minute:02d}{'AM' if hour < 12 else 'PM'}"
+            if row == 0:
+                stamp = f"Today {clock}"
+            elif moment != current_day:
+                stamp = f"{moment:%b-%d-%y} {clock}"
+            else:
+                stamp = clock
+            current_day = moment
+            news.append(
+                '<tr class="cursor-pointer has-label" onclick="trackAndOpenNews(event, \'x\');">'
+                f'<td width="130" align="right">{stamp}</td>'
+                '<td align="left"><div class="news-link-container">'
+                '<div class="news-link-left">'
+                f'<a class="tab-link-news" href="https://news.example.com/{profile["ticker"]}/{row}" '
+                f'target="_blank" rel="nofollow">{escape(profile["company"])} headline {row}</a></div>'
+                f'<div class="news-link-right"><span>({rng.choice(NEWS_SOURCES)})</span>'
+                "</div></div></td></tr>"
+            )
+        news_table = (
+            '<table width="100%" cellpadding="1" cellspacing="0" border="0" id="news-table" '
+            'class="fullview-news-outer news-table">' + "".join(news) + "</table>\n"
+        )
+
+        insider = [
+            '<tr class="fv-label"><td class="insider-trading-header">Insider Trading</td>'
+            "<td>Relationship</td><td>Date</td><td>Transaction</td><td>Cost</td>"
+            "<td>#Shares</td><td>Value ($)</td><td>#Shares Total</td><td>SEC Form 4</td></tr>"
+        ]
+        for row in range(rng.randint(1, 12)):
+            shares = rng.randint(100, 500000)
+            cost = rng.uniform(5, 500)
+            insider.append(
+                '<tr class="fv-row cursor-pointer">'
+                f'<td><a class="tab-link" href="insidertrading.ashx?oc={row}">PERSON {row}</a></td>'
+                f"<td>{rng.choice(INSIDER_TITLES)}</td>"
+                f"<td>{REFERENCE_DATE - timedelta(days=row * 7):%b %d '%y}</td>"
+                f'<td>{rng.choice(["Sale", "Buy", "Option Exercise"])}</td>'
+                f"<td>{cost:.2f}</td><td>{shares:,}</td><td>{int(shares * cost):,}</td>"
+                f"<td>{rng.randint(1000, 9000000):,}</td>"
+                f'<td><a class="tab-link" href="https://www.sec.gov/{row}">'
+                f"{REFERENCE_DATE - timedelta(days=row * 7 - 2):%b %d %I:%M %p}</a></td></tr>"
+            )
+        insider_table = (
+            '<table class="body-table insider-trading-table" width="100%">'
+            + "".join(insider)
+            + "</table>\n"
+        )
+
+        return (
+            "<!DOCTYPE html>\n<html><head>"
+            f'<title>{profile["ticker"]} Stock Price and Quote</title></head><body>\n'
+            + header
+            + snapshot
+            + ratings_table
+            + news_table
+            + insider_table
+            + "</body></html>\n"
+        )
+
+    # ------------------------------------------------------- news and crypto
+
+    def news_page(self) -> str:
+        """ Renders news.ashx with its date cells and headline links. """
+
+        rng = self._random(0, 0xFFD)
+        rows = []
+        for row in range(self.news_rows):
+            rows.append(
+                '<tr class="styled-row is-hoverable is-bordered is-rounded is-striped has-color-text">'
+                f'<td class="nn-date">{(row * 7) // 60 % 12 + 1:02d}:{(row * 7) % 60:02d}AM</td>'
+                f'<td class="news_link-cell"><a class="nn-tab-link" '
+                f'href="https://news.example.com/market/{row}">Market headline {row} '
+                f"{rng.choice(NEWS_SOURCES)}</a></td></tr>"
+            )
+        return (
+            "<!DOCTYPE html>\n<html><body>\n"
+            '<table class="styled-table-new is-rounded table-fixed">'
+            + "".join(rows)
+            + "</table>\n</body></html>\n"
+        )
+
+    def crypto_page(self) -> str:
+        """ Renders crypto_performance.ashx with a valign="middle" header row and valign="top" rows. """
+
+        labels = ["Ticker", "Price", "Perf Day", "Perf Week", "Perf Month", "Perf Quart",
+                  "Perf Half", "Perf Year", "Perf YTD"]
+        rows = []
+        for index, pair in enumerate(CRYPTO_PAIRS):
+            rng = self._random(index, 0xFFC)
+            cells = [pair, f"{10 ** rng.uniform(-1, 5):.2f}"] + [
+                f"{rng.gauss(0, 15):.2f}%" for _ in labels[2:]
+            ]
+            rows.append(
+                '<tr valign="top">' + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>"
+            )
+        return (
+            "<!DOCTYPE html>\n<html><body>\n<table>"
+            '<tr valign="middle">' + "".join(f"<td>{label}</td>" for label in labels) + "</tr>"
+            + "".join(rows)
+            + "</table>\n</body></html>\n"
+        )
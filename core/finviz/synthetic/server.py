@@ -0,0 +1,139 @@
+import argparse
+import contextlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from urllib.parse import parse_qsl, urlsplit
+
+from ..helper_functions.transport import THROTTLE_BODY
+from .pages import SyntheticSite
+
+
+class SyntheticServer(ThreadingHTTPServer):
+    """
+    Local HTTP stand-in for finviz.com serving pages generated by SyntheticSite.
+
+    latency delays every response and throttle_rate is the share of requests answered
+    with FinViz's "Too many requests." response, drawn from a generator seeded like the site.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 0),
+        site: SyntheticSite = None,
+        latency: float = 0.0,
+        throttle_rate: float = 0.0,
+    ):
+        super().__init__(address, _SyntheticHandler)
+        self.site = site or SyntheticSite()
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.requests = 0
+        self.throttled = 0
+        self._random = random.Random(self.site.seed)
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def should_throttle(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            throttled = self._random.random() < self.throttle_rate
+            self.throttled += throttled
+            return throttled
+
+
+class _SyntheticHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.should_throttle():
+            return self._send(429, THROTTLE_BODY, "text/plain")
+
+        parts = urlsplit(self.path)
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        page = parts.path.rsplit("/", 1)[-1]
+        site = server.site
+
+        if page == "screener.ashx":
+            body = site.screener_page(params)
+        elif page == "quote.ashx" and site.has_ticker(params.get("t", "")):
+            body = site.quote_page(params["t"])
+        elif page == "news.ashx":
+            body = site.news_page()
+        elif page == "crypto_performance.ashx":
+            body = site.crypto_page()
+        else:
+            return self._send(404, b"<html><body>Not found</body></html>", "text/html")
+
+        self._send(200, body.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def running_server(
+    seed: int = 0,
+    rows: int = 10000,
+    latency: float = 0.0,
+    throttle_rate: float = 0.0,
+    port: int = 0,
+) -> Iterator[SyntheticServer]:
+    """ Runs a stand-in server on a background thread for the duration of the block. """
+
+    server = SyntheticServer(
+        ("127.0.0.1", port), SyntheticSite(seed, rows), latency, throttle_rate
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in server for finviz.com")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rows", type=int, default=10000, help="Tickers in the universe")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response")
+    parser.add_argument(
+        "--throttle-rate", type=float, default=0.0, help='Share of "Too many requests." answers'
+    )
+    args = parser.parse_args()
+
+    server = SyntheticServer(
+        (args.host, args.port),
+        SyntheticSite(args.seed, args.rows),
+        args.latency,
+        args.throttle_rate,
+    )
+    print(f"Serving synthetic FinViz on {server.base_url} (set BASE_URL to point requests at it)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
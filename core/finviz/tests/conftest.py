@@ -0,0 +1,53 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.finviz.helper_functions import rate_limiter, request_functions
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """ Answers every GET request with a small HTML page over a kept-alive connection. """
+
+    protocol_version = "HTTP/1.1"
+    body = b"<html><body><p>ok</p></body></html>"
+
+    def send_body(self, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.send_body(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def serve():
+    """ Starts local HTTP servers for a handler class and returns their base URL. """
+    servers = []
+
+    def start(handler=PageHandler):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/"
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def unlimited_rate(monkeypatch):
+    """ Disables the shared rate limiter so local servers are not paced like FinViz. """
+    monkeypatch.setitem(request_functions.connection_settings, "RATE_LIMIT", None)
+    rate_limiter.reset_rate_limiter()
+    yield
+    rate_limiter.reset_rate_limiter()
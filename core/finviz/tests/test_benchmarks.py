@@ -0,0 +1,71 @@
+from core.finviz.benchmarks import (BENCHMARKS, Fixtures, compare,
+                                    format_report, load_baseline,
+                                    run_benchmarks, save_baseline)
+from core.finviz.helper_functions.page_selectors import get_layout
+from core.finviz.helper_functions.quote_cache import get_quote_cache
+from core.finviz.helper_functions.scraper_functions import (get_page_urls,
+                                                            get_table,
+                                                            get_total_rows)
+from core.finviz.helper_functions.transport import get_transport
+
+
+class TestFixtures:
+    """ The checked-in pages still parse into the expected data """
+
+    def test_screener_fixture(self):
+        tree = Fixtures().tree("screener.html")
+        total = get_total_rows(tree)
+
+        assert total > 20
+        assert len(get_page_urls(tree, total, "https://finviz.com/screener.ashx?v=111")) == -(-total // 20)
+
+    def test_live_screener_fixture(self):
+        fixtures = Fixtures()
+        tree = fixtures.tree("screener_live.html")
+        screener = get_layout("screener")
+        headers = [screener.normalized_text(th) for th in screener.headers(tree)]
+        table = get_table(fixtures.text("screener_live.html"), headers, rows=20)
+
+        assert get_total_rows(fixtures.pages["screener_live.html"]) == get_total_rows(tree) == 10425
+        assert len(table) == 20
+        assert table[0]["Ticker"] == "A" and table[0]["Volume"] == "1,721,123"
+
+    def test_every_benchmark_produces_items(self):
+        results = run_benchmarks(repeat=1)
+
+        assert [result["name"] for result in results] == list(BENCHMARKS)
+        for result in results:
+            assert result["items"] > 0, result["name"]
+            assert result["median"] > 0
+            assert result["peak_bytes"] > 0
+
+    def test_run_restores_request_path(self):
+        transport = get_transport()
+        run_benchmarks(["get_stock"], repeat=1)
+
+        assert get_transport() is transport
+        assert len(get_quote_cache()) == 0
+
+
+class TestComparison:
+    """ Unit tests for the baseline comparison """
+
+    def test_statuses(self):
+        results = [
+            dict(name=name, median=median, items=1, items_per_sec=1 / median, peak_bytes=1024)
+            for name, median in [("a", 0.010), ("b", 0.021), ("c", 0.004), ("d", 0.001)]
+        ]
+        baseline = {name: dict(median=0.010) for name in "abc"}
+
+        comparison = compare(results, baseline, threshold=2.0)
+
+        assert [row["status"] for row in comparison] == ["ok", "regression", "improved", "new"]
+        assert "regression" in format_report(comparison)
+
+    def test_baseline_round_trip(self, tmp_path):
+        results = run_benchmarks(["get_total_rows"], repeat=2)
+        path = str(tmp_path / "baseline.json")
+        save_baseline(results, path)
+
+        assert load_baseline(path)["get_total_rows"]["median"] == results[0]["median"]
+        assert load_baseline(str(tmp_path / "missing.json")) == {}
@@ -0,0 +1,94 @@
+import array
+import datetime
+import math
+
+import pytest
+
+from core.finviz.benchmarks import Fixtures
+from core.finviz.helper_functions.column_types import (HEADER_TYPES,
+                                                       convert_column,
+                                                       convert_snapshot,
+                                                       snapshot_converter,
+                                                       to_columns)
+from core.finviz.helper_functions.scraper_functions import stream_table
+from core.finviz.helper_functions.table_scanner import scan_headers
+from core.finviz.synthetic.pages import COLUMNS
+
+# Synthetic site column kinds and the column type their headers should map to
+KIND_TYPES = {
+    "no": "int", "cap": "scaled", "shares": "scaled", "ratio": "float", "pct": "percent",
+    "price": "float", "volume": "int", "recom": "float", "date": "date",
+}
+
+
+class TestConvertColumn:
+    """ Unit tests for the column converters """
+
+    def test_numbers(self):
+        assert list(convert_column("scaled", ["1.5K", "2.25B", "-", "3"])[:2]) == [1500.0, 2.25e9]
+        assert list(convert_column("percent", ["12.5%", "-3.10%"])) == [12.5, -3.1]
+        assert list(convert_column("percent", ["1,234.56%", "-2,001%", "7"])) == [1234.56, -2001.0, 7.0]
+        assert convert_column("int", ["1,234", "5"]) == array.array("q", [1234, 5])
+
+    def test_missing_and_malformed(self):
+        column = convert_column("int", ["1", "-", "abc", None])
+
+        assert column.typecode == "d"
+        assert column[0] == 1 and all(math.isnan(value) for value in column[1:])
+
+    def test_dates_and_text(self):
+        assert convert_column("date", ["12/15/2004", "Dec-15-24", "-"]) == [
+            datetime.date(2004, 12, 15), datetime.date(2024, 12, 15), None
+        ]
+        assert convert_column("str", ["AAPL", "-"]) == ["AAPL", None]
+        with pytest.raises(ValueError):
+            convert_column("complex", ["1"])
+
+
+class TestToColumns:
+    """ Typed columns of a full screener page """
+
+    def test_header_types_cover_the_custom_columns(self):
+        for _, name, kind in COLUMNS:
+            if kind in KIND_TYPES:
+                assert HEADER_TYPES[name] == KIND_TYPES[kind], name
+
+    def test_all_columns_page(self):
+        page = Fixtures().pages["screener_custom.html"]
+        headers = scan_headers(page)
+        rows = stream_table(page, headers)
+        columns = to_columns(headers, rows, {"Earnings": "str"})
+
+        assert list(columns) == headers
+        assert list(columns["No."]) == list(range(1, 21))
+        assert columns["Ticker"] == [row["Ticker"] for row in rows]
+        for header in ("Market Cap", "Perf Week", "Price", "Volume"):
+            assert len(columns[header]) == len(rows)
+            assert all(isinstance(value, (int, float)) for value in columns[header])
+        assert all(
+            value is None or isinstance(value, datetime.date) for value in columns["IPO Date"]
+        )
+
+
+class TestSnapshotValues:
+    """ Typed view of the quote snapshot """
+
+    def test_known_keys(self):
+        values = convert_snapshot({
+            "Market Cap": "3.45T", "Volume": "24,402,398", "Price": "1,234.50", "ROE": "12.5%",
+            "52W Range": "164.08 - 237.49", "Dividend TTM": "0.99 (0.43%)", "Option/Short": "Yes / No",
+            "Dividend Ex-Date": "Nov 08, 2024", "Earnings": "Oct 30 AMC", "P/E": "-", "Website": None,
+        })
+
+        assert values == {
+            "Market Cap": 3450000000000, "Volume": 24402398, "Price": 1234.5, "ROE": 0.125,
+            "52W Range": (164.08, 237.49), "Dividend TTM": (0.99, 0.0043), "Option/Short": (True, False),
+            "Dividend Ex-Date": datetime.date(2024, 11, 8), "Earnings": "Oct 30 AMC", "P/E": None,
+            "Website": None,
+        }
+
+    def test_unknown_keys_and_mismatches_are_guessed(self):
+        values = convert_snapshot({"New Ratio": "1.5", "New Pct": "-2%", "Book/sh": "9.46%", "Note": "n/a"})
+
+        assert values == {"New Ratio": 1.5, "New Pct": -0.02, "Book/sh": 0.0946, "Note": "n/a"}
+        assert snapshot_converter("Price") is snapshot_converter("Price")
@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+import pytest
+
+from core.finviz.helper_functions.error_handling import InvalidExportFormat
+from core.finviz.helper_functions.export_functions import export_format, export_rows
+from core.finviz.helper_functions.row_table import RowTable
+
+HEADERS = ["No.", "Ticker", "Market Cap", "Change", "IPO Date"]
+PAGES = [
+    RowTable(HEADERS, [["1", "AAPL", "3.45T", "1.20%", "12/12/1980"], ["2", "MSFT", "-", "-0.50%", "-"]]),
+    RowTable(HEADERS, [["3", "NVDA", "3.20T", "2.00%", "01/22/1999"]]),
+]
+
+
+class TestExportRows:
+    """ Unit tests for the streaming exporters """
+
+    def test_format_from_extension(self, tmp_path):
+        assert export_format(tmp_path / "screen.JSONL") == "ndjson"
+        assert export_format(io.StringIO(), "csv") == "csv"
+        with pytest.raises(InvalidExportFormat):
+            export_format("screen.xlsx")
+
+    def test_ndjson_is_typed(self, tmp_path):
+        path = tmp_path / "screen.ndjson"
+
+        assert export_rows(iter(PAGES), HEADERS, path) == 3
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert rows[0] == {
+            "No.": 1, "Ticker": "AAPL", "Market Cap": 3.45e12, "Change": 1.2, "IPO Date": "1980-12-12"
+        }
+        assert rows[1]["Market Cap"] is None and rows[1]["IPO Date"] is None
+        assert rows[2]["No."] == 3
+
+    def test_csv_as_text(self):
+        target = io.StringIO()
+
+        export_rows(PAGES, HEADERS, target, "csv", typed=False)
+        rows = list(csv.reader(io.StringIO(target.getvalue())))
+        assert rows[0] == HEADERS
+        assert rows[1:] == [list(row) for page in PAGES for row in page.tuples()]
+
+    def test_arrow_schema(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        path = tmp_path / "screen.arrow"
+
+        export_rows(PAGES, HEADERS, path, row_group_size=2)
+        table = pa.ipc.open_file(str(path)).read_all()
+        assert table.schema.field("Market Cap").type == pa.float64()
+        assert table.column("No.").to_pylist() == [1, 2, 3]
+        assert table.column("IPO Date").null_count == 1
@@ -0,0 +1,82 @@
+import datetime
+
+import pytest
+
+from core.finviz.benchmarks import Fixtures
+from core.finviz.benchmarks.suite import _news_time_texts, _strptime_news_timestamps
+from core.finviz.helper_functions.news_timestamps import (NewsTimestampDecoder,
+                                                          eastern_utc_offset,
+                                                          parse_clock, parse_day)
+
+TODAY = datetime.date.today()
+ROWS = [
+    "06:00AM",
+    "Dec-15-24 06:00AM",
+    "11:59PM",
+    "12:00AM",
+    "Today 12:30PM",
+    "01:05PM",
+    "Jan-02-99 09:15am",
+    "Feb-30-24 09:15AM",
+    "Dec-15-24",
+    "13:00PM",
+    "7:45AM",
+    "Xyz-01-24 01:00AM",
+    "",
+    "Dec-15-24  10:00AM",
+]
+
+
+class TestNewsTimestamps:
+    """ The decoder agrees with the strptime based decoding it replaces """
+
+    def test_matches_strptime(self):
+        decoder = NewsTimestampDecoder()
+        decoded = [decoder.text(text) for text in ROWS]
+
+        assert [text for text in decoded if text is not None] == _strptime_news_timestamps(ROWS)
+        assert decoded[0] == f"{TODAY.isoformat()} 06:00"
+        assert decoded[2] == "2024-12-15 23:59" and decoded[3] == "2024-12-15 00:00"
+        assert decoded[5] == f"{TODAY.isoformat()} 13:05"
+        assert decoded[7] is None and decoded[9] is None
+
+    def test_fixture_news(self):
+        texts = _news_time_texts(Fixtures())
+        decoder = NewsTimestampDecoder()
+
+        assert [decoder.text(text) for text in texts] == _strptime_news_timestamps(texts)
+
+    def test_datetime_and_epoch(self):
+        decoder = NewsTimestampDecoder(today=datetime.date(2024, 12, 16))
+
+        assert decoder.datetime("Today 06:00AM") == datetime.datetime(2024, 12, 16, 6, 0)
+        assert decoder.epoch("Dec-15-24 06:00PM") == int(
+            datetime.datetime(2024, 12, 15, 23, tzinfo=datetime.timezone.utc).timestamp()
+        )
+        assert NewsTimestampDecoder().epoch("Jul-04-24 09:30AM") == int(
+            datetime.datetime(2024, 7, 4, 13, 30, tzinfo=datetime.timezone.utc).timestamp()
+        )
+        assert decoder.datetime("07:30PM") == datetime.datetime(2024, 12, 15, 19, 30)
+
+    def test_eastern_offset_matches_zoneinfo(self):
+        zoneinfo = pytest.importorskip("zoneinfo")
+        try:
+            eastern = zoneinfo.ZoneInfo("America/New_York")
+        except zoneinfo.ZoneInfoNotFoundError:
+            pytest.skip("No time zone database")
+
+        day = datetime.date(2019, 1, 1)
+        while day.year < 2027:
+            for hour in (0, 1, 2, 3, 12):
+                wall = datetime.datetime(day.year, day.month, day.day, hour, tzinfo=eastern)
+                assert eastern_utc_offset(day, hour) == wall.utcoffset().total_seconds(), wall
+            day += datetime.timedelta(days=1)
+
+    @pytest.mark.parametrize("text", ["00:30AM", "12:60PM", "1230PM", "12:30XM"])
+    def test_malformed_clock(self, text):
+        assert parse_clock(text) is None
+
+    def test_days(self):
+        assert parse_day("dec-15-68") == datetime.date(2068, 12, 15)
+        assert parse_day("Dec-15-69") == datetime.date(1969, 12, 15)
+        assert parse_day("Dec-15-2024") is None
@@ -0,0 +1,40 @@
+import pytest
+from lxml import html
+
+from core.finviz.helper_functions import page_selectors
+from core.finviz.helper_functions.page_selectors import (get_layout,
+                                                         register_layout,
+                                                         set_layout)
+
+
+class TestPageSelectors:
+    """ Unit tests for the selector registry """
+
+    @pytest.mark.parametrize("page", ["quote", "screener", "news", "crypto"])
+    def test_every_selector_compiles(self, page):
+        layout = get_layout(page).compile_all()
+
+        for name in layout.selectors:
+            assert callable(getattr(layout, name))
+
+    def test_selectors_compile_once(self):
+        layout = get_layout("screener")
+
+        assert layout.rows is layout.rows
+        with pytest.raises(AttributeError):
+            layout.no_such_selector
+
+    def test_versions(self, monkeypatch):
+        monkeypatch.setattr(page_selectors, "_LAYOUTS", {"screener": {}})
+        monkeypatch.setattr(page_selectors, "_CURRENT", {})
+        register_layout("screener", "old", {"rows": 'tr[valign="top"]'})
+        register_layout("screener", "new", {"rows": "tr.styled-row"}, current=False)
+        page = html.fromstring(
+            '<table><tr valign="top"><td>1</td></tr><tr class="styled-row"><td>2</td></tr></table>'
+        )
+
+        assert get_layout("screener").rows(page)[0].text_content() == "1"
+        assert set_layout("screener", "new") == "old"
+        assert get_layout("screener").rows(page)[0].text_content() == "2"
+        with pytest.raises(ValueError):
+            set_layout("screener", "missing")
@@ -0,0 +1,253 @@
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from core.finviz import stock_data
+from core.finviz.benchmarks import Fixtures
+from core.finviz.benchmarks.suite import offline
+from core.finviz.config import connection_settings
+from core.finviz.finviz_service import FinVizService
+from core.finviz.helper_functions.error_handling import InvalidTicker
+from core.finviz.helper_functions.page_selectors import get_layout
+from core.finviz.helper_functions.quote_cache import (QuoteCache, approximate_size,
+                                                      get_quote_cache,
+                                                      reset_quote_cache)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQuoteCache:
+    """ Unit tests for the bounded quote page cache """
+
+    def test_lru_entry_limit(self):
+        cache = QuoteCache(max_entries=2)
+        cache.set("A", 1)
+        cache.set("B", 2)
+        cache.get("A")
+        cache.set("C", 3)
+
+        assert "A" in cache and "C" in cache and "B" not in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_byte_budget(self):
+        cache = QuoteCache(max_bytes=100)
+        cache.set("A", "a", 60)
+        cache.set("B", "b", 30)
+        cache.set("A", "a", 50)
+        cache.set("C", "c", 40)
+
+        assert cache.get("B") is None and cache.get("A") == "a"
+        assert cache.stats()["bytes"] == 90
+
+    def test_ttl_and_invalidation(self):
+        clock = FakeClock()
+        cache = QuoteCache(ttl=60, clock=clock)
+        cache.set("A", 1)
+        cache.set("B", 2)
+
+        clock.now = 59
+        assert cache.get("A") == 1
+        assert cache.invalidate("B") and not cache.invalidate("B")
+        clock.now = 60
+        assert cache.get("A") is None
+        assert cache.stats() == dict(entries=0, bytes=0, hits=1, misses=1, evictions=0, expirations=1,
+                                     loads=0, coalesced=0)
+
+    def test_concurrent_loads_are_coalesced(self):
+        cache = QuoteCache()
+        started, release = threading.Event(), threading.Event()
+        loads = []
+
+        def load():
+            loads.append(1)
+            started.set()
+            release.wait(5)
+            return "page", 10
+
+        with ThreadPoolExecutor(8) as pool:
+            first = pool.submit(cache.get_or_load, "A", load)
+            started.wait(5)
+            others = [pool.submit(cache.get_or_load, "A", load) for _ in range(7)]
+            release.set()
+            values = [first.result()] + [future.result() for future in others]
+
+        assert values == ["page"] * 8 and len(loads) == 1
+        assert cache.get_or_load("A", load) == "page" and len(loads) == 1
+        stats = cache.stats()
+        assert stats["loads"] == 1 and stats["coalesced"] == 7
+
+    def test_failed_load_is_not_stored(self):
+        cache = QuoteCache()
+
+        def load():
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            cache.get_or_load("A", load)
+        assert "A" not in cache and cache.get_or_load("A", lambda: ("page", 1)) == "page"
+
+    def test_approximate_size(self):
+        assert approximate_size({"a": ["bc", ("d",)]}) > approximate_size({"a": []})
+
+
+@pytest.fixture
+def quote_store(monkeypatch, request):
+    monkeypatch.setitem(connection_settings, "QUOTE_CACHE_STORE", request.param)
+    reset_quote_cache()
+    with offline(Fixtures()):
+        yield request.param
+    reset_quote_cache()
+
+
+@pytest.mark.parametrize("quote_store", ["tree", "compressed", "sections"], indirect=True)
+def test_stores_read_alike(quote_store):
+    stock = stock_data.get_stock("AAPL")
+    news = stock_data.get_news("AAPL")
+    cache = get_quote_cache()
+
+    assert cache.store == quote_store and len(cache) == 1
+    assert stock["Ticker"] == "AAPL" and news
+    assert stock_data.get_insider("AAPL") and stock_data.get_analyst_price_targets("AAPL")
+    assert cache.stats()["misses"] == 1
+
+    stock["Price"] = "changed"
+    assert stock_data.get_stock("AAPL") != stock
+    assert stock_data.invalidate_quote("AAPL") and len(cache) == 0
+
+
+@pytest.mark.parametrize("quote_store", ["tree", "compressed"], indirect=True)
+def test_quote_sections_are_lazy(quote_store, monkeypatch):
+    extracted = []
+    for name, extract in list(stock_data.QUOTE_SECTIONS.items()):
+        monkeypatch.setitem(
+            stock_data.QUOTE_SECTIONS,
+            name,
+            lambda page, name=name, extract=extract: extracted.append(name) or extract(page),
+        )
+
+    quote = stock_data.get_quote("AAPL")
+    assert quote["Price"] == quote.get("Price") and quote.get("Nope") is None
+    assert extracted == ["table"]
+
+    assert quote["Ticker"] == "AAPL" and quote.news is quote.news
+    assert extracted == ["table", "header", "news"]
+    assert stock_data.get_stock(quote) == stock_data.get_stock("AAPL")
+
+
+@pytest.mark.parametrize("quote_store", ["tree"], indirect=True)
+def test_stock_analysis_reads_the_cache_once(quote_store):
+    analysis = FinVizService().get_stock_analysis("AAPL")
+
+    assert analysis["stock"]["Ticker"] == "AAPL" and analysis["summary"]["news_count"]
+    assert get_quote_cache().stats()["misses"] + get_quote_cache().stats()["hits"] == 1
+
+
+def test_field_projection_reads_cells(monkeypatch):
+    monkeypatch.setattr(stock_data, "_TABLE_POSITIONS", {})
+    tree = Fixtures().tree("quote.html")
+    full = stock_data._snapshot_values(tree)
+    fields = ["Price", "Volatility (Month)", "EPS growth next Y", "Ticker", "Nope"]
+
+    expected = {key: full.get(key) for key in fields}
+    assert stock_data.QuoteSnapshot("AAPL", tree, "tree").select(fields) == expected
+    assert stock_data.QuoteSnapshot("AAPL", tree, "tree").select(full) == full
+    assert stock_data._TABLE_POSITIONS
+
+    # A page whose cells moved falls back to the full walk
+    rows = get_layout("quote").snapshot_rows(tree)
+    rows[0].getparent().remove(rows[0])
+    moved = stock_data._snapshot_values(tree)
+    assert stock_data.QuoteSnapshot("AAPL", tree, "tree").select(["P/E", "Price"]) == {
+        "P/E": moved.get("P/E"), "Price": moved["Price"]
+    }
+
+
+def test_position_maps_follow_the_table_shape(monkeypatch):
+    monkeypatch.setattr(stock_data, "_TABLE_POSITIONS", {})
+    full_walks = []
+    table_values = stock_data._table_values
+    monkeypatch.setattr(
+        stock_data, "_table_values", lambda page: full_walks.append(1) or table_values(page)
+    )
+    fields = ["Price", "P/E", "Nope"]
+
+    # A sparse page seen first only maps its own shape
+    sparse = Fixtures().tree("quote.html")
+    rows = get_layout("quote").snapshot_rows(sparse)
+    rows[0].getparent().remove(rows[0])
+    stock_data.QuoteSnapshot("ETF", sparse, "tree").select(fields)
+
+    full = table_values(Fixtures().tree("quote.html"))
+    for _ in range(3):
+        quote = stock_data.QuoteSnapshot("AAPL", Fixtures().tree("quote.html"), "tree")
+        assert quote.select(fields) == {"Price": full["Price"], "P/E": full["P/E"], "Nope": None}
+    assert len(full_walks) == 2 and len(stock_data._TABLE_POSITIONS) == 2
+
+    # A page whose labels moved within the same shape is walked and relearned
+    moved = Fixtures().tree("quote.html")
+    cells = get_layout("quote").snapshot_rows(moved)[0]
+    cells.insert(0, cells[2])  # Index, value, P/E, value -> P/E, value, Index, value
+    cells.insert(1, cells[3])
+    assert len(cells) == 12
+    expected = {key: table_values(moved).get(key) for key in fields}
+    assert stock_data.QuoteSnapshot("AAPL", moved, "tree").select(fields) == expected
+    assert stock_data.QuoteSnapshot("AAPL", moved, "tree").select(fields) == expected
+    assert len(full_walks) == 3
+
+
+@pytest.mark.parametrize("quote_store", ["tree", "sections"], indirect=True)
+def test_get_stock_fields(quote_store):
+    fields = ["Price", "Market Cap", "Company"]
+    stock = stock_data.get_stock("AAPL")
+
+    assert stock_data.get_stock("AAPL", fields=fields) == {key: stock[key] for key in fields}
+    typed = FinVizService().get_stock("AAPL", typed=True, fields=["Market Cap"])
+    assert typed == {"Market Cap": stock_data.get_stock("AAPL", typed=True)["Market Cap"]}
+
+
+@pytest.mark.parametrize("quote_store", ["tree", "sections"], indirect=True)
+def test_failed_sections_keep_no_exception(quote_store, monkeypatch):
+    def fail(page):
+        raise InvalidTicker("AAPL")
+
+    monkeypatch.setitem(stock_data.QUOTE_SECTIONS, "ratings", fail)
+    quote = stock_data.get_quote("AAPL")
+    errors = []
+    for _ in range(2):
+        with pytest.raises(InvalidTicker) as raised:
+            quote.ratings
+        errors.append(raised.value)
+
+    stored = quote._sections["ratings"]
+    if quote_store == "sections":
+        assert get_quote_cache().get("AAPL")["ratings"] == stored
+    assert not isinstance(stored, BaseException) and pickle.loads(pickle.dumps(stored)) == stored
+    assert errors[0] is not errors[1] and str(errors[0]) == str(InvalidTicker("AAPL"))
+    assert "error" in stock_data.get_analyst_price_targets("AAPL")[0]
+
+
+@pytest.mark.parametrize("quote_store", ["tree", "sections"], indirect=True)
+def test_failed_sections_keep_exception_attributes(quote_store, monkeypatch):
+    response = requests.Response()
+    response.status_code = 503
+
+    def fail(page):
+        raise requests.HTTPError("503 Server Error", response=response)
+
+    monkeypatch.setitem(stock_data.QUOTE_SECTIONS, "ratings", fail)
+    quote = stock_data.get_quote("AAPL")
+    with pytest.raises(requests.HTTPError) as raised:
+        quote.ratings
+
+    assert raised.value.response is response
+    assert str(raised.value) == "503 Server Error"
+
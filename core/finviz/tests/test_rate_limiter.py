@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+from core.finviz.helper_functions.rate_limiter import TokenBucket
+
+
+class TestTokenBucket:
+    """ Unit tests for the shared token bucket """
+
+    def test_burst_is_served_immediately(self):
+        bucket = TokenBucket(rate=1, burst=3)
+
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve() > 0.9
+
+    def test_fill_level_and_wait_time(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        assert bucket.fill_level == 2
+        assert bucket.wait_time == 0
+
+        bucket.reserve()
+        bucket.reserve()
+        assert bucket.fill_level < 1
+        assert 0 < bucket.wait_time <= 0.1
+
+    def test_drain_empties_the_bucket(self):
+        bucket = TokenBucket(rate=10, burst=5)
+        bucket.drain()
+        assert bucket.fill_level < 1
+
+    def test_disabled_bucket_never_waits(self):
+        bucket = TokenBucket(rate=None, burst=1)
+        assert all(bucket.reserve() == 0 for _ in range(100))
+        assert bucket.wait_time == 0
+
+    def test_async_acquire_is_paced(self):
+        bucket = TokenBucket(rate=50, burst=1)
+
+        async def acquire_all():
+            await asyncio.gather(*[bucket.acquire_async() for _ in range(6)])
+
+        start = time.monotonic()
+        asyncio.run(acquire_all())
+        assert time.monotonic() - start >= 0.09
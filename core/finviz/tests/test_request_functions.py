@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+import pytest
+import tenacity
+
+from core.finviz.helper_functions import request_functions, response_cache
+from core.finviz.helper_functions.error_handling import TooManyRequests
+from core.finviz.helper_functions.request_functions import Connector
+from core.finviz.tests.conftest import PageHandler
+
+
+@pytest.fixture
+def local_url(serve):
+    request_functions.close_session()
+    yield serve()
+    request_functions.close_session()
+
+
+class TestSharedSession:
+    """ Unit tests for the pooled keep-alive session """
+
+    def test_connections_are_reused(self, local_url):
+        """ Consecutive requests to the same host share one kept-alive connection. """
+        for _ in range(5):
+            page, _ = request_functions.http_request_get(local_url, parse=False)
+            assert "ok" in page
+
+        stats = request_functions.session_stats()
+        assert stats["requests"] == 5
+        assert stats["connections"] == 1
+        assert stats["reused"] == 4
+
+    def test_close_session_resets_pool(self, local_url):
+        """ Closing the session drops the pool and its statistics. """
+        request_functions.finviz_request(local_url, "test-agent")
+        assert request_functions.session_stats()["requests"] == 1
+
+        request_functions.close_session()
+        assert request_functions.session_stats()["requests"] == 0
+
+
+class _ThrottlingHandler(PageHandler):
+    throttled = 0
+
+    def do_GET(self):
+        if type(self).throttled > 0:
+            type(self).throttled -= 1
+            self.send_body(b"Too many requests.")
+        else:
+            super().do_GET()
+
+
+@pytest.fixture
+def throttling_url(serve, monkeypatch):
+    monkeypatch.setattr(request_functions._finviz_request.retry, "wait", tenacity.wait_none())
+    return serve(_ThrottlingHandler)
+
+
+class TestThrottleRetries:
+    """ Unit tests for the bounded retries on throttle responses """
+
+    def test_throttled_request_is_retried(self, throttling_url):
+        """ A request throttled fewer times than MAX_RETRIES eventually succeeds. """
+        _ThrottlingHandler.throttled = 2
+
+        response = request_functions.finviz_request(throttling_url, "test-agent")
+        assert response.text.startswith("<html>")
+        assert _ThrottlingHandler.throttled == 0
+
+    def test_retries_stop_after_max_attempts(self, throttling_url, monkeypatch):
+        """ Retries give up with TooManyRequests instead of spinning forever. """
+        monkeypatch.setitem(request_functions.connection_settings, "MAX_RETRIES", 2)
+        _ThrottlingHandler.throttled = 10
+
+        with pytest.raises(TooManyRequests):
+            request_functions.finviz_request(throttling_url, "test-agent")
+        assert _ThrottlingHandler.throttled == 8
+
+
+class _DelayedHandler(PageHandler):
+    def do_GET(self):
+        delay = float(self.path.rsplit("=", 1)[1])
+        time.sleep(delay)
+        self.send_body(str(delay).encode())
+
+
+@pytest.fixture
+def delayed_urls(serve):
+    base = serve(_DelayedHandler) + "?delay="
+    return [base + delay for delay in ("0.3", "0.0", "0.1")]
+
+
+class TestConnectorStreaming:
+    """ Unit tests for the bounded-concurrency streaming Connector """
+
+    def test_ordered_stream_keeps_url_order(self, delayed_urls):
+        connector = Connector(bytes.decode, delayed_urls, "test-agent")
+        assert list(connector.iter_connector()) == ["0.3", "0.0", "0.1"]
+
+    def test_unordered_stream_yields_in_completion_order(self, delayed_urls):
+        connector = Connector(bytes.decode, delayed_urls, "test-agent")
+        assert list(connector.iter_connector(ordered=False)) == ["0.0", "0.1", "0.3"]
+
+    def test_concurrency_window_is_respected(self, delayed_urls):
+        connector = Connector(bytes.decode, delayed_urls, "test-agent")
+        assert list(connector.iter_connector(ordered=False, concurrency=1)) == [
+            "0.3",
+            "0.0",
+            "0.1",
+        ]
+
+    def test_run_connector_returns_all_pages(self, delayed_urls):
+        connector = Connector(bytes.decode, delayed_urls, "test-agent")
+        assert connector.run_connector() == ["0.3", "0.0", "0.1"]
+
+    def test_run_async_reuses_session_on_callers_loop(self, delayed_urls):
+        async def scrape_twice():
+            first = await Connector(bytes.decode, delayed_urls, "test-agent").run_async()
+            session = await request_functions.get_async_session()
+            second = await Connector(bytes.decode, delayed_urls, "test-agent").run_async()
+            assert session is await request_functions.get_async_session()
+            await request_functions.close_async_session()
+            assert session.closed
+            return first + second
+
+        assert asyncio.run(scrape_twice()) == ["0.3", "0.0", "0.1"] * 2
+
+    def test_async_session_closes_with_its_loop(self, delayed_urls):
+        async def scrape():
+            await Connector(bytes.decode, delayed_urls, "test-agent").run_async()
+            return asyncio.get_running_loop(), await request_functions.get_async_session()
+
+        loop, session = asyncio.run(scrape())
+
+        assert session.closed
+        assert loop not in request_functions._ASYNC_SESSIONS
+
+
+def _response_text(response, **kwargs):
+    return response.text
+
+
+class TestParseExecutors:
+    """ Unit tests for the pluggable parse stage """
+
+    @pytest.mark.parametrize("parse_executor", [None, "thread", "process"])
+    def test_connector_parse_executors(self, delayed_urls, parse_executor):
+        connector = Connector(
+            bytes.decode, delayed_urls, "test-agent", parse_executor=parse_executor
+        )
+        assert connector.run_connector() == ["0.3", "0.0", "0.1"]
+
+    @pytest.mark.parametrize("parse_executor", [None, "thread", "process"])
+    def test_sequential_scrape_keeps_url_order(self, delayed_urls, parse_executor):
+        pages = request_functions.sequential_data_scrape(
+            _response_text, delayed_urls, "test-agent", parse_executor=parse_executor
+        )
+        assert pages == ["0.3", "0.0", "0.1"]
+
+    def test_invalid_parse_executor(self):
+        with pytest.raises(ValueError):
+            request_functions.get_parse_executor("fibers")
+
+
+class TestResponseCacheIntegration:
+    """ Unit tests for serving http_request_get from the on-disk cache """
+
+    def test_second_request_is_served_from_cache(self, local_url, tmp_path, monkeypatch):
+        monkeypatch.setitem(request_functions.connection_settings, "RESPONSE_CACHE", True)
+        monkeypatch.setitem(request_functions.connection_settings, "RESPONSE_CACHE_DIR", str(tmp_path))
+        response_cache.reset_response_cache()
+        try:
+            for _ in range(3):
+                page, _ = request_functions.http_request_get(
+                    local_url + "quote.ashx", payload={"t": "AAPL"}, parse=False
+                )
+                assert "ok" in page
+            request_functions.http_request_get(
+                local_url + "quote.ashx", payload={"t": "AAPL"}, use_cache=False
+            )
+
+            assert request_functions.session_stats()["requests"] == 2
+            assert response_cache.get_response_cache().stats()["hits"] == 2
+        finally:
+            response_cache.reset_response_cache()
@@ -0,0 +1,60 @@
+import os
+import time
+
+import pytest
+
+from core.finviz.helper_functions.response_cache import ResponseCache
+from core.finviz.helper_functions.transport import canonical_url
+
+TTLS = {"quote.ashx": 60, "screener.ashx": 60, "screener.ashx?ft=4": 86400}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"), 10 * 1024, TTLS)
+    yield cache
+    cache.close()
+
+
+class TestResponseCache:
+    """ Unit tests for the on-disk response cache """
+
+    def test_canonical_url_merges_and_sorts_parameters(self):
+        assert canonical_url("https://FinViz.com/quote.ashx?t=AAPL", {"p": "d"}) == canonical_url(
+            "https://finviz.com/quote.ashx", {"p": "d", "t": "AAPL"}
+        )
+
+    def test_most_specific_ttl_rule_wins(self, cache):
+        assert cache.ttl_for(canonical_url("https://finviz.com/screener.ashx", {"ft": 4})) == 86400
+        assert cache.ttl_for(canonical_url("https://finviz.com/screener.ashx", {"v": 111})) == 60
+        assert cache.ttl_for(canonical_url("https://finviz.com/news.ashx")) is None
+
+    def test_round_trip(self, cache):
+        cache.set("https://finviz.com/quote.ashx", {"t": "AAPL"}, "final", 200, b"<html/>", "utf-8")
+
+        cached = cache.get("https://finviz.com/quote.ashx?t=AAPL")
+        assert cached.text == "<html/>"
+        assert cached.url == "final"
+        assert cache.stats()["hits"] == 1
+
+    def test_uncached_endpoint_and_expired_entries(self, cache, monkeypatch):
+        cache.set("https://finviz.com/news.ashx", None, "final", 200, b"news")
+        assert cache.get("https://finviz.com/news.ashx") is None
+
+        cache.set("https://finviz.com/quote.ashx", {"t": "AAPL"}, "final", 200, b"quote")
+        monkeypatch.setattr(time, "time", lambda: 1e12)
+        assert cache.get("https://finviz.com/quote.ashx", {"t": "AAPL"}) is None
+
+    def test_least_recently_used_entries_are_evicted(self, cache):
+        for ticker in ("A", "B", "C"):
+            cache.set("https://finviz.com/quote.ashx", {"t": ticker}, "", 200, os.urandom(4096))
+            cache.get("https://finviz.com/quote.ashx", {"t": "A"})
+
+        assert cache.get("https://finviz.com/quote.ashx", {"t": "A"}) is not None
+        assert cache.get("https://finviz.com/quote.ashx", {"t": "B"}) is None
+        assert cache.stats()["bytes"] <= 10 * 1024
+
+    def test_invalidate(self, cache):
+        cache.set("https://finviz.com/quote.ashx", {"t": "AAPL"}, "", 200, b"quote")
+        cache.invalidate("https://finviz.com/quote.ashx", {"t": "AAPL"})
+        assert cache.get("https://finviz.com/quote.ashx", {"t": "AAPL"}) is None
@@ -0,0 +1,55 @@
+import pytest
+
+from core.finviz.helper_functions.row_table import Row, RowTable
+
+HEADERS = ["No.", "Ticker", "Sector"]
+ROWS = [["1", "AAPL", "Technology"], ["2", "MSFT", "Technology"], ["3", "XOM", "Energy"]]
+
+
+class TestRowTable:
+    """ Unit tests for the shared-header row storage """
+
+    def test_reads_like_dicts(self):
+        table = RowTable(HEADERS, ROWS)
+        expected = [dict(zip(HEADERS, row)) for row in ROWS]
+
+        assert table == expected and expected == table
+        assert table[1]["Ticker"] == "MSFT" and table[-1].get("Sector") == "Energy"
+        assert list(table[0]) == HEADERS and dict(table[0].items()) == expected[0]
+        assert table[1:] == expected[1:] and isinstance(table[1:], RowTable)
+        assert table.to_dicts() == expected
+        with pytest.raises(KeyError):
+            table[0]["Price"]
+
+    def test_values_are_shared(self):
+        table = RowTable(HEADERS, [list(row) for row in ROWS])
+        table.append(["4", "NVDA", "".join(["Techno", "logy"])])
+
+        assert table[3]["Sector"] is table[0]["Sector"]
+        assert table.column("Sector") == ["Technology", "Technology", "Energy", "Technology"]
+
+    def test_ragged_rows_follow_zip(self):
+        table = RowTable(HEADERS, [["1", "AAPL"], ["2", "MSFT", "Technology", "extra"]])
+
+        assert table == [dict(zip(HEADERS, row)) for row in table.tuples()]
+        assert len(table[0]) == 2 and "Sector" not in table[0]
+        assert table[1] == {"No.": "2", "Ticker": "MSFT", "Sector": "Technology"}
+        assert table.column("Sector") == [None, "Technology"]
+
+    def test_extend_matches_headers(self):
+        table = RowTable(HEADERS, ROWS[:1])
+        table.extend(RowTable(HEADERS, ROWS[1:]))
+        table.extend(RowTable(["Ticker", "No."], [["IBM", "4"]]))
+
+        assert [row["Ticker"] for row in table] == ["AAPL", "MSFT", "XOM", "IBM"]
+        assert table[3] == Row({"No.": 0, "Ticker": 1, "Sector": 2}, ("4", "IBM", None))
+
+    def test_append_matches_dicts_by_header(self):
+        table = RowTable(HEADERS, ROWS[:1])
+        table.append({"Ticker": "IBM", "No.": "4"})
+        table.extend([{"Sector": "Energy", "Ticker": "XOM", "No.": "5"}])
+
+        assert table[1] == {"No.": "4", "Ticker": "IBM", "Sector": None}
+        assert table[2] == {"No.": "5", "Ticker": "XOM", "Sector": "Energy"}
+        with pytest.raises(TypeError):
+            table.append("IBM")
@@ -0,0 +1,101 @@
+import pytest
+from lxml import html
+
+from core.finviz.benchmarks import Fixtures
+from core.finviz.helper_functions.request_functions import is_throttled
+from core.finviz.helper_functions.scraper_functions import (get_table,
+                                                            get_total_rows,
+                                                            iter_table_rows,
+                                                            parse_page,
+                                                            stream_table)
+from core.finviz.helper_functions.transport import RawResponse
+
+LAYOUTS = [
+    '<div id="screener-total" class="count-text whitespace-nowrap">#1 / 8,123 Total</div>',
+    '<table><tr><td class="count-text">#1 / 8123 Total</td></tr></table>',
+    # Not matched by the raw fast path, found after parsing
+    '<div class="count-text whitespace-nowrap" id="screener-total">#1 / <b>8123</b> Total</div>',
+]
+
+
+class TestTotalRows:
+    """ Unit tests for the total row counter """
+
+    @pytest.mark.parametrize("layout", LAYOUTS)
+    def test_layouts(self, layout):
+        page = f"<html><body><p>Filters</p>{layout}</body></html>"
+
+        assert get_total_rows(page) == 8123
+        assert get_total_rows(page.encode()) == 8123
+        assert get_total_rows(html.fromstring(page)) == 8123
+
+    def test_missing_counter(self):
+        page = "<html><body><p>#1 / 5 Total</p></body></html>"
+
+        assert get_total_rows(page) == 0
+        assert get_total_rows(html.fromstring(page)) == 0
+
+    def test_raw_and_parsed_agree_on_fixture(self):
+        fixtures = Fixtures()
+        page = fixtures.pages["screener.html"]
+
+        assert get_total_rows(page) == get_total_rows(fixtures.tree("screener.html")) > 0
+
+
+class TestParsePage:
+    """ Unit tests for the single parse entry point """
+
+    PAGE = '<html><body><table><tr valign="top"><td>AAPL</td><td>$180 → $200</td></tr></table></body></html>'
+
+    def test_inputs_parse_alike(self):
+        raw = RawResponse("https://finviz.com/", 200, "utf-8", self.PAGE.encode())
+        tree = parse_page(self.PAGE)
+        expected = [{"Ticker": "AAPL", "Target": "$180 → $200"}]
+
+        assert parse_page(tree) is tree
+        for page in [tree, self.PAGE, self.PAGE.encode(), raw]:
+            assert get_table(page, ["Ticker", "Target"], rows=20) == expected
+
+    def test_bytes_in_declared_encoding(self):
+        raw = RawResponse("https://finviz.com/", 200, "cp1252", "<p>café</p>".encode("cp1252"))
+
+        assert parse_page(raw).text_content() == "café"
+
+    def test_throttle_sentinel(self):
+        assert is_throttled(b"Too many requests.")
+        assert is_throttled(b"Too many requests.\n")
+        assert not is_throttled(self.PAGE.encode())
+
+
+class TestStreamTable:
+    """ The streaming row parser agrees with the tree based one """
+
+    @pytest.mark.parametrize("name", ["screener.html", "screener_custom.html"])
+    def test_fixture_rows(self, name):
+        fixtures = Fixtures()
+        tree = fixtures.tree(name)
+        headers = [str(i) for i in range(80)]
+        expected = get_table(tree, headers, rows=20)
+
+        assert len(expected) == 20
+        for page in [fixtures.pages[name], fixtures.text(name), tree]:
+            assert stream_table(page, headers, rows=20) == expected
+        assert stream_table(fixtures.pages[name], headers, rows=3) == expected[:3]
+
+    def test_text_split_across_chunks_and_entities(self, monkeypatch):
+        monkeypatch.setattr("core.finviz.helper_functions.scraper_functions._STREAM_CHUNK_SIZE", 5)
+        page = (
+            '<table><tr valign="middle"><td>No.</td></tr>'
+            '<tr valign="top"><td><a>AT&amp;T</a> <!-- x --> Inc</td><td>1,234</td></tr>'
+            '<tr valign="top"><td>B</td><td>5</tr></table>'
+        ).encode()
+
+        assert list(iter_table_rows(page)) == list(iter_table_rows(parse_page(page)))
+        assert list(iter_table_rows(page, rows=1)) == [["AT&T", " ", " Inc", "1,234"]]
+
+    def test_row_limit_counts_from_page_url(self):
+        page = Fixtures().pages["screener.html"]
+        url = "https://finviz.com/screener.ashx?v=111&r=21"
+
+        assert len(stream_table(page, ["No."], rows=25, URL=url)) == 5
+        assert stream_table(page, ["No."], rows=20, URL=url) == []
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.finviz.helper_functions.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """ Unit tests for request coalescing """
+
+    def test_concurrent_threads_share_one_call(self):
+        flight = SingleFlight()
+        executions = []
+        results = []
+
+        def fetch():
+            executions.append(1)
+            time.sleep(0.2)
+            return object()
+
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("AAPL", fetch)))
+            for _ in range(5)
+        ]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+
+        assert len(executions) == 1
+        assert len(set(map(id, results))) == 1
+        assert flight.stats() == dict(calls=5, shared=4)
+
+    def test_exception_is_shared_and_not_remembered(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise KeyError("AAPL")
+
+        with pytest.raises(KeyError):
+            flight.do("AAPL", fail)
+        assert flight.do("AAPL", lambda: 1) == 1
+
+    def test_waiters_raise_their_own_copy(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        errors = []
+
+        def fail():
+            started.set()
+            time.sleep(0.1)
+            raise KeyError("AAPL")
+
+        def call():
+            try:
+                flight.do("AAPL", fail)
+            except KeyError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call)]
+        threads[0].start()
+        started.wait(5)
+        threads += [threading.Thread(target=call) for _ in range(3)]
+        [thread.start() for thread in threads[1:]]
+        [thread.join() for thread in threads]
+
+        assert len(errors) == 4 and len(set(map(id, errors))) == 4
+        leader = next(exc for exc in errors if exc.__cause__ is None)
+        assert all(exc.__cause__ is leader for exc in errors if exc is not leader)
+        assert all(exc.args == ("AAPL",) for exc in errors)
+
+    def test_concurrent_coroutines_share_one_call(self):
+        flight = SingleFlight()
+        executions = []
+
+        async def fetch(ticker):
+            executions.append(ticker)
+            await asyncio.sleep(0.05)
+            return ticker.lower()
+
+        async def fetch_all():
+            return await asyncio.gather(
+                *[flight.do_async(ticker, fetch, ticker) for ticker in ("AAPL", "AAPL", "AMD")]
+            )
+
+        assert asyncio.run(fetch_all()) == ["aapl", "aapl", "amd"]
+        assert sorted(executions) == ["AAPL", "AMD"]
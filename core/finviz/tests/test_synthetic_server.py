@@ -0,0 +1,203 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.finviz import screener, stock_data
+from core.finviz.config import connection_settings
+from core.finviz.helper_functions import request_functions
+from core.finviz.helper_functions.quote_cache import get_quote_cache, reset_quote_cache
+from core.finviz.screener import Screener
+from core.finviz.synthetic import SyntheticSite, running_server
+from core.finviz.tests.conftest import PageHandler
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """ Points every request at a small synthetic site. """
+    with running_server(seed=1, rows=500) as server:
+        monkeypatch.setitem(connection_settings, "BASE_URL", server.base_url)
+        reset_quote_cache()
+        yield server
+    reset_quote_cache()
+
+
+class TestSyntheticSite:
+    """ Unit tests for the generated pages """
+
+    def test_pages_are_deterministic(self):
+        params = {"v": "111", "f": "sec_technology", "o": "-price", "r": "21"}
+
+        assert SyntheticSite(5, 300).screener_page(params) == SyntheticSite(5, 300).screener_page(params)
+        assert SyntheticSite(5, 300).quote_page("AB") == SyntheticSite(5, 300).quote_page("AB")
+        assert SyntheticSite(5, 300).quote_page("AB") != SyntheticSite(6, 300).quote_page("AB")
+
+    def test_screen_honours_order(self):
+        site = SyntheticSite(2, 300)
+        prices = [site.cell(i, 65)[0] for i in site.screen([], [], "-price")]
+
+        assert len(prices) == 300
+        assert prices == sorted(prices, reverse=True)
+
+
+class TestSyntheticServer:
+    """ Integration tests running the scrapers against the stand-in server """
+
+    def test_screener_pagination_and_total(self, server):
+        stocks = Screener(filters=["sec_technology"], table="Performance")
+        total = len(server.site.screen([], ["sec_technology"], ""))
+
+        assert total > 20
+        assert len(stocks) == total
+        assert stocks.headers[:2] == ["No.", "Ticker"]
+        assert [int(row["No."]) for row in stocks] == list(range(1, total + 1))
+
+    @pytest.mark.parametrize("parse_executor", [None, "thread"])
+    def test_async_screener_matches_sequential(self, server, parse_executor):
+        sequential = Screener(filters=["sec_technology"], table="Valuation")
+        concurrent = Screener(
+            filters=["sec_technology"],
+            table="Valuation",
+            request_method="async",
+            parse_executor=parse_executor,
+        )
+
+        assert concurrent.data == sequential.data
+
+    def test_fast_scan_matches_lxml(self, server):
+        custom = [str(c) for c in range(71)]
+        expected = Screener(filters=["sec_technology"], custom=custom, rows=30)
+
+        assert Screener(filters=["sec_technology"], custom=custom, rows=30, fast_scan=True).data == expected.data
+
+    @pytest.mark.parametrize("request_method", ["sequential", "async"])
+    def test_streamed_pages_match_tree_pages(self, server, request_method):
+        stocks = Screener(filters=["sec_technology"], rows=30, request_method=request_method, lazy=True)
+        pages = list(stocks.iter_pages())
+
+        assert [len(page) for page in pages] == [20, 10]
+        assert pages == list(stocks.iter_pages(stream=True))
+
+    def test_screener_custom_columns(self, server):
+        stocks = Screener(table="Custom", custom=["1", "65"], order="-price", rows=20)
+        prices = [float(row["Price"]) for row in stocks]
+
+        assert stocks.headers == ["No.", "Ticker", "Price"]
+        assert prices == sorted(prices, reverse=True)
+
+    def test_rows_share_headers(self, server):
+        stocks = Screener(filters=["sec_technology"], rows=25)
+        result = screener.get_screener_data(filters=["sec_technology"], table="Overview", rows=25)
+
+        assert stocks.data.headers == tuple(stocks.headers)
+        assert result["data"] == stocks.data.to_dicts() == stocks.data
+        assert all(type(row) is dict for row in result["data"])
+        assert str(stocks).count(stocks[0]["Ticker"]) >= 1
+
+    def test_lazy_export_streams_pages(self, server, tmp_path):
+        path = tmp_path / "screen.ndjson"
+        stocks = Screener(filters=["sec_technology"], table="Valuation", lazy=True)
+        expected = Screener(filters=["sec_technology"], table="Valuation")
+
+        assert stocks.export(path, typed=False) == len(expected.data)
+        assert not stocks.data
+        lines = path.read_text().splitlines()
+        assert [json.loads(line) for line in lines] == expected.data
+
+        result = screener.get_screener_data(
+            filters=["sec_technology"], table="Valuation", export_path=str(tmp_path / "screen.csv")
+        )
+        assert result["total_rows"] == len(expected.data) and result["export_format"] == "csv"
+
+    @pytest.mark.parametrize("request_method", ["sequential", "async"])
+    def test_row_limit_spans_pages(self, server, request_method):
+        stocks = Screener(filters=["sec_technology"], rows=25, request_method=request_method)
+
+        assert [int(row["No."]) for row in stocks] == list(range(1, 26))
+
+    def test_quote_pages(self, server):
+        stock = stock_data.get_stock("AAPL")
+
+        assert stock["Ticker"] == "AAPL"
+        assert "P/E" in stock and "Market Cap" in stock
+        assert stock_data.get_news("AAPL")
+        assert stock_data.get_insider("AAPL")
+        assert stock_data.get_analyst_price_targets("AAPL")
+
+    def test_quote_pages_are_cached(self, server):
+        stock_data.get_stock("NVDA")
+        stock_data.get_news("NVDA")
+        requests = server.requests
+
+        stock_data.invalidate_quote("NVDA")
+        stock_data.get_insider("NVDA")
+        assert server.requests == requests + 1
+
+    def test_concurrent_quote_reads_fetch_once(self, server):
+        requests = server.requests
+        readers = [stock_data.get_stock, stock_data.get_news, stock_data.get_insider] * 4
+        with ThreadPoolExecutor(len(readers)) as pool:
+            results = list(pool.map(lambda read: read("AMD"), readers))
+
+        assert all(results) and server.requests == requests + 1
+        stats = get_quote_cache().stats()
+        assert stats["loads"] == 1 and stats["hits"] + stats["coalesced"] == len(readers) - 1
+
+    def test_batch_quotes(self, server):
+        cached = stock_data.get_stock("AAPL")
+        requests = server.requests
+
+        stocks = stock_data.get_stocks(["MSFT", "AAPL", "NO-SUCH", "NVDA", "MSFT"], concurrency=2)
+
+        assert list(stocks) == ["MSFT", "AAPL", "NO-SUCH", "NVDA"]
+        assert server.requests == requests + 3
+        assert stocks["AAPL"] == cached
+        assert stocks["NVDA"] == stock_data.get_stock("NVDA")
+        assert "error" in stocks["NO-SUCH"]
+
+        projected = stock_data.get_stocks(["AAPL", "MSFT"], fields=["Price", "Nope"], typed=True)
+        assert projected["MSFT"] == {"Price": float(stocks["MSFT"]["Price"]), "Nope": None}
+
+    def test_batch_quotes_report_http_errors(self, serve, monkeypatch):
+        class UnavailableHandler(PageHandler):
+            def do_GET(self):
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        monkeypatch.setitem(connection_settings, "BASE_URL", serve(UnavailableHandler).rstrip("/"))
+        reset_quote_cache()
+
+        stocks = stock_data.get_stocks(["MSFT", "AAPL"])
+
+        assert all("503 Server Error" in stock["error"] for stock in stocks.values())
+        assert not any("Unable to find" in stock["error"] for stock in stocks.values())
+
+    def test_typed_quote(self, server):
+        raw = stock_data.get_stock("MSFT")
+        typed = stock_data.get_stock("MSFT", typed=True)
+
+        assert typed.keys() == raw.keys()
+        assert typed["Price"] == float(raw["Price"])
+        assert isinstance(typed["Market Cap"], int)
+        assert typed["Change"] == pytest.approx(float(raw["Change"].rstrip("%")) / 100)
+
+    def test_throttled_responses_are_retried(self, server, monkeypatch):
+        server.throttle_rate = 0.5
+        monkeypatch.setattr(request_functions._http_request_get.retry, "wait", lambda _: 0)
+
+        for ticker in ["A", "B", "C", "D"]:
+            assert stock_data.get_stock(ticker)["Ticker"] == ticker
+        assert server.throttled > 0
+
+    def test_screener_count(self, server):
+        total = len(server.site.screen([], ["sec_technology"], ""))
+
+        assert screener.get_screener_count(["sec_technology"]) == {"total_rows": total}
+
+    def test_typed_columns(self, server):
+        stocks = Screener(filters=["sec_technology"], table="Overview")
+        columns = stocks.to_columns()
+
+        assert list(columns["No."]) == [int(row["No."]) for row in stocks.data]
+        assert list(columns["Price"]) == [float(row["Price"]) for row in stocks.data]
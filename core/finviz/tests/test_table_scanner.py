@@ -0,0 +1,88 @@
+import pytest
+
+from core.finviz.benchmarks import Fixtures
+from core.finviz.helper_functions.page_selectors import get_layout
+from core.finviz.helper_functions.scraper_functions import (fast_table,
+                                                            get_table,
+                                                            parse_page)
+from core.finviz.helper_functions.table_scanner import scan_headers, scan_table
+from core.finviz.screener import TABLE_TYPES
+from core.finviz.synthetic import SyntheticSite
+
+
+def lxml_headers(page):
+    screener = get_layout("screener")
+    return [
+        text
+        for text in map(screener.normalized_text, screener.headers(parse_page(page)))
+        if text
+    ]
+
+
+def synthetic_corpus():
+    """ Screener pages of every table type, plus all custom columns, over a few seeds and pages. """
+    views = sorted(set(TABLE_TYPES.values()))
+    for seed in (0, 7):
+        site = SyntheticSite(seed, rows=120)
+        for view in views:
+            for r in ("1", "101"):
+                params = {"v": view, "o": "-marketcap", "r": r}
+                if view == "152":
+                    params["c"] = ",".join(str(c) for c in range(71))
+                yield f"seed{seed}-v{view}-r{r}", site.screener_page(params).encode()
+
+    fixtures = Fixtures()
+    for name in ("screener.html", "screener_custom.html", "screener_live.html"):
+        yield name, fixtures.pages[name]
+
+
+CORPUS = list(synthetic_corpus())
+
+# Layout deviations the scanner must either read exactly like lxml or refuse
+EDGE_CASES = [
+    '<td><a>AT&amp;T&nbsp;Inc</a></td><td>1</td>',
+    '<td> <a>A</a></td><td>1</td>',
+    '<td></td><td>1</td>',
+    '<td><a>A</a><span>B</span></td><td>1</td>',
+    '<td><!-- note -->A</td><td>1</td>',
+    '<td><table><tr><td>A</td></tr></table></td><td>1</td>',
+    '<td>A</td><td>1</td><td>2</td>',
+    '<td>A<td>1',
+    '<TD>A</TD><td>1</td>',
+    '<td data-boxover="body=[<b>x</b>]">A</td><td>1</td>',
+    '<td data-boxover="body=[<table><tr><td>x</td></tr></table>]">A</td><td>1</td>',
+    "<td title='a > b'><a href=\"x\" \">A</a></td><td>1</td>",
+    '<td title="a > b>A</td><td>1</td>',
+]
+
+
+class TestScannerCorpus:
+    """ Differential tests of the pattern scanner against lxml """
+
+    @pytest.mark.parametrize("name,page", CORPUS, ids=[name for name, _ in CORPUS])
+    def test_matches_lxml(self, name, page):
+        headers = lxml_headers(page)
+        expected = get_table(page, headers, rows=20)
+
+        assert scan_headers(page) == headers
+        assert scan_table(page, headers, 20) is not None, "fast path not taken"
+        assert fast_table(page, headers, rows=20) == expected
+        assert fast_table(page.decode(), headers, rows=5) == expected[:5]
+
+    @pytest.mark.parametrize("cells", EDGE_CASES)
+    def test_edge_cases(self, cells):
+        page = (
+            '<html><body><table><thead><tr valign="middle"><th>Ticker</th><th>No.</th></tr></thead>'
+            f'<tr valign="top">{cells}</tr><tr valign="top"><td>B</td><td>2</td></tr>'
+            "</table></body></html>"
+        ).encode()
+        headers = ["Ticker", "No."]
+
+        assert fast_table(page, headers) == get_table(page, headers)
+
+    def test_header_mismatch_falls_back(self):
+        page = Fixtures().pages["screener.html"]
+        headers = lxml_headers(page)[:-1]
+
+        assert scan_table(page, headers) is None
+        assert fast_table(page, headers, rows=20) == get_table(page, headers, rows=20)
@@ -0,0 +1,63 @@
+import pytest
+
+from core.finviz.helper_functions import request_functions
+from core.finviz.helper_functions.error_handling import MissingRecording
+from core.finviz.helper_functions.request_functions import Connector
+from core.finviz.helper_functions.transport import (RecordingTransport, Transport,
+                                                    ReplayTransport,
+                                                    set_transport)
+
+
+@pytest.fixture
+def recorded(serve, tmp_path):
+    """ Records two pages from a local server. """
+    base = serve() + "quote.ashx"
+
+    previous = set_transport(RecordingTransport(str(tmp_path)))
+    try:
+        request_functions.http_request_get(base, payload={"t": "AAPL"}, parse=False)
+        Connector(bytes.decode, [base + "?t=AMD"], "test-agent").run_connector()
+    finally:
+        set_transport(previous)
+
+    yield base, str(tmp_path)
+    set_transport(previous)
+
+
+class TestRecordReplay:
+    """ Unit tests for the record and replay transports """
+
+    def test_replay_serves_both_request_paths_offline(self, recorded):
+        base, cassettes = recorded
+        set_transport(ReplayTransport(cassettes))
+
+        page, _ = request_functions.http_request_get(base, payload={"t": "AAPL"}, parse=False)
+        assert "ok" in page
+        assert request_functions.finviz_request(base + "?t=AAPL", "test-agent").text == page
+        assert Connector(bytes.decode, [base + "?t=AMD"], "test-agent").run_connector() == [page]
+
+    def test_missing_recording(self, recorded):
+        base, cassettes = recorded
+        set_transport(ReplayTransport(cassettes))
+
+        with pytest.raises(MissingRecording):
+            request_functions.http_request_get(base, payload={"t": "WMT"}, parse=False)
+
+    def test_simulated_throttling_is_retried(self, recorded, monkeypatch):
+        base, cassettes = recorded
+        replay = ReplayTransport(cassettes, throttle_rate=0.5, seed=3)
+        set_transport(replay)
+        monkeypatch.setattr(request_functions._http_request_get.retry, "wait", lambda _: 0)
+
+        for _ in range(5):
+            page, _ = request_functions.http_request_get(base, payload={"t": "AAPL"}, parse=False)
+            assert "ok" in page
+
+    def test_replayed_throttling_is_recognized(self, recorded):
+        replay = ReplayTransport(recorded[1], throttle_rate=1.0)
+
+        assert request_functions.is_throttled(replay.get(recorded[0], {"t": "AAPL"}, {}, None).content)
+
+    def test_transport_is_abstract(self):
+        with pytest.raises(TypeError):
+            Transport()